@@ -0,0 +1,407 @@
+# benchmarks/bench_carga.py
+#
+# Suite de benchmarks de la capa de carga (src/data_loader.py): genera fuentes
+# sintéticas de 10^3 a 10^7 líneas de detalle, mide cada etapa de lectura y
+# unificación (tiempo y pico de memoria RSS) y guarda los resultados en JSON
+# para compararlos entre versiones.
+#
+# Cada medición corre en un proceso nuevo apuntado a los datos sintéticos con
+# AURELION_DATA_DIR, así las cachés en memoria de una etapa no afectan a otra.
+#
+# Uso:
+#   python -m benchmarks.bench_carga                          # 1e3, 1e4 y 1e5 filas
+#   python -m benchmarks.bench_carga 1e3 1e5 1e7 --repeticiones 3
+#   python -m benchmarks.bench_carga --comparar benchmarks/resultados/base.json
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import queue
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generador import escribir_fuentes, formato_para, generar_tablas
+
+TAMANOS_POR_DEFECTO = [1_000, 10_000, 100_000]
+DIR_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+
+# Etapas más rápidas que esto son ruido: no se marcan como regresión
+MINIMO_SEGUNDOS_REGRESION = 0.05
+
+
+# ==============================================================
+# 🟦 Memoria
+# ==============================================================
+def _leer_status_mb(campo):
+    """Valor de /proc/self/status en MB (solo Linux), o None."""
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for linea in f:
+                if linea.startswith(f"{campo}:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reiniciar_pico():
+    """Lleva el pico de RSS al valor actual (Linux). Retorna False si no se pudo."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="utf-8") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _maxrss_mb(quien):
+    try:
+        import resource
+    except ImportError:
+        # Windows no tiene el módulo resource
+        return None
+    pico = resource.getrusage(quien).ru_maxrss
+    # Linux informa KB y macOS bytes
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def _rss_pico_mb():
+    pico = _leer_status_mb("VmHWM")
+    if pico is None:
+        import resource
+        pico = _maxrss_mb(resource.RUSAGE_SELF)
+    return pico
+
+
+def _rss_hijos_mb():
+    """Pico del mayor proceso hijo (p. ej. los del pool de lectura en paralelo)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = _maxrss_mb(resource.RUSAGE_CHILDREN)
+    return pico or None
+
+
+# ==============================================================
+# 🟦 Etapas
+# ==============================================================
+# Cada etapa es (preparar, cargar, ejecutar):
+#   preparar(dl)         deja el disco en el estado necesario (corre en su propio proceso)
+#   cargar(dl)           arma entradas en memoria antes de empezar a medir
+#   ejecutar(dl, datos)  lo que se mide
+# `dl` es el módulo src.data_loader importado dentro del proceso hijo.
+
+_FUENTES = ("Clientes", "Ventas", "Detalle Ventas", "Productos")
+
+
+def _rutas_fuentes(dl):
+    paths = dl.get_dataset_paths()
+    return [paths[nombre] for nombre in _FUENTES]
+
+
+def _poblar_cache(dl):
+    for ruta in _rutas_fuentes(dl):
+        dl.leer_fuente(ruta)
+
+
+def _sin_cache(dl):
+    from src.utils.disk_cache import limpiar_cache
+    limpiar_cache()
+
+
+def _sin_unificado(dl):
+    _poblar_cache(dl)
+    output_path = dl.get_dataset_paths()["df_tienda_aurelion"]
+    for ruta in (output_path, dl.ruta_estado_unificacion(output_path)):
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+
+def _con_unificado(dl):
+    _poblar_cache(dl)
+    if dl.unificar_incremental() is None:
+        dl.load_and_merge_datasets()
+
+
+def _sin_columnar(dl):
+    _con_unificado(dl)
+    shutil.rmtree(dl.DIR_COLUMNAR, ignore_errors=True)
+
+
+def _con_columnar(dl):
+    _con_unificado(dl)
+    dl.cargar_columnar(dl.get_dataset_paths()["df_tienda_aurelion"], "df_tienda_aurelion")
+
+
+def _tablas_en_memoria(dl):
+    return [dl.leer_fuente(ruta) for ruta in _rutas_fuentes(dl)]
+
+
+ETAPAS = {
+    "parseo_fuentes": (
+        None, None,
+        lambda dl, _: [dl.leer_fuente(r, usar_cache=False) for r in _rutas_fuentes(dl)],
+    ),
+    "cache_disco_frio": (
+        _sin_cache, None,
+        lambda dl, _: [dl.leer_fuente(r) for r in _rutas_fuentes(dl)],
+    ),
+    "cache_disco_tibio": (
+        _poblar_cache, None,
+        lambda dl, _: [dl.leer_fuente(r) for r in _rutas_fuentes(dl)],
+    ),
+    "load_dataset_fuentes": (
+        _poblar_cache, None,
+        lambda dl, _: [dl.load_dataset(nombre) for nombre in _FUENTES],
+    ),
+    "unificar_tablas": (
+        _poblar_cache, _tablas_en_memoria,
+        lambda dl, tablas: dl.unificar_tablas(*tablas),
+    ),
+    "unificar_datasets_serie": (
+        _poblar_cache, None,
+        lambda dl, _: dl.unificar_datasets(*_rutas_fuentes(dl), workers=1),
+    ),
+    "unificar_datasets_paralelo": (
+        _poblar_cache, None,
+        lambda dl, _: dl.unificar_datasets(*_rutas_fuentes(dl), workers=max(2, dl.WORKERS_INGESTA)),
+    ),
+    "load_and_merge_completo": (
+        _sin_unificado, None,
+        lambda dl, _: dl.load_and_merge_datasets(),
+    ),
+    "load_and_merge_incremental": (
+        _con_unificado, None,
+        lambda dl, _: dl.load_and_merge_datasets(incremental=True),
+    ),
+    "load_dataset_unificado_frio": (
+        _sin_columnar, None,
+        lambda dl, _: dl.load_dataset("df_tienda_aurelion"),
+    ),
+    "load_dataset_unificado_tibio": (
+        _con_columnar, None,
+        lambda dl, _: dl.load_dataset("df_tienda_aurelion"),
+    ),
+}
+
+
+def _contar_filas(resultado):
+    if isinstance(resultado, pd.DataFrame):
+        return len(resultado)
+    if isinstance(resultado, list):
+        return sum(len(df) for df in resultado if df is not None)
+    return None
+
+
+# ==============================================================
+# 🟦 Procesos hijos
+# ==============================================================
+def _correr_fase(etapa, fase):
+    # Oculta los avisos de Streamlit por usar la caché y st.* fuera de 'streamlit run'
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+    import src.data_loader as dl
+
+    preparar, cargar, ejecutar = ETAPAS[etapa]
+    if fase == "preparar":
+        if preparar is not None:
+            preparar(dl)
+        return None
+
+    datos = cargar(dl) if cargar is not None else None
+    rss_base = _leer_status_mb("VmRSS")
+    pico_reiniciado = _reiniciar_pico()
+
+    inicio = time.perf_counter()
+    resultado = ejecutar(dl, datos)
+    segundos = time.perf_counter() - inicio
+
+    return {
+        "segundos": segundos,
+        "rss_base_mb": rss_base,
+        "rss_pico_mb": _rss_pico_mb(),
+        "rss_hijos_mb": _rss_hijos_mb(),
+        "pico_reiniciado": pico_reiniciado,
+        "filas_resultado": _contar_filas(resultado),
+    }
+
+
+def _hijo(etapa, fase, cola):
+    try:
+        cola.put(("ok", _correr_fase(etapa, fase)))
+    except BaseException as e:
+        cola.put(("error", f"{type(e).__name__}: {e}"))
+
+
+def _correr_en_proceso(etapa, fase):
+    """Corre una fase de la etapa en un proceso nuevo y devuelve su resultado."""
+    ctx = mp.get_context("spawn")
+    cola = ctx.Queue()
+    proceso = ctx.Process(target=_hijo, args=(etapa, fase, cola))
+    proceso.start()
+    while True:
+        try:
+            estado, valor = cola.get(timeout=1)
+            break
+        except queue.Empty:
+            # Si el sistema mató al proceso (p. ej. sin memoria) no va a responder
+            if not proceso.is_alive():
+                estado, valor = "error", f"el proceso terminó con código {proceso.exitcode}"
+                break
+    proceso.join()
+    if estado == "error":
+        raise RuntimeError(valor)
+    return valor
+
+
+# ==============================================================
+# 🟦 Ejecución
+# ==============================================================
+def medir_tamano(n_detalle, directorio, formato="auto", repeticiones=1, etapas=None):
+    """Genera las fuentes para `n_detalle` filas y mide cada etapa. Retorna una lista de resultados."""
+    formato = formato_para(n_detalle, formato)
+    inicio = time.perf_counter()
+    escribir_fuentes(generar_tablas(n_detalle), directorio, formato)
+    print(f"\n{n_detalle:,} filas de detalle ({formato}, generadas en {time.perf_counter() - inicio:.1f}s)")
+
+    # Los procesos hijos heredan el entorno: toda la app lee y cachea en `directorio`
+    os.environ["AURELION_DATA_DIR"] = directorio
+
+    resultados = []
+    for etapa in etapas or ETAPAS:
+        fila = {"filas_detalle": n_detalle, "formato": formato, "etapa": etapa}
+        try:
+            corridas = []
+            for _ in range(repeticiones):
+                _correr_en_proceso(etapa, "preparar")
+                corridas.append(_correr_en_proceso(etapa, "medir"))
+        except RuntimeError as e:
+            fila["error"] = str(e)
+            print(f"  {etapa:<30} ERROR {e}")
+            resultados.append(fila)
+            continue
+
+        tiempos = [c["segundos"] for c in corridas]
+        picos = [c["rss_pico_mb"] for c in corridas if c["rss_pico_mb"] is not None]
+        hijos = [c["rss_hijos_mb"] for c in corridas if c["rss_hijos_mb"] is not None]
+        fila.update({
+            "segundos": min(tiempos),
+            "segundos_mediana": statistics.median(tiempos),
+            "rss_base_mb": corridas[0]["rss_base_mb"],
+            "rss_pico_mb": max(picos) if picos else None,
+            "rss_hijos_mb": max(hijos) if hijos else None,
+            "pico_reiniciado": all(c["pico_reiniciado"] for c in corridas),
+            "filas_resultado": corridas[0]["filas_resultado"],
+        })
+        resultados.append(fila)
+
+        pico = f"{fila['rss_pico_mb']:9.1f} MB" if fila["rss_pico_mb"] is not None else "        -"
+        print(f"  {etapa:<30} {fila['segundos']:9.3f}s  pico {pico}")
+
+    return resultados
+
+
+def _commit_actual():
+    try:
+        salida = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        return salida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(actual, ruta_base, tolerancia):
+    """Compara contra un JSON anterior e imprime las etapas más lentas que `tolerancia`."""
+    with open(ruta_base, "r", encoding="utf-8") as f:
+        base = {
+            (r["filas_detalle"], r["etapa"]): r["segundos"]
+            for r in json.load(f)["resultados"] if "segundos" in r
+        }
+
+    regresiones = []
+    print(f"\nComparación contra {ruta_base} (tolerancia {tolerancia:.2f}x)")
+    for r in actual["resultados"]:
+        anterior = base.get((r["filas_detalle"], r["etapa"]))
+        if anterior is None or "segundos" not in r:
+            continue
+        razon = r["segundos"] / anterior if anterior else float("inf")
+        marca = ""
+        if razon > tolerancia and r["segundos"] >= MINIMO_SEGUNDOS_REGRESION:
+            regresiones.append(r)
+            marca = "  ⚠️ regresión"
+        print(f"  {r['filas_detalle']:>12,} {r['etapa']:<30} {anterior:8.3f}s -> {r['segundos']:8.3f}s ({razon:.2f}x){marca}")
+    return regresiones
+
+
+def _tamano(texto):
+    # Acepta "100000", "100_000" o "1e5"
+    return int(float(texto.replace("_", "")))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de la capa de carga de Tienda Aurelion")
+    parser.add_argument("tamanos", nargs="*", type=_tamano, default=TAMANOS_POR_DEFECTO,
+                        help="filas de detalle a generar (p. ej. 1e3 1e5 1e7)")
+    parser.add_argument("--formato", choices=["auto", "xlsx", "csv"], default="auto",
+                        help="formato de las fuentes ('auto': xlsx hasta 1e5 filas, csv por encima)")
+    parser.add_argument("--repeticiones", type=int, default=1)
+    parser.add_argument("--etapas", nargs="+", choices=list(ETAPAS), help="medir solo estas etapas")
+    parser.add_argument("--datos", help="carpeta donde dejar los datos generados (por defecto, temporal)")
+    parser.add_argument("--salida", help="archivo JSON de resultados")
+    parser.add_argument("--comparar", help="JSON anterior contra el cual buscar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=1.25,
+                        help="razón de tiempo a partir de la cual se marca una regresión")
+    args = parser.parse_args(argv)
+
+    raiz = args.datos or tempfile.mkdtemp(prefix="aurelion_bench_")
+    try:
+        resultados = []
+        for n in args.tamanos:
+            resultados += medir_tamano(
+                n, os.path.join(raiz, f"n_{n}"), args.formato, args.repeticiones, args.etapas
+            )
+    finally:
+        if args.datos is None:
+            shutil.rmtree(raiz, ignore_errors=True)
+
+    actual = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeticiones": args.repeticiones,
+        "resultados": resultados,
+    }
+
+    salida = args.salida or os.path.join(
+        DIR_RESULTADOS, f"carga_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(actual, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados guardados en {salida}")
+
+    if args.comparar and comparar(actual, args.comparar, args.tolerancia):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
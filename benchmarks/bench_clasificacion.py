@@ -0,0 +1,107 @@
+# benchmarks/bench_clasificacion.py
+#
+# Throughput (nombres por segundo) de clasificar_producto: el recorrido original
+# categoría por categoría con re.search contra la expresión única compilada de
+# src/utils/classification.py. Verifica que ambos asignen las mismas etiquetas.
+# También compara Series.apply fila por fila contra clasificar_productos, que
+# clasifica cada nombre distinto una sola vez, y la clasificación en serie
+# contra clasificar_en_paralelo.
+#
+# Uso:  python -m benchmarks.bench_clasificacion [cantidad_nombres ...]
+
+import os
+import re
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from src.utils.classification import (
+    CATEGORIA_POR_DEFECTO, clasificar_en_paralelo, clasificar_producto, clasificar_productos
+)
+from src.utils.rules import EXACT, RULES
+
+# Palabras sueltas para armar nombres que no coinciden con ninguna regla
+_RELLENO = ["premium", "x", "500g", "1l", "familiar", "clásico", "light", "pack", "sabor", "zero"]
+
+
+def clasificar_original(nombre):
+    """Copia del clasificador previo a la expresión compilada, como referencia."""
+    texto = nombre.lower()
+    if texto in EXACT:
+        return EXACT[texto]
+    for categoria, patrones in RULES.items():
+        for patron in patrones:
+            if re.search(patron, texto):
+                return categoria
+    return CATEGORIA_POR_DEFECTO
+
+
+def _vocabulario():
+    """Palabras que disparan reglas: los literales de cada patrón, sin sintaxis de regex."""
+    palabras = set()
+    for patrones in RULES.values():
+        for patron in patrones:
+            limpio = re.sub(r"\\b|\(.*?\)\??|\[(.).*?\]|[?\\]", lambda m: m.group(1) or "", patron)
+            palabras.update(p for p in limpio.split() if p)
+    return sorted(palabras)
+
+
+def generar_nombres(n, seed=0):
+    """Nombres de producto sintéticos de 1 a 4 palabras, con reglas de varias categorías mezcladas."""
+    rng = np.random.default_rng(seed)
+    vocabulario = np.array(_vocabulario() + _RELLENO + list(EXACT))
+    largos = rng.integers(1, 5, n)
+    indices = rng.integers(0, len(vocabulario), largos.sum())
+    palabras = vocabulario[indices]
+    cortes = np.cumsum(largos)[:-1]
+    return [" ".join(grupo).capitalize() for grupo in np.split(palabras, cortes)]
+
+
+def medir(funcion, nombres):
+    inicio = time.perf_counter()
+    etiquetas = [funcion(nombre) for nombre in nombres]
+    return time.perf_counter() - inicio, etiquetas
+
+
+def main(cantidades):
+    print(f"{'nombres':>10} {'original (nombres/s)':>21} {'compilado (nombres/s)':>22} {'aceleración':>12}")
+    for n in cantidades:
+        nombres = generar_nombres(n)
+        t_original, esperado = medir(clasificar_original, nombres)
+        t_compilado, obtenido = medir(clasificar_producto, nombres)
+        distintos = [(a, b, c) for a, b, c in zip(nombres, esperado, obtenido) if b != c]
+        assert not distintos, f"etiquetas distintas: {distintos[:5]}"
+        print(f"{n:>10,} {n / t_original:>21,.0f} {n / t_compilado:>22,.0f} {t_original / t_compilado:>11.1f}x")
+
+    # Lote: muchas filas de venta sobre un catálogo chico (como df_tienda_aurelion)
+    print(f"\n{'filas':>10} {'nombres únicos':>15} {'apply (s)':>10} {'lote (s)':>9} {'aceleración':>12}")
+    for n in cantidades:
+        catalogo = generar_nombres(max(n // 100, 1), seed=1)
+        serie = pd.Series(np.random.default_rng(2).choice(catalogo, n))
+        inicio = time.perf_counter()
+        esperado = serie.apply(clasificar_producto)
+        t_apply = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        obtenido = clasificar_productos(serie)
+        t_lote = time.perf_counter() - inicio
+        assert (obtenido.astype(object) == esperado).all()
+        print(f"{n:>10,} {serie.nunique():>15,} {t_apply:>10.3f} {t_lote:>9.3f} {t_apply / t_lote:>11.1f}x")
+
+    # Pool de procesos: nombres distintos, sin caché
+    workers = os.cpu_count() or 1
+    print(f"\n{'nombres':>10} {'serie (s)':>10} {f'paralelo x{workers} (s)':>18} {'aceleración':>12}")
+    for n in cantidades:
+        nombres = generar_nombres(n, seed=3)
+        inicio = time.perf_counter()
+        esperado = clasificar_en_paralelo(nombres, workers=1)
+        t_serie = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        obtenido = clasificar_en_paralelo(nombres, workers=workers, umbral=0)
+        t_paralelo = time.perf_counter() - inicio
+        assert (obtenido == esperado).all()
+        print(f"{n:>10,} {t_serie:>10.3f} {t_paralelo:>18.3f} {t_serie / t_paralelo:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,73 @@
+# benchmarks/bench_graficos.py
+#
+# Tiempo de render y tamaño del PNG de los gráficos de EDA Diagnóstico que
+# dibujan un marcador por fila (regplot de cantidad vs total_venta y el
+# stripplot de los boxplots de outliers), contra su versión para muchos datos
+# de src/utils/figures.py (densidad 2D y strip muestreado). Verifica que la
+# recta de regresión sea la misma que ajusta seaborn sobre todas las filas.
+#
+# Uso:  python -m benchmarks.bench_graficos [cantidad_filas ...]
+
+import sys
+import time
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from src.utils.figures import dispersion_regresion, render_png, strip_muestreado
+
+
+def generar_ventas(n, seed=0):
+    """cantidad entera de 1 a 10 y total_venta = cantidad * precio (lognormal)."""
+    rng = np.random.default_rng(seed)
+    cantidad = rng.integers(1, 11, n)
+    precio = rng.lognormal(mean=8, sigma=0.6, size=n).round(0)
+    return pd.DataFrame({"cantidad": cantidad, "total_venta": cantidad * precio})
+
+
+def medir(dibujar):
+    """Segundos de dibujo + rasterizado y bytes del PNG resultante."""
+    inicio = time.perf_counter()
+    fig, ax = plt.subplots(figsize=(8, 5))
+    dibujar(ax)
+    png = render_png(fig)
+    return time.perf_counter() - inicio, len(png)
+
+
+def _pendiente_regplot(df):
+    fig, ax = plt.subplots()
+    sns.regplot(data=df, x="cantidad", y="total_venta", ci=None, ax=ax)
+    linea = ax.lines[0].get_xydata()
+    plt.close(fig)
+    return np.polyfit(linea[:, 0], linea[:, 1], 1)
+
+
+def main(cantidades):
+    print(f"{'filas':>10} {'gráfico':>10} {'original (s)':>13} {'agregado (s)':>13} "
+          f"{'PNG original':>13} {'PNG agregado':>13}")
+    for n in cantidades:
+        df = generar_ventas(n)
+
+        t_orig, kb_orig = medir(lambda ax: sns.regplot(data=df, x="cantidad", y="total_venta", ci=None, ax=ax))
+        t_agr, kb_agr = medir(lambda ax: dispersion_regresion(ax, df, "cantidad", "total_venta", umbral=0))
+        print(f"{n:>10,} {'regplot':>10} {t_orig:>13.2f} {t_agr:>13.2f} "
+              f"{kb_orig / 1024:>10,.0f} KB {kb_agr / 1024:>10,.0f} KB")
+
+        t_orig, kb_orig = medir(lambda ax: sns.stripplot(x=df["total_venta"], size=3, alpha=0.4, ax=ax))
+        t_agr, kb_agr = medir(lambda ax: strip_muestreado(x=df["total_venta"], size=3, alpha=0.4, ax=ax))
+        print(f"{n:>10,} {'stripplot':>10} {t_orig:>13.2f} {t_agr:>13.2f} "
+              f"{kb_orig / 1024:>10,.0f} KB {kb_agr / 1024:>10,.0f} KB")
+
+        # La recta del modo agregado se ajusta con todas las filas, igual que regplot
+        fig, ax = plt.subplots()
+        dispersion_regresion(ax, df, "cantidad", "total_venta", umbral=0)
+        linea = ax.lines[-1].get_xydata()
+        plt.close(fig)
+        assert np.allclose(np.polyfit(linea[:, 0], linea[:, 1], 1), _pendiente_regplot(df), rtol=1e-6)
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
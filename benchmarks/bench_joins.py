@@ -0,0 +1,49 @@
+# benchmarks/bench_joins.py
+#
+# Compara la cadena de merges original de unificar_datasets (claves compuestas
+# más el merge clientes+ventas que no se usaba) contra el planificador de joins
+# por clave entera de src/utils/joins.py.
+#
+# Uso:  python -m benchmarks.bench_joins [filas_detalle ...]
+
+import sys
+import time
+import pandas as pd
+
+from benchmarks.generador import generar_tablas
+from src.data_loader import unificar_tablas
+
+
+def cadena_merge_original(clientes, ventas, detalle_ventas, productos):
+    """Copia de la cadena de merges previa al planificador, como referencia."""
+    df_1 = pd.merge(clientes, ventas, on="id_cliente", how="left", suffixes=("_cliente", "_venta"))
+    ventas_clientes = pd.merge(ventas, clientes, on=['id_cliente','nombre_cliente','email'], how='left')
+    detalle_productos = pd.merge(detalle_ventas, productos, on=['id_producto','nombre_producto','precio_unitario'], how='left')
+    df_unificado = pd.merge(ventas_clientes, detalle_productos, on='id_venta', how='left')
+    df_unificado['total_venta'] = df_unificado['cantidad'] * df_unificado['precio_unitario']
+    df_unificado['fecha'] = pd.to_datetime(df_unificado['fecha'])
+    return df_unificado
+
+
+def medir(funcion, tablas, repeticiones=3):
+    """Mejor tiempo (segundos) de `repeticiones` corridas."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(*tablas)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main(tamanos):
+    print(f"{'filas detalle':>14} {'merge (s)':>10} {'planificador (s)':>17} {'aceleración':>12}")
+    for n in tamanos:
+        tablas = generar_tablas(n)
+        t_merge, esperado = medir(cadena_merge_original, tablas)
+        t_plan, obtenido = medir(unificar_tablas, tablas)
+        pd.testing.assert_frame_equal(obtenido, esperado)
+        print(f"{n:>14,} {t_merge:>10.3f} {t_plan:>17.3f} {t_merge / t_plan:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,66 @@
+# benchmarks/bench_outliers.py
+#
+# Detección de outliers (IQR, z-score y MAD) columna por columna con pandas
+# contra detectar_outliers de src/utils/outliers.py, que calcula todas las
+# columnas en una sola pasada vectorizada. Verifica que ambos marquen las
+# mismas filas.
+#
+# Uso:  python -m benchmarks.bench_outliers [cantidad_filas ...]
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from src.utils.outliers import METODOS, detectar_outliers
+
+
+def generar_ventas(n, seed=0):
+    """cantidad, precio_unitario y total_venta con colas largas y algunos nulos."""
+    rng = np.random.default_rng(seed)
+    cantidad = rng.integers(1, 11, n).astype(np.float64)
+    precio = rng.lognormal(mean=8, sigma=0.6, size=n).round(0)
+    total = cantidad * precio
+    total[rng.integers(0, n, max(n // 1000, 1))] = np.nan
+    return pd.DataFrame({"cantidad": cantidad, "precio_unitario": precio, "total_venta": total})
+
+
+def outliers_por_columna(df):
+    """Referencia: las tres reglas con operaciones de pandas, una columna y un método a la vez."""
+    marcas = {}
+    for col in df.columns:
+        serie = df[col]
+        q1, q3 = serie.quantile(0.25), serie.quantile(0.75)
+        iqr = q3 - q1
+        marcas[(col, "iqr")] = (serie < q1 - 1.5 * iqr) | (serie > q3 + 1.5 * iqr)
+
+        desvio = serie.std(ddof=0)
+        marcas[(col, "zscore")] = ((serie - serie.mean()).abs() > 3 * desvio) & (desvio > 0)
+
+        mediana = serie.median()
+        mad = (serie - mediana).abs().median()
+        marcas[(col, "mad")] = ((serie - mediana).abs() > 3.5 * mad / 0.6745) & (mad > 0)
+    return pd.DataFrame(marcas)
+
+
+def main(cantidades):
+    print(f"{'filas':>12} {'por columna (s)':>16} {'una pasada (s)':>15} {'aceleración':>12}")
+    for n in cantidades:
+        df = generar_ventas(n)
+
+        inicio = time.perf_counter()
+        esperado = outliers_por_columna(df)
+        t_columna = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        marcas, _ = detectar_outliers(df)
+        t_pasada = time.perf_counter() - inicio
+
+        for col in df.columns:
+            for metodo in METODOS:
+                assert (marcas[(col, metodo)].to_numpy() == esperado[(col, metodo)].to_numpy()).all(), (col, metodo)
+        print(f"{n:>12,} {t_columna:>16.2f} {t_pasada:>15.2f} {t_columna / t_pasada:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [100_000, 1_000_000, 10_000_000])
@@ -0,0 +1,91 @@
+# benchmarks/generador.py
+#
+# Generador de datos sintéticos con el mismo esquema que las fuentes de Aurelion
+# (clientes, productos, ventas y detalle_ventas), para medir la app con volúmenes
+# mucho mayores que los de la carpeta 'data'.
+
+import os
+import numpy as np
+import pandas as pd
+
+# Excel admite como máximo 1.048.576 filas por hoja
+MAX_FILAS_EXCEL = 1_048_575
+
+# Por encima de este tamaño escribir .xlsx con openpyxl lleva minutos: se usa CSV
+UMBRAL_CSV = 100_000
+
+
+def generar_tablas(n_detalle, seed=0):
+    """
+    Tablas sintéticas con el mismo esquema que las fuentes de Aurelion.
+    `n_detalle` es la cantidad de líneas de detalle; el resto de las tablas
+    escala con ella (3 líneas por venta, 10 ventas por cliente, hasta 10.000 productos).
+    Retorna (clientes, ventas, detalle_ventas, productos).
+    """
+    rng = np.random.default_rng(seed)
+    n_ventas = max(n_detalle // 3, 1)
+    n_clientes = max(n_ventas // 10, 1)
+    n_productos = max(min(n_detalle // 10, 10_000), 1)
+
+    clientes = pd.DataFrame({
+        "id_cliente": np.arange(1, n_clientes + 1),
+        "nombre_cliente": [f"Cliente {i}" for i in range(1, n_clientes + 1)],
+        "email": [f"cliente{i}@mail.com" for i in range(1, n_clientes + 1)],
+        "ciudad": rng.choice(["Carlos Paz", "Rio Cuarto", "Cordoba", "Alta Gracia"], n_clientes),
+        "fecha_alta": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365, n_clientes), unit="D"),
+    })
+    productos = pd.DataFrame({
+        "id_producto": np.arange(1, n_productos + 1),
+        "nombre_producto": [f"Producto {i}" for i in range(1, n_productos + 1)],
+        "categoria": rng.choice(["Alimentos", "Limpieza"], n_productos),
+        "precio_unitario": rng.integers(300, 5000, n_productos),
+    })
+    id_cliente = rng.integers(1, n_clientes + 1, n_ventas)
+    ventas = pd.DataFrame({
+        "id_venta": np.arange(1, n_ventas + 1),
+        "fecha": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 180, n_ventas), unit="D"),
+        "id_cliente": id_cliente,
+        "nombre_cliente": clientes["nombre_cliente"].to_numpy()[id_cliente - 1],
+        "email": clientes["email"].to_numpy()[id_cliente - 1],
+        "medio_pago": rng.choice(["tarjeta", "qr", "efectivo", "transferencia"], n_ventas),
+    })
+    id_producto = rng.integers(1, n_productos + 1, n_detalle)
+    cantidad = rng.integers(1, 6, n_detalle)
+    precio = productos["precio_unitario"].to_numpy()[id_producto - 1]
+    detalle_ventas = pd.DataFrame({
+        "id_venta": np.sort(rng.integers(1, n_ventas + 1, n_detalle)),
+        "id_producto": id_producto,
+        "nombre_producto": productos["nombre_producto"].to_numpy()[id_producto - 1],
+        "cantidad": cantidad,
+        "precio_unitario": precio,
+        "importe": cantidad * precio,
+    })
+    return clientes, ventas, detalle_ventas, productos
+
+
+def formato_para(n_detalle, formato="auto"):
+    """Formato de archivo a usar: 'xlsx' o 'csv' ('auto' elige según el tamaño)."""
+    if formato == "auto":
+        return "xlsx" if n_detalle <= UMBRAL_CSV else "csv"
+    if formato == "xlsx" and n_detalle > MAX_FILAS_EXCEL:
+        raise ValueError(f"Excel no admite {n_detalle:,} filas; usar formato 'csv'")
+    return formato
+
+
+def escribir_fuentes(tablas, directorio, formato="xlsx"):
+    """
+    Escribe las cuatro tablas con los nombres de archivo que espera
+    get_dataset_paths (clientes, ventas, detalle_ventas, productos).
+    Retorna {nombre_archivo: ruta}.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    nombres = ("clientes", "ventas", "detalle_ventas", "productos")
+    rutas = {}
+    for nombre, df in zip(nombres, tablas):
+        ruta = os.path.join(directorio, f"{nombre}.{formato}")
+        if formato == "xlsx":
+            df.to_excel(ruta, index=False)
+        else:
+            df.to_csv(ruta, index=False, encoding="utf-8-sig")
+        rutas[nombre] = ruta
+    return rutas
@@ -11,6 +11,7 @@ from src.pages.diagnostic_eda import show_diagnostic_eda
 from src.pages.ml_preprocessing import show_ml_preprocessing
 from src.pages.automated_ml import show_automated_ml
 from src.pages.random_forest_manual import show_random_forest_manual
+from src.utils.figures import MONITOR_FIGURAS, monitor_figuras
 
 # --- CONFIGURACIÓN ---
 st.set_page_config(page_title="Tienda Aurelion", page_icon="🛒", layout="wide")
@@ -56,6 +57,10 @@ elif opcion == "Entrenamiento Random Forest":
     show_random_forest_manual() 
 elif opcion == "Ver documentación":
     mostrar_documentacion()
+
+# --- Figuras abiertas (diagnóstico de memoria) ---
+if MONITOR_FIGURAS:
+    monitor_figuras()
     
 # --- FOOTER ---
 st.markdown("---")
@@ -0,0 +1,23 @@
+# src/config.py
+
+import os
+
+# ==============================================================
+# 🟢 CARPETAS DE DATOS
+# ==============================================================
+# Con AURELION_DATA_DIR se puede apuntar la app a otra carpeta de datos (p. ej. benchmarks)
+DATA_DIR = os.path.abspath(
+    os.environ.get("AURELION_DATA_DIR") or os.path.join(os.path.dirname(__file__), "..", "data")
+)
+
+# Cachés en disco (parquet, column store, cubo, SQLite, renders...)
+CACHE_ROOT = os.path.join(DATA_DIR, ".cache")
+
+# ==============================================================
+# 🟢 DATASETS GENERADOS POR LAS PÁGINAS
+# ==============================================================
+# EDA Diagnóstico -> Preprocesamiento ML
+RUTA_TIENDA_MODIFICADO = os.path.join(DATA_DIR, "df_tienda_aurelion_modificado.csv")
+
+# Preprocesamiento ML -> AutoML y Random Forest
+RUTA_DATASET_ML = os.path.join(DATA_DIR, "dataset_ml_productos.csv")
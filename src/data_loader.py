@@ -1,36 +1,99 @@
 # src/data_loader.py
+import hashlib
 import os
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 import pandas as pd
 import streamlit as st
+from openpyxl import load_workbook
+from src.utils.classification import clasificar_productos, huella_reglas
+from src.utils.column_store import escribir_column_store, leer_column_store, leer_manifest
+from src.utils.cubo_ventas import (
+    actualizar_indice_top, combinar_cubos, construir_cubo, guardar_cubo, indice_top, leer_cubo
+)
+from src.config import CACHE_ROOT, DATA_DIR
+from src.utils.disk_cache import escribir_atomico, guardar_json, hash_archivo, leer_con_cache
+from src.utils.joins import join_dimension, join_uno_a_muchos
+from src.utils.particiones import iterar_en_bloques, unificar_particionado
+from src.utils.schema import aplicar_esquema
+from src.utils.sqlite_store import RUTA_DB, construir_store, consultar, version_store
 
 # ==============================================================
 # 🟢 CONFIGURACIÓN DE RUTAS
 # ==============================================================
 
+def _ruta_fuente(nombre_base):
+    """Ruta de una tabla fuente: el .xlsx si existe; si no, un .csv con el mismo nombre."""
+    ruta_xlsx = os.path.join(DATA_DIR, f"{nombre_base}.xlsx")
+    ruta_csv = os.path.join(DATA_DIR, f"{nombre_base}.csv")
+    if not os.path.exists(ruta_xlsx) and os.path.exists(ruta_csv):
+        return ruta_csv
+    return ruta_xlsx
+
 def get_dataset_paths():
     """
     Retorna un diccionario con los paths de los datasets disponibles.
     Las claves son los nombres amigables y los valores las rutas absolutas.
+    La carpeta es 'data' salvo que se indique otra con AURELION_DATA_DIR.
     """
-    ruta_actual = os.path.dirname(__file__)
     return {
-        "Clientes": os.path.join(ruta_actual, "..", "data", "clientes.xlsx"),
-        "Productos": os.path.join(ruta_actual, "..", "data", "productos.xlsx"),
-        "Ventas": os.path.join(ruta_actual, "..", "data", "ventas.xlsx"),
-        "Detalle Ventas": os.path.join(ruta_actual, "..", "data", "detalle_ventas.xlsx"),
-        "df_tienda_aurelion": os.path.join(ruta_actual, "..", "data", "df_tienda_aurelion.csv")
+        "Clientes": _ruta_fuente("clientes"),
+        "Productos": _ruta_fuente("productos"),
+        "Ventas": _ruta_fuente("ventas"),
+        "Detalle Ventas": _ruta_fuente("detalle_ventas"),
+        "df_tienda_aurelion": os.path.join(DATA_DIR, "df_tienda_aurelion.csv")
     }
 
+# ==============================================================
+# 🟢 LECTURA DE ARCHIVOS FUENTE
+# ==============================================================
+
+def _leer_archivo(ruta):
+    """Parsea un archivo Excel o CSV según su extensión."""
+    if ruta.endswith((".xlsx", ".xls")):
+        return pd.read_excel(ruta)
+    return pd.read_csv(ruta, encoding="utf-8-sig")
+
+def leer_fuente(ruta, usar_cache=True):
+    """
+    Lee un archivo fuente pasando por la caché columnar de 'data/.cache'.
+    La copia se regenera sola cuando el archivo original cambia.
+    """
+    if not usar_cache:
+        return _leer_archivo(ruta)
+    return leer_con_cache(ruta, _leer_archivo)
+
 # ==============================================================
 # 🟢 CARGA GENERAL DE DATASETS
 # ==============================================================
 
-@st.cache_data
+# Datasets unificados que se sirven desde el column store mapeado en memoria
+DATASETS_COLUMNARES = ("df_tienda_aurelion",)
+
 def load_dataset(nombre):
     """
     Carga un dataset desde la carpeta 'data' en formato Excel (.xlsx/.xls) o CSV (.csv).
     Si es el dataset unificado y no existe, lo genera automáticamente.
+    La lectura pasa por la caché columnar en disco, compartida entre procesos,
+    y se aplican los tipos compactos declarados en src/utils/schema.py.
+
+    El dataset unificado se abre desde el column store mapeado en memoria, que
+    comparten todas las sesiones; el resto se guarda en la caché de Streamlit.
     """
+    if nombre in DATASETS_COLUMNARES:
+        ruta = get_dataset_paths()[nombre]
+        if os.path.exists(ruta):
+            try:
+                return cargar_columnar(ruta, nombre)
+            except Exception as e:
+                st.warning(f"⚠️ Error al cargar '{nombre}': {e}")
+                return None
+
+    return _cargar_dataset(nombre)
+
+@st.cache_data
+def _cargar_dataset(nombre):
     paths = get_dataset_paths()
     
     if nombre not in paths:
@@ -42,87 +105,587 @@ def load_dataset(nombre):
     # --- Si es el dataset unificado y no existe, generarlo ---
     if nombre == "df_tienda_aurelion" and not os.path.exists(ruta):
         # El mensaje de "no encontrado" lo mostramos dentro de load_and_merge_datasets
-        return load_and_merge_datasets()
+        return aplicar_esquema(load_and_merge_datasets(), nombre)
     
     try:
-        if ruta.endswith((".xlsx", ".xls")):
-            df = pd.read_excel(ruta)
-        elif ruta.endswith(".csv"):
-            df = pd.read_csv(ruta, encoding="utf-8-sig")
-        else:
+        if not ruta.endswith((".xlsx", ".xls", ".csv")):
             st.warning(f"⚠️ Formato de archivo no soportado: {ruta}")
             return None
 
-        return df
+        return aplicar_esquema(leer_fuente(ruta), nombre)
 
     except Exception as e:
         st.warning(f"⚠️ Error al cargar '{nombre}': {e}")
         return None
 
+# ==============================================================
+# 🟢 COLUMN STORE MAPEADO EN MEMORIA
+# ==============================================================
+
+DIR_COLUMNAR = os.path.join(CACHE_ROOT, "columnar")
+
+def cargar_columnar(ruta, nombre):
+    """
+    Abre un CSV unificado desde su column store binario (un .npy por columna,
+    texto codificado con diccionario). Si el CSV cambió desde la última vez,
+    se parsea una sola vez, se le aplica el esquema y se regenera el store.
+    Las columnas quedan mapeadas en memoria: las sesiones y procesos comparten
+    la caché de páginas del sistema operativo en lugar de una copia cada uno.
+    Si el store no se puede escribir o leer, se usa el CSV parseado.
+    """
+    info = os.stat(ruta)
+    version = f"{info.st_size}:{info.st_mtime_ns}"
+    directorio = os.path.join(DIR_COLUMNAR, nombre)
+
+    df = None
+    manifest = leer_manifest(directorio)
+    if manifest is None or manifest["version"] != version:
+        df = aplicar_esquema(pd.read_csv(ruta, encoding="utf-8-sig"), nombre)
+        try:
+            escribir_column_store(df, directorio, version)
+        except OSError:
+            # Sin permisos de escritura o disco lleno: se usa la copia parseada
+            return df
+
+    columnar = leer_column_store(directorio)
+    if columnar is None:
+        # Otro proceso reescribe el store en este momento: nunca se devuelve None
+        return df if df is not None else aplicar_esquema(pd.read_csv(ruta, encoding="utf-8-sig"), nombre)
+    return columnar
+
+# ==============================================================
+# 🟢 INSPECCIÓN LIVIANA (SIN CARGAR EL ARCHIVO COMPLETO)
+# ==============================================================
+
+def _contar_lineas(ruta, bloque=1024 * 1024):
+    """Cuenta los saltos de línea de un archivo leyéndolo en binario por bloques."""
+    lineas = 0
+    ultimo = b"\n"
+    with open(ruta, "rb") as f:
+        for parte in iter(lambda: f.read(bloque), b""):
+            lineas += parte.count(b"\n")
+            ultimo = parte[-1:]
+    # Última línea sin salto final
+    if ultimo != b"\n":
+        lineas += 1
+    return lineas
+
+def _contar_filas_excel(ruta):
+    """Cantidad de filas de datos según la dimensión declarada en la hoja."""
+    wb = load_workbook(ruta, read_only=True)
+    try:
+        ws = wb.active
+        max_row = ws.max_row
+        # Algunas planillas no guardan la dimensión: se recorren las filas sin materializarlas
+        if max_row is None:
+            max_row = sum(1 for _ in ws.iter_rows(values_only=True))
+        return max(max_row - 1, 0)
+    finally:
+        wb.close()
+
+@st.cache_data
+def _probe_archivo(ruta, mtime_ns, n_filas):
+    # mtime_ns forma parte de la clave de caché para invalidar si el archivo cambia
+    if ruta.endswith(".csv"):
+        vista = pd.read_csv(ruta, nrows=n_filas, encoding="utf-8-sig")
+        filas = max(_contar_lineas(ruta) - 1, 0)
+    else:
+        bloques = iterar_en_bloques(ruta, n_filas)
+        vista = next(bloques, pd.DataFrame())
+        bloques.close()
+        filas = _contar_filas_excel(ruta)
+    return vista, filas
+
+def probe_dataset(nombre, n_filas=5):
+    """
+    Devuelve información básica de un dataset sin cargarlo completo:
+    cantidad de filas, columnas con sus tipos y las primeras `n_filas`.
+
+    - CSV: lee solo las primeras filas y cuenta líneas en binario.
+    - Excel: lee en modo streaming y toma la dimensión declarada en la hoja.
+
+    Los tipos se obtienen de la vista previa con el esquema del dataset aplicado.
+    Retorna None si el dataset no existe.
+    """
+    ruta = get_dataset_paths().get(nombre)
+    if ruta is None or not os.path.exists(ruta):
+        return None
+
+    vista, filas = _probe_archivo(ruta, os.stat(ruta).st_mtime_ns, n_filas)
+    vista = aplicar_esquema(vista, nombre)
+    return {
+        "filas": filas,
+        "tipos": vista.dtypes.astype(str),
+        "vista_previa": vista,
+    }
+
 # ==============================================================
 # 🟢 UNIFICACIÓN DE LOS DATASETS
 # ==============================================================
 
-def unificar_datasets(clientes_path, ventas_path, detalle_ventas_path, productos_path):
+# Procesos usados para leer los cuatro archivos fuente en paralelo (1 = serie)
+WORKERS_INGESTA = min(4, os.cpu_count() or 1)
+
+# Por debajo de este tamaño total, levantar el pool cuesta más que leer en serie
+UMBRAL_BYTES_PARALELO = 5 * 1024 * 1024
+
+def _workers_para(rutas):
+    """Cantidad de procesos a usar según el tamaño total de las fuentes."""
+    total = sum(os.path.getsize(r) for r in rutas if os.path.exists(r))
+    return WORKERS_INGESTA if total >= UMBRAL_BYTES_PARALELO else 1
+
+def _leer_con_tiempo(ruta):
+    """Lee una fuente y devuelve también los segundos que tardó (se ejecuta en un proceso del pool)."""
+    inicio = time.perf_counter()
+    df = leer_fuente(ruta)
+    return df, time.perf_counter() - inicio
+
+def unificar_datasets(clientes_path, ventas_path, detalle_ventas_path, productos_path, workers=1):
     """
     Carga y unifica los datasets de clientes, ventas, detalle de ventas y productos.
     Retorna un DataFrame final llamado df_unificado.
+
+    Con workers > 1 los archivos se parsean en paralelo en un pool de procesos y
+    cada merge arranca apenas están listas las dos tablas que necesita. Si el pool
+    no puede usarse se vuelve a la lectura en serie. Los segundos por archivo y por
+    etapa quedan en df_unificado.attrs["tiempos"].
     """
+    rutas = {
+        "Clientes": clientes_path,
+        "Ventas": ventas_path,
+        "Detalle Ventas": detalle_ventas_path,
+        "Productos": productos_path,
+    }
+    inicio = time.perf_counter()
 
-    # --- 1️⃣ Cargar los archivos ---
-    clientes = pd.read_excel(clientes_path)
-    ventas = pd.read_excel(ventas_path)
-    detalle_ventas = pd.read_excel(detalle_ventas_path)
-    productos = pd.read_excel(productos_path)
+    if workers > 1:
+        try:
+            df_unificado, tiempos = _unificar_en_paralelo(rutas, workers)
+        except (OSError, RuntimeError) as e:
+            # BrokenProcessPool hereda de RuntimeError
+            st.warning(f"⚠️ Lectura en paralelo no disponible ({e}); se usa lectura en serie.")
+            workers = 1
 
-    # --- 2️⃣ Merge clientes + ventas ---
-    df_1 = pd.merge(
-        clientes,
-        ventas,
-        on="id_cliente",
-        how="left",
-        suffixes=("_cliente", "_venta")
-    )
+    if workers <= 1:
+        # --- 1️⃣ Cargar los archivos ---
+        tablas, tiempos = {}, {}
+        for nombre, ruta in rutas.items():
+            tablas[nombre], tiempos[nombre] = _leer_con_tiempo(ruta)
 
-    # --- 3️⃣ Merge ventas + clientes ---
-    ventas_clientes = pd.merge(ventas, clientes, on=['id_cliente','nombre_cliente','email'], how='left')
+        inicio_merge = time.perf_counter()
+        df_unificado = unificar_tablas(
+            tablas["Clientes"], tablas["Ventas"], tablas["Detalle Ventas"], tablas["Productos"]
+        )
+        tiempos["merge"] = time.perf_counter() - inicio_merge
 
-    # --- 4️⃣ Merge detalle_ventas + productos ---
-    detalle_productos = pd.merge(detalle_ventas, productos, on=['id_producto','nombre_producto','precio_unitario'], how='left')
+    tiempos["total"] = time.perf_counter() - inicio
+    df_unificado.attrs["tiempos"] = tiempos
+    return df_unificado
+
+def _unificar_en_paralelo(rutas, workers):
+    """Lee las fuentes en un pool de procesos y encadena los merges a medida que llegan."""
+    tablas, tiempos = {}, {}
+    ventas_clientes = detalle_productos = None
+    tiempo_merge = 0.0
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(rutas))) as pool:
+        pendientes = {pool.submit(_leer_con_tiempo, ruta): nombre for nombre, ruta in rutas.items()}
+
+        while pendientes:
+            listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                nombre = pendientes.pop(futuro)
+                tablas[nombre], tiempos[nombre] = futuro.result()
+
+            inicio_merge = time.perf_counter()
+            if ventas_clientes is None and {"Ventas", "Clientes"} <= tablas.keys():
+                ventas_clientes = _unir_ventas_clientes(tablas["Ventas"], tablas["Clientes"])
+            if detalle_productos is None and {"Detalle Ventas", "Productos"} <= tablas.keys():
+                detalle_productos = _unir_detalle_productos(tablas["Detalle Ventas"], tablas["Productos"])
+            tiempo_merge += time.perf_counter() - inicio_merge
+
+    inicio_merge = time.perf_counter()
+    df_unificado = _unir_final(ventas_clientes, detalle_productos)
+    tiempos["merge"] = tiempo_merge + time.perf_counter() - inicio_merge
+    return df_unificado, tiempos
+
+def unificar_tablas(clientes, ventas, detalle_ventas, productos):
+    """
+    Unifica las cuatro tablas ya cargadas en memoria.
+    Se usa tanto en la reconstrucción completa como en la incremental.
+    """
 
-    # --- 5️⃣ Merge final: ventas_clientes + detalle_productos ---
-    df_unificado = pd.merge(ventas_clientes, detalle_productos, on='id_venta', how='left')
+    # --- 2️⃣ Ventas + clientes ---
+    ventas_clientes = _unir_ventas_clientes(ventas, clientes)
 
-    # --- 6️⃣ Limpieza y ajustes finales ---
+    # --- 3️⃣ Detalle de ventas + productos ---
+    detalle_productos = _unir_detalle_productos(detalle_ventas, productos)
+
+    # --- 4️⃣ Unión final y 5️⃣ ajustes ---
+    return _unir_final(ventas_clientes, detalle_productos)
+
+# Cada unión resuelve primero la clave entera por posición (src/utils/joins.py);
+# si no aplica (ids repetidos o no enteros), se usa el merge por clave compuesta.
+
+def _unir_ventas_clientes(ventas, clientes):
+    df = join_dimension(ventas, clientes, "id_cliente", ["nombre_cliente", "email"])
+    if df is None:
+        df = pd.merge(ventas, clientes, on=['id_cliente','nombre_cliente','email'], how='left')
+    return df
+
+def _unir_detalle_productos(detalle_ventas, productos):
+    df = join_dimension(detalle_ventas, productos, "id_producto", ["nombre_producto", "precio_unitario"])
+    if df is None:
+        df = pd.merge(detalle_ventas, productos, on=['id_producto','nombre_producto','precio_unitario'], how='left')
+    return df
+
+def _unir_final(ventas_clientes, detalle_productos):
+    # --- 4️⃣ Unión final: ventas_clientes + detalle_productos ---
+    df_unificado = join_uno_a_muchos(ventas_clientes, detalle_productos, "id_venta")
+    if df_unificado is None:
+        df_unificado = pd.merge(ventas_clientes, detalle_productos, on='id_venta', how='left')
+
+    # --- 5️⃣ Limpieza y ajustes finales ---
     df_unificado['total_venta'] = df_unificado['cantidad'] * df_unificado['precio_unitario']
     df_unificado['fecha'] = pd.to_datetime(df_unificado['fecha'])
 
     return df_unificado
 
-def load_and_merge_datasets():
+# ==============================================================
+# 🟢 UNIFICACIÓN PARTICIONADA (FUERA DE MEMORIA)
+# ==============================================================
+
+DIR_PARTICIONES = os.path.join(CACHE_ROOT, "df_tienda_aurelion_particiones")
+
+def unificar_datasets_particionado(clientes_path, ventas_path, detalle_ventas_path, productos_path,
+                                   destino=DIR_PARTICIONES, n_particiones=16, tamano_bloque=100_000):
+    """
+    Variante de unificar_datasets para un detalle de ventas más grande que la RAM.
+    Lee el detalle por bloques, lo une contra clientes, ventas y productos en
+    memoria y escribe el resultado en disco particionado por id_venta.
+    Retorna la cantidad de filas escritas.
+    """
+    return unificar_particionado(
+        clientes=leer_fuente(clientes_path),
+        ventas=leer_fuente(ventas_path),
+        productos=leer_fuente(productos_path),
+        detalle_ventas_path=detalle_ventas_path,
+        destino=destino,
+        n_particiones=n_particiones,
+        tamano_bloque=tamano_bloque
+    )
+
+# ==============================================================
+# 🟢 UNIFICACIÓN INCREMENTAL
+# ==============================================================
+
+# Un estado por CSV unificado: cada salida tiene su propio punto de corte
+DIR_ESTADO_UNIFICACION = os.path.join(CACHE_ROOT, "unificacion")
+
+def ruta_estado_unificacion(output_path):
+    """Archivo con el estado de la unificación incremental de ese CSV unificado."""
+    clave = hashlib.sha1(os.path.abspath(output_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(DIR_ESTADO_UNIFICACION, f"estado_{clave}.json")
+
+def _huella_dimensiones(paths):
+    """Hash de contenido de las tablas de dimensión (clientes y productos)."""
+    return {nombre: hash_archivo(paths[nombre]) for nombre in ("Clientes", "Productos")}
+
+def _huella_filas(df, filas):
+    """
+    Hash del contenido de las filas marcadas, sin importar su orden: cambia si
+    se edita, agrega o borra alguna, aunque la cantidad sea la misma.
+    """
+    return str(int(pd.util.hash_pandas_object(df[filas], index=False).sum()))
+
+def _guardar_estado_unificacion(paths, ventas, detalle_ventas):
+    """
+    Registra el punto de corte (máximo id_venta) del dataset unificado, junto
+    con lo necesario para detectar cambios que obliguen a reconstruirlo.
+    """
+    max_id = int(ventas["id_venta"].max()) if len(ventas) else 0
+    output_path = paths["df_tienda_aurelion"]
+    estado = {
+        "max_id_venta": max_id,
+        "huella_ventas": _huella_filas(ventas, ventas["id_venta"] <= max_id),
+        "huella_detalle": _huella_filas(detalle_ventas, detalle_ventas["id_venta"] <= max_id),
+        "dimensiones": _huella_dimensiones(paths),
+        "output_size": os.path.getsize(output_path),
+    }
+    ruta = ruta_estado_unificacion(output_path)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    escribir_atomico(ruta, lambda tmp: guardar_json(estado, tmp))
+
+def _leer_estado_unificacion(output_path):
+    try:
+        with open(ruta_estado_unificacion(output_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _leer_unificado(output_path):
+    """Lee el CSV unificado con las fechas parseadas, igual que tras un merge."""
+    df = leer_fuente(output_path)
+    for col in ("fecha", "fecha_alta"):
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col])
+    return df
+
+def unificar_incremental(paths=None):
+    """
+    Agrega al CSV unificado solo las ventas con id_venta mayor al último
+    procesado, uniéndolas contra clientes y productos.
+
+    Retorna la cantidad de ventas nuevas agregadas, o None si hace falta una
+    reconstrucción completa: no hay estado previo, cambió una tabla de dimensión,
+    se modificó el CSV unificado o cambiaron filas ya procesadas.
+    """
+    paths = paths or get_dataset_paths()
+    output_path = paths["df_tienda_aurelion"]
+
+    estado = _leer_estado_unificacion(output_path)
+    if estado is None or not os.path.exists(output_path):
+        return None
+    if os.path.getsize(output_path) != estado["output_size"]:
+        return None
+    if _huella_dimensiones(paths) != estado["dimensiones"]:
+        return None
+
+    ventas = leer_fuente(paths["Ventas"])
+    detalle_ventas = leer_fuente(paths["Detalle Ventas"])
+
+    max_id = estado["max_id_venta"]
+    ventas_previas = ventas["id_venta"] <= max_id
+    detalle_previo = detalle_ventas["id_venta"] <= max_id
+
+    # Si cambiaron filas ya unificadas (altas tardías, bajas, ediciones), no alcanza con agregar
+    if (_huella_filas(ventas, ventas_previas) != estado.get("huella_ventas")
+            or _huella_filas(detalle_ventas, detalle_previo) != estado.get("huella_detalle")):
+        return None
+
+    ventas_nuevas = ventas[~ventas_previas]
+    if not ventas_nuevas.empty:
+        version_previa = _version_cubo(output_path)
+        delta = unificar_tablas(
+            leer_fuente(paths["Clientes"]),
+            ventas_nuevas,
+            detalle_ventas[~detalle_previo],
+            leer_fuente(paths["Productos"])
+        )
+        # Respetar el orden de columnas del CSV existente
+        columnas = pd.read_csv(output_path, nrows=0, encoding="utf-8-sig").columns
+        delta.reindex(columns=columnas).to_csv(
+            output_path, mode="a", header=False, index=False, encoding="utf-8"
+        )
+
+    _guardar_estado_unificacion(paths, ventas, detalle_ventas)
+
+    if not ventas_nuevas.empty:
+        try:
+            _actualizar_cubo_incremental(version_previa, delta, output_path)
+        except Exception:
+            # El CSV y el estado ya están al día: sin cubo guardado para la
+            # versión nueva, se reconstruye completo la próxima vez que se pida
+            pass
+    return len(ventas_nuevas)
+
+def load_and_merge_datasets(incremental=False):
     """
     Crea el dataset unificado y lo guarda como CSV.
+    Con incremental=True solo agrega las ventas nuevas al CSV existente y
+    reconstruye todo únicamente si cambió alguna tabla de dimensión.
     """
     paths = get_dataset_paths()
+    output_path = paths["df_tienda_aurelion"]
+
+    if incremental:
+        nuevas = unificar_incremental(paths)
+        if nuevas is not None:
+            st.success(f"✅ Dataset unificado actualizado ({nuevas} ventas nuevas): {output_path}")
+            return _leer_unificado(output_path)
 
     df_unificado = unificar_datasets(
         clientes_path=paths["Clientes"],
         ventas_path=paths["Ventas"],
         detalle_ventas_path=paths["Detalle Ventas"],
-        productos_path=paths["Productos"]
+        productos_path=paths["Productos"],
+        workers=_workers_para([paths[n] for n in ("Clientes", "Ventas", "Detalle Ventas", "Productos")])
     )
 
     if df_unificado is not None:
-        output_path = paths["df_tienda_aurelion"]
         # Asegurarse de que la carpeta existe
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         df_unificado.to_csv(output_path, index=False, encoding="utf-8-sig")
+        _guardar_estado_unificacion(
+            paths, leer_fuente(paths["Ventas"]), leer_fuente(paths["Detalle Ventas"])
+        )
         st.success(f"✅ Dataset unificado generado y guardado en: {output_path}")
+        st.caption("⏱️ " + " · ".join(f"{k}: {v:.2f}s" for k, v in df_unificado.attrs["tiempos"].items()))
     else:
         st.error("❌ No se pudo generar el dataset unificado.")
     
     return df_unificado
 
+# ==============================================================
+# 🟢 BACKEND SQLITE (OPCIONAL)
+# ==============================================================
+
+# Con AURELION_BACKEND=sqlite las páginas delegan filtros y agregaciones a SQLite
+BACKEND_SQLITE = os.environ.get("AURELION_BACKEND", "").lower() == "sqlite"
+
+def _version_fuentes(paths=None):
+    """
+    Versión de los datos según tamaño y fecha de modificación de las cuatro
+    fuentes y la huella de las reglas que llenan 'categoria_corregida'.
+    """
+    paths = paths or get_dataset_paths()
+    partes = []
+    for nombre in ("Clientes", "Productos", "Ventas", "Detalle Ventas"):
+        info = os.stat(paths[nombre])
+        partes.append(f"{nombre}:{info.st_size}:{info.st_mtime_ns}")
+    partes.append(f"reglas:{huella_reglas()}")
+    return "|".join(partes)
+
+def asegurar_store_sqlite():
+    """
+    Construye (o reconstruye si cambiaron las fuentes) la base SQLite con las
+    tablas originales y el dataset unificado 'tienda', indexados por id_venta,
+    id_producto, id_cliente, fecha y categoría. Retorna la versión vigente.
+    """
+    paths = get_dataset_paths()
+    version = _version_fuentes(paths)
+    if version_store(RUTA_DB) == version:
+        return version
+
+    tablas = {
+        "clientes": leer_fuente(paths["Clientes"]),
+        "productos": leer_fuente(paths["Productos"]),
+        "ventas": leer_fuente(paths["Ventas"]),
+        "detalle_ventas": leer_fuente(paths["Detalle Ventas"]),
+    }
+    tienda = unificar_tablas(tablas["clientes"], tablas["ventas"], tablas["detalle_ventas"], tablas["productos"])
+    tienda["categoria_corregida"] = clasificar_productos(tienda["nombre_producto"])
+    tablas["tienda"] = tienda
+
+    construir_store(tablas, version, RUTA_DB)
+    return version
+
+@st.cache_data
+def _consultar_version(sql, params, version):
+    # `version` forma parte de la clave de caché: un cambio en las fuentes invalida el resultado
+    return consultar(sql, params, RUTA_DB)
+
+def consultar_sql(sql, params=()):
+    """Ejecuta una consulta de solo lectura sobre el store SQLite y devuelve un DataFrame."""
+    return _consultar_version(sql, tuple(params), asegurar_store_sqlite())
+
+def sql_conteo_por_mes(tabla, columna_fecha):
+    """Cantidad de filas por mes ('AAAA-MM') de una tabla, como Series ordenada."""
+    df = consultar_sql(
+        f"SELECT strftime('%Y-%m', \"{columna_fecha}\") AS mes, COUNT(*) AS cantidad "
+        f'FROM "{tabla}" GROUP BY mes ORDER BY mes'
+    )
+    return df.set_index("mes")["cantidad"]
+
+def sql_conteo_por_valor(tabla, columna):
+    """Equivalente a value_counts() de una columna, resuelto en SQL."""
+    df = consultar_sql(
+        f'SELECT "{columna}" AS valor, COUNT(*) AS cantidad FROM "{tabla}" '
+        f'GROUP BY valor ORDER BY cantidad DESC, valor'
+    )
+    return df.set_index("valor")["cantidad"].rename_axis(columna)
+
+def sql_ventas_por_mes():
+    """Total vendido por mes sobre el dataset unificado, como graficos.tabla_ventas_por_mes."""
+    df = consultar_sql(
+        "SELECT strftime('%Y-%m', fecha) AS mes, SUM(total_venta) AS total_venta "
+        "FROM tienda GROUP BY mes ORDER BY mes"
+    )
+    df["mes"] = pd.PeriodIndex(df["mes"], freq="M")
+    return df
+
+# Métricas del ranking de productos (mismas que METRICAS_TOP del cubo)
+_SQL_METRICAS_TOP = {
+    "unidades": "SUM(cantidad)",
+    "ingresos": "SUM(total_venta)",
+    "transacciones": "COUNT(DISTINCT id_venta)",
+}
+
+def sql_top_productos(categoria, n=5, columna_categoria="categoria_corregida", metrica="unidades"):
+    """Productos con mayor `metrica` (unidades, ingresos o transacciones) dentro de una categoría."""
+    df = consultar_sql(
+        f'SELECT nombre_producto, {_SQL_METRICAS_TOP[metrica]} AS {metrica} FROM tienda '
+        f'WHERE "{columna_categoria}" = ? GROUP BY nombre_producto '
+        f'ORDER BY {metrica} DESC, nombre_producto LIMIT ?',
+        (categoria, n)
+    )
+    return df.set_index("nombre_producto")[metrica]
+
+# ==============================================================
+# 🟢 CUBO DE VENTAS AGREGADO
+# ==============================================================
+
+def _version_cubo(ruta):
+    """Versión del CSV unificado (tamaño y fecha) y de las reglas de clasificación, o None si no existe."""
+    try:
+        info = os.stat(ruta)
+    except OSError:
+        return None
+    return f"{info.st_size}:{info.st_mtime_ns}:{huella_reglas()}"
+
+def _cubo_vigente():
+    """(cubo, versión) del CSV unificado actual, o (None, None) si todavía no existe."""
+    ruta = get_dataset_paths()["df_tienda_aurelion"]
+    version = _version_cubo(ruta)
+    if version is None:
+        return None, None
+
+    cubo = leer_cubo(version)
+    if cubo is None:
+        df = cargar_columnar(ruta, "df_tienda_aurelion")
+        df["categoria_corregida"] = clasificar_productos(df["nombre_producto"])
+        cubo = construir_cubo(df)
+        guardar_cubo(cubo, version)
+    return cubo, version
+
+def cubo_ventas():
+    """
+    Cubo mes × categoría × producto × ciudad × medio de pago del dataset
+    unificado (ver src/utils/cubo_ventas.py). Se construye una sola vez por
+    versión del CSV unificado y de las reglas de clasificación, y se comparte
+    entre sesiones y procesos desde 'data/.cache/cubo_ventas'.
+    Retorna None si el dataset unificado todavía no existe.
+    """
+    return _cubo_vigente()[0]
+
+def indice_top_productos():
+    """
+    Ranking de productos por categoría (unidades, ingresos y transacciones)
+    del cubo vigente: elegir otra categoría o N es un acceso al diccionario.
+    Retorna None si el dataset unificado todavía no existe.
+    """
+    # La misma versión con la que se leyó el cubo: si el CSV cambia en el medio,
+    # el índice no queda guardado bajo una versión que no le corresponde
+    cubo, version = _cubo_vigente()
+    if cubo is None:
+        return None
+    return indice_top(cubo, version)
+
+def _actualizar_cubo_incremental(version_previa, delta, ruta):
+    """
+    Suma las ventas recién agregadas al CSV unificado al cubo y al índice de
+    rankings de la versión anterior, sin volver a recorrer todo el dataset.
+    Si no había cubo para esa versión, se construirá completo cuando se pida.
+    """
+    cubo = leer_cubo(version_previa)
+    if cubo is None:
+        return
+
+    delta = delta.assign(categoria_corregida=clasificar_productos(delta["nombre_producto"]))
+    cubo_nuevo = construir_cubo(delta)
+    indice = actualizar_indice_top(indice_top(cubo, version_previa), cubo_nuevo)
+    guardar_cubo(combinar_cubos(cubo, cubo_nuevo), _version_cubo(ruta), indice)
+
 # ==============================================================
 # 🟢 VERIFICACIÓN DEL DATAFRAME UNIFICADO
 # ==============================================================
@@ -10,7 +10,7 @@ def show_automated_eda():
     unsafe_allow_html=True
     )
     
-    df = load_and_merge_datasets()
+    df = load_and_merge_datasets(incremental=True)
     
     if df is not None:
         # Crear el perfil con ydata-profiling
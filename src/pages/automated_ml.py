@@ -5,6 +5,7 @@ import pandas as pd
 from pycaret.classification import *
 import os
 import pickle 
+from src.config import RUTA_DATASET_ML
 
 def show_automated_ml():
     """
@@ -46,11 +47,11 @@ def show_automated_ml():
     st.markdown("### 1. Carga del dataset preparado")
 
     try:
-        df = pd.read_csv("data/dataset_ml_productos.csv")
+        df = pd.read_csv(RUTA_DATASET_ML)
         st.success("Dataset cargado correctamente.")
         st.dataframe(df.head())
     except Exception as e:
-        st.error("⚠️ No se encontró `data/dataset_ml_productos.csv`. Ejecutá la página de preprocesamiento primero.")
+        st.error(f"⚠️ No se encontró `{RUTA_DATASET_ML}`. Ejecutá la página de preprocesamiento primero.")
         st.write(e)
         st.stop()
 
@@ -1,16 +1,20 @@
 # src/pages/eda_diagnostico.py
 
-import os
 import streamlit as st
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+from src.config import RUTA_TIENDA_MODIFICADO
 from src.utils.docs_loader import cargar_interpretacion
-from src.data_loader import load_dataset, verificar_unificacion_streamlit
-from src.utils.figures import mostrar_fig, save_fig_to_disk
-from src.utils.classification import clasificar_producto
-from src.utils.validation import verificar_fallbacks
-from src.utils.palette import PALETA
+from src.data_loader import (
+    BACKEND_SQLITE, cubo_ventas, indice_top_productos, load_dataset, sql_top_productos, sql_ventas_por_mes,
+    verificar_unificacion_streamlit
+)
+from src.utils import cubo_ventas as cubo, graficos
+from src.utils.disk_cache import guardar_csv_si_cambio
+from src.utils.figures import mostrar_fig_cacheada
+from src.utils.classification import clasificar_productos
+from src.utils.outliers import conteo_filas_por_metodo, detectar_outliers, filas_con_outliers
+from src.utils.validation import validar_clasificacion
+from src.utils.perfil_reglas import perfilar_reglas, perfil_a_json, reglas_sin_uso
 
 INTERPRETACIONES_PATH = "docs/documentacion_tienda_aurelion.md"
 
@@ -35,14 +39,22 @@ def show_diagnostic_eda():
     with st.expander("🟠 Recategorización de Productos", expanded=False):
 
         if "nombre_producto" in df.columns:
-            df["categoria_corregida"] = df["nombre_producto"].apply(clasificar_producto)
+            categorias = clasificar_productos(df["nombre_producto"])
+            df["categoria_corregida"] = categorias
             st.success("✅ Columna 'categoria_corregida' creada correctamente.")
 
+            resumen = categorias.attrs["clasificacion"]
+            st.caption(
+                f"🗂️ {resumen['nombres_unicos']} productos distintos: "
+                f"{resumen['desde_cache']} desde la caché, {resumen['clasificados']} clasificados con las reglas."
+            )
+
             st.write("### Vista previa")
             st.dataframe(df[["nombre_producto", "categoria_corregida"]].head())
 
             # Validación
-            alimentos_reales, fallas = verificar_fallbacks(df)
+            validacion = validar_clasificacion(df)
+            alimentos_reales, fallas = validacion["categoria_defecto"], validacion["fallbacks"]
 
             st.write(f"🔹 Alimentos secos detectados: **{len(alimentos_reales)}**")
             st.write(f"🔸 Productos en fallback real: **{len(fallas)}**")
@@ -53,6 +65,42 @@ def show_diagnostic_eda():
             else:
                 st.success("✅ No hay productos en fallback: todas las reglas funcionan correctamente.")
 
+            st.write("### Cobertura por categoría")
+            st.dataframe(validacion["por_categoria"].style.format({"porcentaje_filas": "{:.1f}%"}))
+
+            st.write("### Coincidencias por regla")
+            por_regla = validacion["por_regla"]
+            sin_uso = por_regla[por_regla["productos"] == 0]
+            st.caption(f"{len(por_regla)} patrones, {len(sin_uso)} sin ninguna coincidencia en este dataset.")
+            st.dataframe(por_regla.sort_values("productos", ascending=False), hide_index=True)
+
+            # Perfil de reglas: recorre los patrones uno por uno, así que solo se calcula a pedido
+            st.write("### Perfil de reglas")
+            if st.checkbox("⏱️ Medir costo y uso de cada patrón", value=False):
+                perfil = perfilar_reglas(df["nombre_producto"])
+                st.caption(
+                    f"{perfil['nombres']} productos distintos evaluados en "
+                    f"{perfil['segundos_total'] * 1000:.1f} ms · {len(perfil['fallbacks'])} llegaron al fallback."
+                )
+                st.dataframe(
+                    perfil["reglas"].sort_values("segundos", ascending=False)
+                    .style.format({"segundos": "{:.6f}", "tasa_coincidencia": "{:.1%}", "us_por_evaluacion": "{:.2f}"}),
+                    hide_index=True
+                )
+
+                sin_uso = reglas_sin_uso(perfil)
+                if not sin_uso.empty:
+                    st.info(f"ℹ️ {len(sin_uso)} patrones nunca decidieron una categoría en este dataset.")
+                if perfil["fallbacks"]:
+                    st.write("Productos que llegaron al fallback:", ", ".join(perfil["fallbacks"]))
+
+                st.download_button(
+                    label="📥 Descargar perfil de reglas (JSON)",
+                    data=perfil_a_json(perfil),
+                    file_name="perfil_reglas.json",
+                    mime="application/json"
+                )
+
     # ==============================================================
     # 3️⃣ Verificación del dataset unificado
     # ==============================================================
@@ -111,24 +159,11 @@ def show_diagnostic_eda():
 
         cols = st.columns(3)
         for i, col in enumerate(numericas):
-            fig, ax = plt.subplots(figsize=(5,4))
-            sns.histplot(            
-                df[col],
-                kde=True,
-                color=PALETA["claro"],
-                ax=ax,
-                edgecolor="white",   
-                linewidth=1                 
+            # Solo se vuelve a dibujar si cambió la columna graficada
+            mostrar_fig_cacheada(
+                graficos.distribucion, df[col],
+                figsize=(5,4), ancho=None, save=True, name=f"Distribución de {col}", contenedor=cols[i % 3]
             )
-
-            for line in ax.lines:
-                line.set_color(PALETA["secundario"])
-                line.set_linewidth(2)
-
-            ax.set_title(f"Distribución de {col}", fontsize=14, fontweight="bold", color=PALETA["secundario"])
-            save_fig_to_disk(fig)
-
-            cols[i % 3].pyplot(fig)
             
         # ✅ Interpretación conjunta
         tabla_interpretacion = cargar_interpretacion(
@@ -147,26 +182,17 @@ def show_diagnostic_eda():
         numeric_cols = df.select_dtypes(include='number').columns
         
         if len(numericas) > 1:
-            fig, ax = plt.subplots(figsize=(max(4, len(numeric_cols)*0.5), max(4, len(numeric_cols)*0.5)))
             corr = df[numericas].corr()
             
             # Eliminar “index—streamlit-generated”
             corr.index.name = ""
             corr.columns.name = ""
 
-            sns.heatmap(
-                corr,
-                annot=True,
-                cmap=sns.diverging_palette(25, 220, s=70, l=40, as_cmap=True),
-                center=0,
-                square=True, 
-                ax=ax
+            mostrar_fig_cacheada(
+                graficos.matriz_correlacion, corr,
+                figsize=(max(4, len(numeric_cols)*0.5), max(4, len(numeric_cols)*0.5)),
+                ancho=500, save=True, name="Matriz de Correlación"
             )
-
-            ax.set_title("Matriz de Correlación", fontsize=14, fontweight="bold", color=PALETA["secundario"])
-            
-            save_fig_to_disk(fig)
-            mostrar_fig(fig, save=True, ancho=500)
             
             # Cargar e insertar interpretación desde documentación
             interpretacion = cargar_interpretacion(INTERPRETACIONES_PATH, "🔸 Gráfica: correlacion")
@@ -185,80 +211,21 @@ def show_diagnostic_eda():
             # Convertir fecha y agrupar por mes
             df['fecha_venta'] = pd.to_datetime(df['fecha_venta'])
             df['mes'] = df['fecha_venta'].dt.to_period('M')
-            ventas_mes = df.groupby('mes')['total_venta'].sum().reset_index()
-
-            plt.figure(figsize=(9,6))
-            plt.plot(
-                ventas_mes['mes'].astype(str),
-                ventas_mes['total_venta'],
-                marker='o',
-                color=PALETA["principal"],
-                linewidth=2
-            )
-
-            # Etiquetas de valor en cada punto
-            for x, y in zip(ventas_mes['mes'].astype(str), ventas_mes['total_venta']):
-                plt.text(x, y + 8000, f"{y:,.0f}", ha='center', fontsize=9, color='#333333')
-
-            # Destacar máximo y mínimo
-            max_mes = ventas_mes.loc[ventas_mes['total_venta'].idxmax()]
-            min_mes = ventas_mes.loc[ventas_mes['total_venta'].idxmin()]
-            
-            fig, ax = plt.subplots(figsize=(9,6))
-            ax.plot(
-                ventas_mes['mes'].astype(str),
-                ventas_mes['total_venta'],
-                marker='o',
-                color=PALETA["principal"],
-                linewidth=2
-            )
-
-            # Etiquetas de valor en cada punto
-            for x, y in zip(ventas_mes['mes'].astype(str), ventas_mes['total_venta']):
-                ax.text(x, y + 8000, f"{y:,.0f}", ha='center', fontsize=9, color='#333333')
-
-            # Destacar máximo y mínimo
-            max_mes = ventas_mes.loc[ventas_mes['total_venta'].idxmax()]
-            min_mes = ventas_mes.loc[ventas_mes['total_venta'].idxmin()]
-
-            ax.scatter(str(max_mes['mes']), max_mes['total_venta'], color='green', s=80, label='Máximo')
-            ax.scatter(str(min_mes['mes']), min_mes['total_venta'], color='red', s=80, label='Mínimo')
-
-            ax.annotate(
-                f"Máximo: {max_mes['total_venta']:,.0f}",
-                xy=(str(max_mes['mes']), max_mes['total_venta']),
-                xytext=(0, 20),
-                textcoords='offset points',
-                ha='center',
-                color='green',
-                fontsize=9
-            )
-
-            ax.annotate(
-                f"Mínimo: {min_mes['total_venta']:,.0f}",
-                xy=(str(min_mes['mes']), min_mes['total_venta']),
-                xytext=(0, -25),
-                textcoords='offset points',
-                ha='center',
-                color='red',
-                fontsize=9
-            )
-
-            # Línea de promedio
-            promedio = ventas_mes['total_venta'].mean()
-            ax.axhline(promedio, color=PALETA["acento2"], linestyle='--', linewidth=1, label=f'Promedio: {promedio:,.0f}')
 
-            ax.set_ylim(200000, 650000)
-            ax.set_title("Ventas Totales por Mes", fontsize=14, fontweight="bold", color=PALETA["secundario"])
-            ax.set_xlabel("Mes")
-            ax.set_ylabel("Total Ventas")
-            ax.grid(True, linestyle='--', alpha=0.5)
-            ax.legend()
-            plt.tight_layout()
+            # El total por mes sale de SQLite o del cubo agregado, sin recorrer las transacciones
+            cubo_actual = None if BACKEND_SQLITE else cubo_ventas()
+            if BACKEND_SQLITE:
+                ventas_mes = sql_ventas_por_mes()
+            elif cubo_actual is not None:
+                ventas_mes = cubo.ventas_por_mes(cubo_actual)
+            else:
+                ventas_mes = graficos.tabla_ventas_por_mes(df)
 
             # ✅ Mostrar y guardar en Streamlit
-            save_fig_to_disk(fig)
-            mostrar_fig(fig, save=True, ancho=700) 
+            mostrar_fig_cacheada(
+                graficos.ventas_por_mes, ventas_mes,
+                figsize=(9,6), ancho=700, save=True, name="Ventas Totales por Mes"
+            )
             
             # Cargar e insertar interpretación desde documentación
             interpretacion = cargar_interpretacion(INTERPRETACIONES_PATH, "🔸 Gráfica: ventas_total_por_mes")
@@ -268,32 +235,10 @@ def show_diagnostic_eda():
         # --- Dispersión cantidad vs total ---
         if 'cantidad' in df.columns and 'total_venta' in df.columns:
 
-            fig, ax = plt.subplots(figsize=(8,5))
-            sns.regplot(
-                data=df,
-                x='cantidad',
-                y='total_venta',
-                scatter_kws={'color': PALETA["principal"], 'alpha': 0.6},
-                line_kws={'color': PALETA["acento1"]},
-                ci=None,
-                ax=ax
-            )
-
-            corr = df['cantidad'].corr(df['total_venta'])
-
-            ax.set_title("Relación Cantidad - Total Venta", fontsize=14, fontweight="bold", color=PALETA["secundario"])
-            ax.grid(True, linestyle='--', alpha=0.5)
-
-            ax.text(
-                x=df['cantidad'].min() + 0.05*(df['cantidad'].max()-df['cantidad'].min()),
-                y=df['total_venta'].max()*0.95,
-                s=f"Correlación: {corr:.2f}",
-                fontsize=12,
-                color=PALETA["acento1"]
+            mostrar_fig_cacheada(
+                graficos.relacion_cantidad_total, df[['cantidad', 'total_venta']],
+                figsize=(8,5), ancho=700, save=True, name="Relación Cantidad - Total Venta"
             )
-
-            save_fig_to_disk(fig)
-            mostrar_fig(fig, save=True, ancho=700)
             
             # Cargar e insertar interpretación desde documentación
             interpretacion = cargar_interpretacion(INTERPRETACIONES_PATH, "🔸 Gráfica: relacion_cantidad")
@@ -313,23 +258,43 @@ def show_diagnostic_eda():
                     categorias
                 )
 
-                df_cat = df[df["categoria_corregida"] == categoria_seleccionada]
-                top_prod = (
-                    df_cat.groupby("nombre_producto")["cantidad"]
-                    .sum()
-                    .sort_values(ascending=False)
-                    .head(5)
+                col_metrica, col_n = st.columns(2)
+                metrica = col_metrica.selectbox(
+                    "Ordenar por:",
+                    ["unidades", "ingresos", "transacciones"],
+                    format_func=str.capitalize
                 )
-
-                st.write(f"### Top 5 de {categoria_seleccionada}")
+                n_top = col_n.slider("Cantidad de productos:", 3, 15, 5)
+
+                # El ranking de cada categoría ya está calculado: cambiar de categoría es un acceso al índice
+                indice = None if BACKEND_SQLITE else indice_top_productos()
+                if BACKEND_SQLITE:
+                    top_prod = sql_top_productos(categoria_seleccionada, n=n_top, metrica=metrica)
+                elif indice is not None:
+                    top_prod = cubo.top_n(indice, categoria_seleccionada, n=n_top, metrica=metrica)
+                else:
+                    columna, funcion = {
+                        "unidades": ("cantidad", "sum"),
+                        "ingresos": ("total_venta", "sum"),
+                        "transacciones": ("id_venta", "nunique"),
+                    }[metrica]
+                    df_cat = df[df["categoria_corregida"] == categoria_seleccionada]
+                    top_prod = (
+                        df_cat.groupby("nombre_producto", observed=True)[columna]
+                        .agg(funcion)
+                        .rename(metrica)
+                        .sort_values(ascending=False)
+                        .head(n_top)
+                    )
+
+                st.write(f"### Top {n_top} de {categoria_seleccionada}")
                 st.dataframe(top_prod)
 
-                fig, ax = plt.subplots(figsize=(5,3))
-                ax.barh(top_prod.index, top_prod.values, color=PALETA["principal"])
-                ax.invert_yaxis()
-                ax.set_title(f"Top 5 Productos — {categoria_seleccionada}", fontsize=14, fontweight="bold", color=PALETA["secundario"])
-
-                mostrar_fig(fig, save=True, ancho=700)
+                # Gráfico interactivo: se muestra pero no se guarda en assets/plots
+                mostrar_fig_cacheada(
+                    graficos.top_productos, top_prod, {"categoria": categoria_seleccionada},
+                    figsize=(5,3), ancho=700
+                )
 
     # ==============================================================
     # 9️⃣ Outliers
@@ -340,24 +305,29 @@ def show_diagnostic_eda():
         cols = st.columns(3)                                                                                                                                                                          
         
         for i, col in enumerate(numericas):
-            fig, ax = plt.subplots(figsize=(5,4))
-            sns.boxplot(
-                x=df[col],
-                color=PALETA["acento1"],
-                ax=ax,
-                flierprops=dict(marker='o', color=PALETA["claro"], alpha=0.5)
-            )
-            sns.stripplot(
-                x=df[col],
-                color=PALETA["claro"],
-                size=3,
-                alpha=0.4,
-                jitter=True,
-                ax=ax
+            mostrar_fig_cacheada(
+                graficos.outliers, df[col],
+                figsize=(5,4), ancho=None, save=True, name=f"outliers_{col}", contenedor=cols[i % 3]
             )
-            ax.set_title(f"Boxplot — {col}", fontsize=14, fontweight="bold", color=PALETA["secundario"])
-            save_fig_to_disk(fig, name=f"outliers_{col}")
-            cols[i % 3].pyplot(fig)
+
+        # ----- DETECCIÓN AUTOMÁTICA (IQR, z-score y MAD) -----
+        marcas, resumen = detectar_outliers(df, numericas)
+        filas_por_metodo = conteo_filas_por_metodo(marcas)
+
+        st.markdown("### 🔎 Detección de Outliers")
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Filas con outliers (IQR)", filas_por_metodo["iqr"])
+        c2.metric("Filas con outliers (z-score)", filas_por_metodo["zscore"])
+        c3.metric("Filas con outliers (MAD)", filas_por_metodo["mad"])
+
+        st.dataframe(resumen[[
+            "n", "q1", "q3", "limite_inferior_iqr", "limite_superior_iqr", "mad",
+            "outliers_iqr", "outliers_zscore", "outliers_mad"
+        ]])
+
+        with st.expander("Ver filas marcadas en los tres métodos", expanded=False):
+            en_todos = filas_con_outliers(marcas, "iqr") & filas_con_outliers(marcas, "zscore") & filas_con_outliers(marcas, "mad")
+            st.dataframe(df.loc[en_todos, numericas])
             
         # ----- INTERPRETACIÓN COMBINADA -----
         interpretacion = cargar_interpretacion(
@@ -385,15 +355,21 @@ def show_diagnostic_eda():
     # Guardado final
     # ==============================================================
 
-    os.makedirs("data", exist_ok=True)
-    ruta_guardado = os.path.join("data", "df_tienda_aurelion_modificado.csv")
-
-    df.to_csv(ruta_guardado, index=False)
-    st.success(f"💾 Dataset guardado automáticamente en {ruta_guardado}")
-
-    st.download_button(
-        label="📥 Descargar dataset modificado",
-        data=df.to_csv(index=False).encode('utf-8'),
-        file_name='df_tienda_aurelion_modificado.csv',
-        mime='text/csv'
-    )
+    ruta_guardado = RUTA_TIENDA_MODIFICADO
+
+    # Solo se reescribe si cambió el contenido (temporal + renombrado)
+    if guardar_csv_si_cambio(df, ruta_guardado, index=False):
+        st.success(f"💾 Dataset guardado automáticamente en {ruta_guardado}")
+    else:
+        st.success(f"💾 Dataset sin cambios: {ruta_guardado} ya está actualizado")
+
+    # El archivo guardado es el contenido a descargar: se lee solo cuando se pide
+    if st.button("📥 Preparar descarga del dataset modificado"):
+        with open(ruta_guardado, "rb") as f:
+            st.download_button(
+                label="📥 Descargar dataset modificado",
+                data=f.read(),
+                file_name='df_tienda_aurelion_modificado.csv',
+                mime='text/csv',
+                on_click="ignore"
+            )
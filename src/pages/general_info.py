@@ -2,7 +2,7 @@
 import os
 import pandas as pd
 import streamlit as st
-from src.data_loader import get_dataset_paths, load_dataset
+from src.data_loader import get_dataset_paths, probe_dataset
 
 def show_general_info():
     """
@@ -10,7 +10,7 @@ def show_general_info():
 
     Flujo principal:
     1. Permite seleccionar un dataset de los disponibles.
-    2. Si el dataset se carga correctamente:
+    2. Si el dataset se puede inspeccionar (sin cargarlo completo):
         - Muestra la fecha de última modificación y tamaño del archivo.
         - Muestra las primeras filas del dataset.
         - Muestra la estructura de columnas y sus tipos.
@@ -29,9 +29,9 @@ def show_general_info():
     datasets_visibles = {k: v for k, v in dataset_paths.items() if k != "df_tienda_aurelion"}
 
     dataset = st.selectbox("Seleccione el dataset:", list(datasets_visibles.keys()))
-    df = load_dataset(dataset)
+    info_dataset = probe_dataset(dataset)
 
-    if df is not None:
+    if info_dataset is not None:
         ruta = dataset_paths[dataset]
         if os.path.exists(ruta):
             info = os.stat(ruta)
@@ -41,14 +41,14 @@ def show_general_info():
             st.caption(f"💾 **Tamaño del archivo:** {tamano_kb} KB")
 
         st.write("**Vista previa de los datos:**")
-        st.dataframe(df.head(), use_container_width=True)
+        st.dataframe(info_dataset["vista_previa"], use_container_width=True)
 
         st.write("**Estructura de columnas y tipos:**")
         tipos_df = pd.DataFrame({
-            "Columna": df.columns,
-            "Tipo de dato": df.dtypes.astype(str)
+            "Columna": info_dataset["tipos"].index,
+            "Tipo de dato": info_dataset["tipos"].values
         })
         st.table(tipos_df)
-        st.write("**Cantidad de registros:**", df.shape[0])
+        st.write("**Cantidad de registros:**", info_dataset["filas"])
     else:
         st.warning("No se pudo cargar el dataset seleccionado.")
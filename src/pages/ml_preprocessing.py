@@ -3,6 +3,10 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from src.config import RUTA_DATASET_ML, RUTA_TIENDA_MODIFICADO
+from src.data_loader import cargar_columnar
+from src.utils.outliers import detectar_outliers, filas_con_outliers
+from src.utils.schema import formatear_reporte_memoria
 
 
 def show_ml_preprocessing():
@@ -32,8 +36,9 @@ def show_ml_preprocessing():
     st.markdown("### 1. Carga del dataset")
 
     try:
-        df = pd.read_csv("data/df_tienda_aurelion_modificado.csv")
+        df = cargar_columnar(RUTA_TIENDA_MODIFICADO, "df_tienda_aurelion_modificado")
         st.success("Dataset cargado correctamente.")
+        st.caption(f"💾 **Memoria en sesión:** {formatear_reporte_memoria(df)}")
 
         with st.expander("🔸 Ver primeras filas"):
             st.dataframe(df.head())
@@ -95,7 +100,7 @@ def show_ml_preprocessing():
     """)
 
     df_prod = (
-        df.groupby(["id_producto", "nombre_producto", "categoria_corregida"])
+        df.groupby(["id_producto", "nombre_producto", "categoria_corregida"], observed=True)
         .agg(
             total_unidades=("cantidad", "sum"),
             total_ventas=("total_venta", "sum"),
@@ -133,6 +138,20 @@ def show_ml_preprocessing():
         else:
             st.error("❌ Las sumas NO coinciden. Revisar el proceso.")
 
+    # Mismo detector que EDA Diagnóstico, sobre las métricas por producto
+    with st.expander("🔸 Outliers en las métricas por producto"):
+        metricas = [
+            "total_unidades", "total_ventas", "cant_transacciones", "precio_promedio",
+            "ventas_por_transaccion", "unidades_por_transaccion",
+        ]
+        marcas, resumen = detectar_outliers(df_prod, metricas)
+        st.dataframe(resumen[["mediana", "limite_inferior_iqr", "limite_superior_iqr", "outliers_iqr", "outliers_zscore", "outliers_mad"]])
+
+        atipicos = filas_con_outliers(marcas, "iqr")
+        st.write(f"**Productos con alguna métrica fuera del rango IQR:** {int(atipicos.sum())}")
+        st.dataframe(df_prod.loc[atipicos, ["nombre_producto", "categoria_corregida", *metricas]])
+        st.caption("Se informan para revisión: el dataset exportado no se modifica.")
+
     st.markdown("---")
 
     # ==============================================================
@@ -280,8 +299,8 @@ def show_ml_preprocessing():
     st.dataframe(df_final.head())
 
     # OPCIÓN 1: Exportación automática
-    df_final.to_csv("data/dataset_ml_productos.csv", index=False)
-    st.success("Archivo exportado automáticamente: `data/dataset_ml_productos.csv`")
+    df_final.to_csv(RUTA_DATASET_ML, index=False)
+    st.success(f"Archivo exportado automáticamente: `{RUTA_DATASET_ML}`")
 
     # OPCIÓN 2: Botón de descarga (opcional)
     csv = df_final.to_csv(index=False)
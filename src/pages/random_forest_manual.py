@@ -3,26 +3,27 @@
 import streamlit as st
 import pandas as pd
 import pickle
-import matplotlib.pyplot as plt
 import seaborn as sns
 import os
-import numpy as np
 
-from sklearn.model_selection import train_test_split, cross_val_score, learning_curve
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import cross_val_score
 from sklearn.metrics import (
     accuracy_score, 
     precision_score, 
     recall_score, 
     f1_score,
     roc_auc_score,
-    confusion_matrix,
-    classification_report,
-    RocCurveDisplay
+    confusion_matrix
 )
 
-from src.utils.figures import mostrar_fig, save_fig_to_disk
+from src.config import RUTA_DATASET_ML
+from src.utils import graficos
+from src.utils.figures import figura, mostrar_fig
 from src.utils.palette import PALETA
+from src.utils.random_forest import (
+    COLUMNAS_EXCLUIDAS, TARGET, calcular_curva_aprendizaje, entrenar_random_forest, tabla_reporte_por_clase
+)
+from src.utils.schema import leer_csv_tipado
 
 
 # ===============================================================
@@ -44,7 +45,7 @@ def show_random_forest_manual():
 
     try:
         # Se intenta cargar el dataset procesado previamente
-        df = pd.read_csv("data/dataset_ml_productos.csv")
+        df = leer_csv_tipado(RUTA_DATASET_ML, "dataset_ml_productos")
         st.success("Dataset cargado correctamente.")
         
         # Se muestra un preview de las primeras filas
@@ -52,7 +53,7 @@ def show_random_forest_manual():
         
     except FileNotFoundError:
         # Detiene la ejecución si el dataset no existe
-        st.error("⚠️ No se encontró el archivo data/dataset_ml_productos.csv.")
+        st.error(f"⚠️ No se encontró el archivo {RUTA_DATASET_ML}.")
         st.stop()
 
     # ===============================================================
@@ -61,7 +62,7 @@ def show_random_forest_manual():
     st.markdown("### 2. Variable Objetivo")
 
     # Variable que se quiere predecir
-    target = "nivel_demanda"
+    target = TARGET
     
     # Validación de existencia del target
     if target not in df.columns:
@@ -69,9 +70,7 @@ def show_random_forest_manual():
         st.stop()
     
     # Selección automática de features eliminando columnas no deseadas
-    features= [col for col in df.columns 
-              if col not in ['nivel_demanda', 'total_unidades', 
-                            'total_ventas', 'unidades_por_transaccion']]
+    features= [col for col in df.columns if col not in COLUMNAS_EXCLUIDAS]
     
     # Información al usuario
     st.info(f"**Target:** `{target}` (clasificación multiclase: 0=baja, 1=media, 2=alta)")
@@ -117,26 +116,26 @@ def show_random_forest_manual():
     distribucion = df[target].value_counts().sort_index()
     st.dataframe(distribucion.rename_axis("Clase").reset_index(name="Cantidad"))
 
-    fig, ax = plt.subplots(figsize=(8, 4))
+    with figura(figsize=(8, 4)) as (fig, ax):
 
-    sns.barplot(
-        x=distribucion.index, 
-        y=distribucion.values, 
-        palette=list(PALETA.values()),  
-        ax=ax
-    )
+        sns.barplot(
+            x=distribucion.index, 
+            y=distribucion.values, 
+            palette=list(PALETA.values()),  
+            ax=ax
+        )
     
-    # Estética del gráfico
-    ax.set_title(
-        "Distribución de Clases - Nivel de Demanda",
-        fontsize=16, fontweight="bold", color=PALETA["secundario"],
-        pad=15
-    )
-    ax.set_xlabel("Nivel de Demanda (0=baja, 1=media, 2=alta)", fontsize=12, fontweight="bold")
-    ax.set_ylabel("Cantidad de Productos", fontsize=12, fontweight="bold")
-    ax.grid(alpha=0.2)
+        # Estética del gráfico
+        ax.set_title(
+            "Distribución de Clases - Nivel de Demanda",
+            fontsize=16, fontweight="bold", color=PALETA["secundario"],
+            pad=15
+        )
+        ax.set_xlabel("Nivel de Demanda (0=baja, 1=media, 2=alta)", fontsize=12, fontweight="bold")
+        ax.set_ylabel("Cantidad de Productos", fontsize=12, fontweight="bold")
+        ax.grid(alpha=0.2)
     
-    mostrar_fig(fig)
+        mostrar_fig(fig)
 
     # Advertencia por dataset pequeño
     if len(df) < 100:
@@ -160,28 +159,8 @@ def show_random_forest_manual():
             X = df[features]
             y = df[target]
 
-            # División del dataset respetando la proporción original de clases
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, 
-                test_size=0.31,     # Mismo que PyCaret
-                random_state=789,   # Mismo que PyCaret
-                stratify=y
-            )
-            
-            # Configuración del modelo con hiperparámetros seleccionados           
-            model = RandomForestClassifier(
-                n_estimators=n_estimators,  # Más árboles, 200
-                max_depth=max_depth,        # Más profundidad, 15 
-                min_samples_split=5,        # Evita overfitting
-                min_samples_leaf=2,
-                max_features='sqrt',        # Mejor generalización
-                class_weight='balanced',
-                random_state=789,
-                n_jobs=-1
-            )
-            
-            # Entrenamiento del modelo
-            model.fit(X_train, y_train)
+            # División train/test y entrenamiento
+            model, X_test, y_test = entrenar_random_forest(X, y, n_estimators, max_depth)
 
         st.success("✅ Modelo entrenado correctamente")
 
@@ -250,39 +229,9 @@ def show_random_forest_manual():
         # AUC macro promedia el AUC de cada clase
         auc_macro = roc_auc_score(y_test, y_proba, multi_class="ovr", average="macro")
 
-        fig, ax = plt.subplots(figsize=(8, 6))
-        colores = plt.cm.tab10.colors
-
-        # Dibujar una curva ROC por cada clase
-        for i, clase in enumerate(model.classes_):
-            RocCurveDisplay.from_predictions(
-                y_test == clase,    # binariza la clase actual
-                y_proba[:, i],      # probabilidades de esa clase
-                name=f"Clase {clase}",
-                ax=ax,
-                color=colores[i]
-            )
-
-        # Estética del gráfico
-        ax.set_title(
-                "Curvas ROC (Multiclase - One vs Rest)",
-                fontsize=16, fontweight="bold", color=PALETA["secundario"],
-                pad=15
-            )
-        ax.set_xlabel("Tasa de Falsos Positivos (FPR)", fontsize=12, fontweight="bold")
-        ax.set_ylabel("Tasa de Verdaderos Positivos (TPR)", fontsize=12, fontweight="bold")
-        ax.grid(alpha=0.2)
-        
-        ax.legend(
-                title="Clases",
-                fontsize=10,
-                title_fontsize=11,
-                loc="lower right",
-                frameon=True
-            )
-        
-        save_fig_to_disk(fig)
-        mostrar_fig(fig)
+        with figura(figsize=(8, 6)) as (fig, ax):
+            graficos.curvas_roc(fig, ax, y_test, y_proba, model.classes_)
+            mostrar_fig(fig, save=True)
 
         # Valor del AUC macro
         st.write(f"**AUC (macro):** {auc_macro:.4f}")
@@ -296,32 +245,9 @@ def show_random_forest_manual():
         cm = confusion_matrix(y_test, y_pred)
         labels = model.classes_
 
-        fig, ax = plt.subplots(figsize=(5, 5))
-        
-        # Heatmap con anotaciones
-        sns.heatmap(
-            cm,
-            annot=True,
-            fmt="d",
-            cmap=sns.diverging_palette(25, 220, s=70, l=40, as_cmap=True), 
-            center=0,
-            xticklabels=labels,
-            yticklabels=labels,
-            cbar=True,
-            square=True,  
-            linewidths=0.5,  
-            linecolor='white', 
-            cbar_kws={'shrink': 0.6}, 
-            ax=ax
-        )       
-        
-        # Estilo del gráfico
-        ax.set_title("Matriz de Confusión", fontsize=14, fontweight="bold", color=PALETA["secundario"])
-        ax.set_xlabel("Predicción", fontsize=12, fontweight="bold")
-        ax.set_ylabel("Real", fontsize=12, fontweight="bold")
-        
-        save_fig_to_disk(fig)
-        mostrar_fig(fig, ancho=500)
+        with figura(figsize=(5, 5)) as (fig, ax):
+            graficos.matriz_confusion(fig, ax, cm, labels)
+            mostrar_fig(fig, ancho=500, save=True)
 
         # ===============================================================
         # 🔸 IMPORTANCIAS
@@ -336,29 +262,9 @@ def show_random_forest_manual():
 
         st.dataframe(importances)
 
-        fig, ax = plt.subplots(figsize=(8, 6))
-        
-        # Gráfico de barras horizontal
-        sns.barplot(
-            data=importances.sort_values("importancia", ascending=True),
-            x="importancia",
-            y="variable",
-            color=PALETA["acento1"],
-            ax=ax
-        )
-        
-        # Títulos y etiquetas
-        ax.set_title(
-            "Importancia de Variables",
-            fontsize=14,
-            fontweight="bold",
-            color=PALETA["secundario"]
-        )
-        ax.set_xlabel("Importancia", fontsize=12,fontweight="bold")
-        ax.set_ylabel("Variables", fontsize=12,fontweight="bold")
-        
-        save_fig_to_disk(fig)
-        mostrar_fig(fig)
+        with figura(figsize=(8, 6)) as (fig, ax):
+            graficos.importancia_variables(fig, ax, importances)
+            mostrar_fig(fig, save=True)
 
 
         # ===============================================================
@@ -376,16 +282,8 @@ def show_random_forest_manual():
         **🔸 Objetivo ideal**: Valores altos y balanceados en las 3 métricas para todas las clases.
         """)
 
-        # Obtener reporte en dict
-        report = classification_report(
-            y_test, y_pred, 
-            output_dict=True, 
-            zero_division=0
-        )
-
-        # Convertir a DataFrame solo para clases
-        report_df = pd.DataFrame(report).transpose()
-        report_df = report_df.loc[[str(c) for c in model.classes_], ["precision", "recall", "f1-score"]]
+        # Reporte como DataFrame, solo para clases
+        report_df = tabla_reporte_por_clase(y_test, y_pred, model.classes_)
 
         # Mostrar tabla
         st.dataframe(
@@ -423,40 +321,9 @@ def show_random_forest_manual():
             
 
         # Heatmap
-        fig, ax = plt.subplots(figsize=(5, 5))  
-        sns.heatmap(
-            report_df,
-            annot=True,
-            fmt=".3f",
-            cmap=sns.diverging_palette(25, 220, s=70, l=40, as_cmap=True), 
-            center=0,
-            xticklabels=["Precision", "Recall", "F1-Score"],
-            yticklabels=labels,
-            cbar=True,
-            square=True,  
-            linewidths=0.5,  
-            linecolor='white', 
-            cbar_kws={'shrink': 0.6},  
-            ax=ax
-        )
-        
-        ax.set_title(
-            "Classification Report - Métricas por Clase",
-            fontsize=14,
-            fontweight="bold",
-            color=PALETA["secundario"]
-        )
-
-        ax.set_xlabel("Métrica", fontsize=12, fontweight="bold")
-        ax.set_ylabel("Clase", fontsize=12, fontweight="bold")
-
-        # Ajustar tamaño de las etiquetas de los ejes
-        ax.tick_params(axis='both', labelsize=9)
-        
-        plt.tight_layout()  # Ajustar márgenes automáticamente
-        
-        save_fig_to_disk(fig)
-        mostrar_fig(fig, ancho=500)
+        with figura(figsize=(5, 5)) as (fig, ax):
+            graficos.reporte_por_clase(fig, ax, report_df, labels)
+            mostrar_fig(fig, ancho=500, save=True)
 
         # ===============================================================
         # 1️⃣2️⃣ Curva de Aprendizaje (Learning Curve)
@@ -476,33 +343,7 @@ def show_random_forest_manual():
         - **Todas suben**: Más datos podrían ayudar
         """)
 
-        train_sizes, train_scores, test_scores = learning_curve(
-            model, X, y,
-            cv=cv_folds,
-            train_sizes=np.linspace(0.2, 1.0, 5),
-            scoring="accuracy",
-            n_jobs=-1
-        )
-
-        train_mean = train_scores.mean(axis=1)
-        test_mean = test_scores.mean(axis=1)
-
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.plot(train_sizes, train_mean, marker="o", label="Entrenamiento")
-        ax.plot(train_sizes, test_mean, marker="o", label="Validación")
-
-        ax.set_title(
-            "Learning Curve - Accuracy",
-            fontsize=14,
-            fontweight="bold",
-            color=PALETA["secundario"]
-        )
-
-        ax.set_xlabel("Cantidad de muestras de entrenamiento", fontsize=12, fontweight="bold")
-        ax.set_ylabel("Accuracy", fontsize=12, fontweight="bold")
-        ax.grid(alpha=0.2)
-        ax.legend()
-
+        train_sizes, train_mean, test_mean = calcular_curva_aprendizaje(model, X, y, cv_folds)
 
         # Análisis automático de la curva
         brecha_final = train_mean[-1] - test_mean[-1]
@@ -523,9 +364,10 @@ def show_random_forest_manual():
             st.write(f"📊 **PRECISIÓN ACEPTABLE**: Accuracy final de {accuracy_final:.3f}")
         else:
             st.write(f"🔧 **PRECISIÓN A MEJORAR**: Accuracy final de {accuracy_final:.3f}")
-            
-        save_fig_to_disk(fig)    
-        mostrar_fig(fig)
+
+        with figura(figsize=(8, 5)) as (fig, ax):
+            graficos.curva_aprendizaje(fig, ax, train_sizes, train_mean, test_mean)
+            mostrar_fig(fig, save=True)
 
 
         # ===============================================================
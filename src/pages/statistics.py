@@ -3,9 +3,12 @@ import io
 import streamlit as st
 import pandas as pd
 import seaborn as sns
-import matplotlib.pyplot as plt
-from src.data_loader import get_dataset_paths, load_dataset
+from src.data_loader import (
+    BACKEND_SQLITE, get_dataset_paths, load_dataset, sql_conteo_por_mes, sql_conteo_por_valor
+)
+from src.utils.figures import figura, mostrar_fig
 from src.utils.palette import PALETA, COLORES_BARRAS, COLORES_PIE
+from src.utils.schema import formatear_reporte_memoria
 
 def show_statistics():
     """
@@ -48,6 +51,7 @@ def show_statistics():
         st.markdown(f"**Información general de {dataset_nombre}:**")
         st.write(f"- Número de registros: {df.shape[0]}")
         st.write(f"- Número de columnas: {df.shape[1]}")
+        st.write(f"- Memoria en sesión: {formatear_reporte_memoria(df)}")
         st.write("**Tipos de columnas:**")
         st.table(pd.DataFrame(df.dtypes, columns=["Tipo"]).reset_index().rename(columns={"index":"Columna"}))
 
@@ -77,113 +81,115 @@ def show_statistics():
             if len(numeric_cols) > 1:
                 st.markdown("**Mapa de correlación (numéricas):**")
                 corr = df[numeric_cols].corr()
-                fig, ax = plt.subplots(figsize=(max(5, len(numeric_cols)*0.5), max(5, len(numeric_cols)*0.5)))
-                sns.heatmap(corr, cmap=sns.diverging_palette(25, 220, s=70, l=40, as_cmap=True), center=0)
-                plt.tight_layout()
-                buf = io.BytesIO()
-                fig.savefig(buf, format="png", dpi=100)
-                buf.seek(0)
-                st.image(buf)            
+                with figura(figsize=(max(5, len(numeric_cols)*0.5), max(5, len(numeric_cols)*0.5))) as (fig, ax):
+                    sns.heatmap(corr, cmap=sns.diverging_palette(25, 220, s=70, l=40, as_cmap=True), center=0, ax=ax)
+                    fig.tight_layout()
+                    buf = io.BytesIO()
+                    fig.savefig(buf, format="png", dpi=100)
+                    buf.seek(0)
+                    st.image(buf)            
             
 
-        # --- Función auxiliar para mostrar figuras ---
-        # Convierte la figura de Matplotlib a imagen para Streamlit
-        def mostrar_fig(fig, ancho=500):
-            buf = io.BytesIO()
-            fig.savefig(buf, format="png", dpi=120, bbox_inches='tight')
-            buf.seek(0)
-            st.image(buf, width=ancho)
-            plt.close(fig)
-
-
         # --- Visualizaciones específicas por dataset ---
         if dataset_nombre == "Clientes":
             st.markdown("### Clientes")
             # Clientes por ciudad (barras)
-            fig, ax = plt.subplots()
-            df['ciudad'].value_counts().plot(kind='bar', ax=ax, color=COLORES_BARRAS)
-            ax.set_ylabel('Cantidad de Clientes')
-            ax.set_title('Clientes por Ciudad')
-            mostrar_fig(fig, ancho=500)
+            with figura() as (fig, ax):
+                df['ciudad'].value_counts().plot(kind='bar', ax=ax, color=COLORES_BARRAS)
+                ax.set_ylabel('Cantidad de Clientes')
+                ax.set_title('Clientes por Ciudad')
+                mostrar_fig(fig, ancho=500)
 
             # Clientes registrados por mes (barras)
-            fig, ax = plt.subplots()
-            df['fecha_alta'] = pd.to_datetime(df['fecha_alta'])
-            df['fecha_alta'].dt.to_period('M').value_counts().sort_index().plot(kind='bar', ax=ax, color=COLORES_BARRAS)
-            ax.set_title('Clientes registrados por mes')
-            ax.set_ylabel('Cantidad')
-            mostrar_fig(fig, ancho=500)
+            with figura() as (fig, ax):
+                if BACKEND_SQLITE:
+                    altas_mes = sql_conteo_por_mes("clientes", "fecha_alta")
+                else:
+                    df['fecha_alta'] = pd.to_datetime(df['fecha_alta'])
+                    altas_mes = df['fecha_alta'].dt.to_period('M').value_counts().sort_index()
+                altas_mes.plot(kind='bar', ax=ax, color=COLORES_BARRAS)
+                ax.set_title('Clientes registrados por mes')
+                ax.set_ylabel('Cantidad')
+                mostrar_fig(fig, ancho=500)
 
         elif dataset_nombre == "Productos":
             st.markdown("### Productos")
             # Distribución de precios unitarios (histograma) con media y mediana
-            fig, ax = plt.subplots()
-            sns.histplot(df['precio_unitario'], bins=20, kde=True, color=PALETA["suave"], ax=ax)
-            media = df['precio_unitario'].mean()
-            mediana = df['precio_unitario'].median()
-            ax.axvline(media, color=PALETA["acento1"], linestyle='--', linewidth=2, label=f'Media: {media:.2f}')
-            ax.axvline(mediana, color=PALETA["claro"], linestyle='-', linewidth=2, label=f'Mediana: {mediana:.2f}')
-            ax.set_title('Distribución de precios unitarios')
-            ax.set_xlabel('Precio unitario ($)')
-            ax.legend()
-            mostrar_fig(fig, ancho=500)
+            with figura() as (fig, ax):
+                sns.histplot(df['precio_unitario'], bins=20, kde=True, color=PALETA["suave"], ax=ax)
+                media = df['precio_unitario'].mean()
+                mediana = df['precio_unitario'].median()
+                ax.axvline(media, color=PALETA["acento1"], linestyle='--', linewidth=2, label=f'Media: {media:.2f}')
+                ax.axvline(mediana, color=PALETA["claro"], linestyle='-', linewidth=2, label=f'Mediana: {mediana:.2f}')
+                ax.set_title('Distribución de precios unitarios')
+                ax.set_xlabel('Precio unitario ($)')
+                ax.legend()
+                mostrar_fig(fig, ancho=500)
 
             # Cantidad de productos por categoría (barras)
-            fig, ax = plt.subplots()
-            df['categoria'].value_counts().plot(
-                kind='bar',
-                ax=ax,
-                color=[COLORES_BARRAS[i % len(COLORES_BARRAS)] for i in range(len(df['categoria'].value_counts()))]
-            )
-            ax.set_ylabel('Cantidad de productos')
-            ax.set_title('Cantidad de productos por categoría')
-            mostrar_fig(fig, ancho=500)
+            with figura() as (fig, ax):
+                df['categoria'].value_counts().plot(
+                    kind='bar',
+                    ax=ax,
+                    color=[COLORES_BARRAS[i % len(COLORES_BARRAS)] for i in range(len(df['categoria'].value_counts()))]
+                )
+                ax.set_ylabel('Cantidad de productos')
+                ax.set_title('Cantidad de productos por categoría')
+                mostrar_fig(fig, ancho=500)
 
         elif dataset_nombre == "Ventas":
             st.markdown("### Ventas")
-            
+
+            # Conteos sobre la tabla de ventas ya cargada (o en SQLite): un recorrido por columna
             # Ventas por mes (barras)
-            fig, ax = plt.subplots()
-            df['fecha'] = pd.to_datetime(df['fecha'])
-            df['fecha'].dt.to_period('M').value_counts().sort_index().plot(kind='bar', ax=ax, color=COLORES_BARRAS)
-            ax.set_title('Ventas por mes')
-            ax.set_ylabel('Cantidad de ventas')
-            mostrar_fig(fig, ancho=500)
+            with figura() as (fig, ax):
+                if BACKEND_SQLITE:
+                    ventas_mes = sql_conteo_por_mes("ventas", "fecha")
+                else:
+                    df['fecha'] = pd.to_datetime(df['fecha'])
+                    ventas_mes = df['fecha'].dt.to_period('M').value_counts().sort_index()
+                ventas_mes.plot(kind='bar', ax=ax, color=COLORES_BARRAS)
+                ax.set_title('Ventas por mes')
+                ax.set_ylabel('Cantidad de ventas')
+                mostrar_fig(fig, ancho=500)
 
             # Distribución de medios de pago (pie)
-            fig, ax = plt.subplots()
-            df['medio_pago'].value_counts().plot(kind='pie', autopct='%1.1f%%', ax=ax,
-                                                 colors=COLORES_PIE)
-            ax.set_ylabel('')
-            ax.set_title('Distribución de medios de pago')
-            mostrar_fig(fig, ancho=500)
+            with figura() as (fig, ax):
+                if BACKEND_SQLITE:
+                    medios_pago = sql_conteo_por_valor("ventas", "medio_pago")
+                else:
+                    medios_pago = df['medio_pago'].value_counts()
+                medios_pago.plot(kind='pie', autopct='%1.1f%%', ax=ax, colors=COLORES_PIE)
+                ax.set_ylabel('')
+                ax.set_title('Distribución de medios de pago')
+                mostrar_fig(fig, ancho=500)
 
         elif dataset_nombre == "Detalle Ventas":
             st.markdown("### Detalle de Ventas")
             
             # Cantidad vendida por producto (histograma) con media y mediana
-            fig, ax = plt.subplots()
-            sns.histplot(df['cantidad'], bins=5, kde=False, color=PALETA["principal"], ax=ax)
-            media = df['cantidad'].mean()
-            mediana = df['cantidad'].median()
-            ax.axvline(media, color=PALETA["acento2"], linestyle='--', linewidth=2, label=f'Media: {media:.2f}')
-            ax.axvline(mediana, color=PALETA["secundario"], linestyle='-', linewidth=2, label=f'Mediana: {mediana:.2f}')
-            ax.set_title('Distribución de cantidad vendida por producto')
-            ax.set_xlabel('Cantidad')
-            ax.legend()
-            mostrar_fig(fig, ancho=500)
+            with figura() as (fig, ax):
+                sns.histplot(df['cantidad'], bins=5, kde=False, color=PALETA["principal"], ax=ax)
+                media = df['cantidad'].mean()
+                mediana = df['cantidad'].median()
+                ax.axvline(media, color=PALETA["acento2"], linestyle='--', linewidth=2, label=f'Media: {media:.2f}')
+                ax.axvline(mediana, color=PALETA["secundario"], linestyle='-', linewidth=2, label=f'Mediana: {mediana:.2f}')
+                ax.set_title('Distribución de cantidad vendida por producto')
+                ax.set_xlabel('Cantidad')
+                ax.legend()
+                mostrar_fig(fig, ancho=500)
 
             # Importe por ítem (histograma) con media y mediana
-            fig, ax = plt.subplots()
-            sns.histplot(df['importe'], bins=10, kde=False, color=PALETA["principal"], ax=ax)
-            media = df['importe'].mean()
-            mediana = df['importe'].median()
-            ax.axvline(media, color=PALETA["acento2"], linestyle='--', linewidth=2, label=f'Media: {media:.2f}')
-            ax.axvline(mediana, color=PALETA["secundario"], linestyle='-', linewidth=2, label=f'Mediana: {mediana:.2f}')
-            ax.set_title('Distribución del importe por ítem')
-            ax.set_xlabel('Importe')
-            ax.legend()
-            mostrar_fig(fig, ancho=500)
+            with figura() as (fig, ax):
+                sns.histplot(df['importe'], bins=10, kde=False, color=PALETA["principal"], ax=ax)
+                media = df['importe'].mean()
+                mediana = df['importe'].median()
+                ax.axvline(media, color=PALETA["acento2"], linestyle='--', linewidth=2, label=f'Media: {media:.2f}')
+                ax.axvline(mediana, color=PALETA["secundario"], linestyle='-', linewidth=2, label=f'Mediana: {mediana:.2f}')
+                ax.set_title('Distribución del importe por ítem')
+                ax.set_xlabel('Importe')
+                ax.legend()
+                mostrar_fig(fig, ancho=500)
 
     else:
         # Mensaje de error si no se pudo cargar el dataset
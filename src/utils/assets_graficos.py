@@ -0,0 +1,316 @@
+# src/utils/assets_graficos.py
+#
+# Generador de los PNG de 'assets/plots' que muestra la página de Documentación,
+# sin abrir la app. Dibuja cada gráfico con las mismas funciones que las
+# páginas (src/utils/graficos.py), reparte el trabajo en un pool de procesos,
+# saltea los gráficos cuyas entradas no cambiaron y escribe cada archivo de
+# forma atómica.
+#
+# Uso:  python -m src.utils.assets_graficos [--forzar] [--workers N]
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import matplotlib
+matplotlib.use("Agg")  # sin ventana: también corre en servidores y en CI
+import pandas as pd
+from sklearn.metrics import confusion_matrix
+
+from src.config import CACHE_ROOT, RUTA_DATASET_ML
+from src.data_loader import cargar_columnar, get_dataset_paths
+from src.utils import graficos
+from src.utils.disk_cache import escribir_atomico, hash_archivo
+from src.utils.figures import (
+    clean_filename, densidad_2d, dispersion_regresion, figura, huella_figura, render_png, strip_muestreado
+)
+from src.utils.random_forest import (
+    COLUMNAS_EXCLUIDAS, TARGET, calcular_curva_aprendizaje, entrenar_random_forest, tabla_reporte_por_clase
+)
+from src.utils.schema import leer_csv_tipado
+
+# ==============================================================
+# 🟦 Configuración
+# ==============================================================
+DIR_ASSETS = os.path.join(os.path.dirname(__file__), "..", "..", "assets", "plots")
+
+# Cada PNG generado: ruta absoluta -> {"clave": huella de entradas y código,
+# "sha256": hash del PNG escrito}
+MANIFEST_ASSETS = os.path.join(CACHE_ROOT, "assets_graficos.json")
+
+NUMERICAS = ['cantidad', 'precio_unitario', 'total_venta']
+
+# ==============================================================
+# 1️⃣ Gráficos de EDA Diagnóstico
+# ==============================================================
+def _entradas_eda():
+    return [get_dataset_paths()["df_tienda_aurelion"]]
+
+
+def preparar_eda(ruta):
+    """Dataset unificado con la misma limpieza que aplica la página antes de graficar."""
+    df = cargar_columnar(ruta, "df_tienda_aurelion")
+    if 'importe' in df.columns and 'total_venta' in df.columns and (df['importe'] == df['total_venta']).all():
+        df = df.drop(columns=['importe'])
+    return df.rename(columns={'fecha': 'fecha_venta'})
+
+
+def _preparar_column_store_eda():
+    """Escribe (si hace falta) el column store del dataset unificado."""
+    cargar_columnar(*_entradas_eda(), "df_tienda_aurelion")
+
+
+def _graficos_eda(nombres):
+    """(nombre, construir, datos, figsize) de cada gráfico de EDA pedido."""
+    df = preparar_eda(*_entradas_eda())
+
+    for col in NUMERICAS:
+        yield clean_filename(f"Distribución de {col}"), graficos.distribucion, (df[col],), (5, 4)
+        yield f"outliers_{col}", graficos.outliers, (df[col],), (5, 4)
+
+    if "Matriz_de_Correlacion" in nombres:
+        corr = df[NUMERICAS].corr()
+        corr.index.name = ""
+        corr.columns.name = ""
+        lado = max(4, len(df.select_dtypes(include='number').columns) * 0.5)
+        yield "Matriz_de_Correlacion", graficos.matriz_correlacion, (corr,), (lado, lado)
+
+    if "Ventas_Totales_por_Mes" in nombres:
+        yield "Ventas_Totales_por_Mes", graficos.ventas_por_mes, (graficos.tabla_ventas_por_mes(df),), (9, 6)
+
+    yield (
+        clean_filename("Relación Cantidad - Total Venta"), graficos.relacion_cantidad_total,
+        (df[['cantidad', 'total_venta']],), (8, 5)
+    )
+
+# ==============================================================
+# 2️⃣ Gráficos del Random Forest
+# ==============================================================
+def _entradas_ml():
+    return [RUTA_DATASET_ML]
+
+
+def _graficos_ml(nombres):
+    """
+    (nombre, construir, datos, figsize) de cada gráfico del Random Forest pedido.
+    El modelo se entrena una sola vez, con los valores por defecto de la página.
+    """
+    df = leer_csv_tipado(*_entradas_ml(), "dataset_ml_productos")
+    features = [col for col in df.columns if col not in COLUMNAS_EXCLUIDAS]
+    X, y = df[features], df[TARGET]
+
+    model, X_test, y_test = entrenar_random_forest(X, y)
+    y_pred = model.predict(X_test)
+    clases = model.classes_
+
+    yield (
+        "Curvas_ROC__Multiclase_-_One_vs_Rest", graficos.curvas_roc,
+        (y_test, model.predict_proba(X_test), clases), (8, 6)
+    )
+    yield "Matriz_de_Confusion", graficos.matriz_confusion, (confusion_matrix(y_test, y_pred), clases), (5, 5)
+
+    importances = pd.DataFrame({"variable": features, "importancia": model.feature_importances_})
+    yield "Importancia_de_Variables", graficos.importancia_variables, (importances,), (8, 6)
+
+    yield (
+        "Classification_Report_-_Metricas_por_Clase", graficos.reporte_por_clase,
+        (tabla_reporte_por_clase(y_test, y_pred, clases), clases), (5, 5)
+    )
+
+    # La curva de aprendizaje reentrena el modelo varias veces: solo si hace falta
+    if "Learning_Curve_-_Accuracy" in nombres:
+        curva = calcular_curva_aprendizaje(model, X, y, min(5, len(df) // 3))
+        yield "Learning_Curve_-_Accuracy", graficos.curva_aprendizaje, curva, (8, 5)
+
+# ==============================================================
+# 3️⃣ Registro de gráficos
+# ==============================================================
+# Por grupo: archivos de entrada, funciones cuyo código determina el resultado,
+# generador de gráficos, los PNG que produce, si se puede repartir entre
+# procesos (el grupo ML comparte un modelo entrenado, así que va entero) y qué
+# preparar en el proceso principal antes de repartirlo.
+GRUPOS = {
+    "eda": {
+        "entradas": _entradas_eda,
+        "codigo": (
+            preparar_eda, _graficos_eda, graficos.tabla_ventas_por_mes, graficos.distribucion,
+            graficos.outliers, graficos.matriz_correlacion, graficos.ventas_por_mes,
+            graficos.relacion_cantidad_total, strip_muestreado, dispersion_regresion, densidad_2d,
+        ),
+        "generar": _graficos_eda,
+        "divisible": True,
+        # Con la caché fría cada proceso reescribiría el column store y borraría el de los otros
+        "preparar": _preparar_column_store_eda,
+        "graficos": [
+            *[clean_filename(f"Distribución de {col}") for col in NUMERICAS],
+            "Matriz_de_Correlacion",
+            "Ventas_Totales_por_Mes",
+            "Relacion_Cantidad_-_Total_Venta",
+            *[f"outliers_{col}" for col in NUMERICAS],
+        ],
+    },
+    "ml": {
+        "entradas": _entradas_ml,
+        "codigo": (
+            _graficos_ml, entrenar_random_forest, tabla_reporte_por_clase, calcular_curva_aprendizaje,
+            graficos.curvas_roc, graficos.matriz_confusion, graficos.importancia_variables,
+            graficos.reporte_por_clase, graficos.curva_aprendizaje,
+        ),
+        "generar": _graficos_ml,
+        "divisible": False,
+        "preparar": None,
+        "graficos": [
+            "Curvas_ROC__Multiclase_-_One_vs_Rest",
+            "Matriz_de_Confusion",
+            "Importancia_de_Variables",
+            "Classification_Report_-_Metricas_por_Clase",
+            "Learning_Curve_-_Accuracy",
+        ],
+    },
+}
+
+# ==============================================================
+# 4️⃣ Generación
+# ==============================================================
+def _leer_manifest():
+    try:
+        with open(MANIFEST_ASSETS, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _guardar_manifest(manifest):
+    os.makedirs(os.path.dirname(MANIFEST_ASSETS), exist_ok=True)
+    escribir_atomico(
+        MANIFEST_ASSETS,
+        lambda tmp: Path(tmp).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8"),
+    )
+
+
+def _escribir_png(png, ruta):
+    """Escribe en un temporal y lo renombra: la Documentación nunca ve un PNG a medias."""
+    escribir_atomico(ruta, lambda tmp: Path(tmp).write_bytes(png))
+
+
+def _ruta_png(carpeta, nombre):
+    return os.path.abspath(os.path.join(carpeta, f"{nombre}.png"))
+
+
+def _vigente(entrada, clave, ruta):
+    """True si el PNG en disco es el que se generó con `clave` (nadie lo borró ni lo reemplazó)."""
+    if not isinstance(entrada, dict) or entrada.get("clave") != clave:
+        return False
+    try:
+        return hash_archivo(ruta) == entrada.get("sha256")
+    except OSError:
+        return False
+
+
+def _generar(grupo, nombres, carpeta):
+    """
+    Corre en un proceso del pool: dibuja los gráficos `nombres` del grupo y los
+    escribe en `carpeta`. Retorna (nombre, sha256 del PNG) de cada uno.
+    """
+    pedidos = set(nombres)
+    generados = []
+    for nombre, construir, datos, figsize in GRUPOS[grupo]["generar"](pedidos):
+        if nombre not in pedidos:
+            continue
+        with figura(figsize=figsize) as (fig, ax):
+            construir(fig, ax, *datos)
+            png = render_png(fig)
+        _escribir_png(png, _ruta_png(carpeta, nombre))
+        generados.append((nombre, hashlib.sha256(png).hexdigest()))
+    return generados
+
+
+def _trabajos(pendientes, workers):
+    """Reparte los gráficos pendientes en (grupo, nombres) para el pool."""
+    trabajos = []
+    for grupo, nombres in pendientes.items():
+        if GRUPOS[grupo]["divisible"]:
+            partes = min(workers, len(nombres))
+            trabajos.extend((grupo, nombres[i::partes]) for i in range(partes))
+        else:
+            trabajos.append((grupo, nombres))
+    return trabajos
+
+
+def generar_assets(forzar=False, workers=None, carpeta=DIR_ASSETS):
+    """
+    Regenera los PNG documentados cuyas entradas (contenido de los archivos de
+    datos y código que los dibuja) cambiaron desde la última corrida o cuyo
+    archivo ya no es el que se escribió, o todos con forzar=True. Los grupos
+    sin archivos de entrada se saltean.
+
+    Retorna {"generados": [...], "sin_cambios": [...], "sin_entradas": [...]}.
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(carpeta, exist_ok=True)
+    manifest = _leer_manifest()
+    resultado = {"generados": [], "sin_cambios": [], "sin_entradas": []}
+
+    pendientes, claves = {}, {}
+    for grupo, spec in GRUPOS.items():
+        try:
+            huellas = [hash_archivo(ruta) for ruta in spec["entradas"]()]
+        except OSError:
+            resultado["sin_entradas"].extend(spec["graficos"])
+            continue
+
+        for nombre in spec["graficos"]:
+            claves[nombre] = huella_figura(nombre, *spec["codigo"], huellas)
+            ruta = _ruta_png(carpeta, nombre)
+            if not forzar and _vigente(manifest.get(ruta), claves[nombre], ruta):
+                resultado["sin_cambios"].append(nombre)
+            else:
+                pendientes.setdefault(grupo, []).append(nombre)
+
+    trabajos = _trabajos(pendientes, workers)
+    try:
+        if workers > 1 and len(trabajos) > 1:
+            for grupo in pendientes:
+                if GRUPOS[grupo]["preparar"] is not None:
+                    GRUPOS[grupo]["preparar"]()
+            with ProcessPoolExecutor(max_workers=min(workers, len(trabajos))) as pool:
+                futuros = [pool.submit(_generar, grupo, nombres, carpeta) for grupo, nombres in trabajos]
+                for futuro in as_completed(futuros):
+                    for nombre, sha256 in futuro.result():
+                        manifest[_ruta_png(carpeta, nombre)] = {"clave": claves[nombre], "sha256": sha256}
+                        resultado["generados"].append(nombre)
+        else:
+            for grupo, nombres in trabajos:
+                for nombre, sha256 in _generar(grupo, nombres, carpeta):
+                    manifest[_ruta_png(carpeta, nombre)] = {"clave": claves[nombre], "sha256": sha256}
+                    resultado["generados"].append(nombre)
+    finally:
+        # Lo que ya se escribió queda registrado aunque otro trabajo falle
+        _guardar_manifest(manifest)
+
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera los gráficos de assets/plots sin abrir la app")
+    parser.add_argument("--forzar", action="store_true", help="regenerar aunque las entradas no hayan cambiado")
+    parser.add_argument("--workers", type=int, default=None, help="procesos en paralelo (por defecto, uno por CPU)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultado = generar_assets(forzar=args.forzar, workers=args.workers)
+    for nombre in sorted(resultado["generados"]):
+        print(f"🖼️  {nombre}.png")
+    if resultado["sin_entradas"]:
+        print(f"⚠️  Sin archivos de entrada, no se generaron: {', '.join(resultado['sin_entradas'])}")
+    print(
+        f"{len(resultado['generados'])} generados, {len(resultado['sin_cambios'])} sin cambios "
+        f"en {time.perf_counter() - inicio:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
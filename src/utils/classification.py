@@ -1,9 +1,86 @@
 # src/utils/classification.py
 
+import hashlib
+import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.config import CACHE_ROOT
+from src.utils.disk_cache import escribir_atomico
 from src.utils.rules import RULES, EXACT
 
-def clasificar_producto(nombre):                                                        
+# Categoría asignada cuando ningún patrón coincide
+CATEGORIA_POR_DEFECTO = "Alimentos secos"
+
+# Todas las etiquetas posibles, en el orden de RULES (categorías del resultado en lote)
+CATEGORIAS = list(dict.fromkeys([*RULES, *EXACT.values(), CATEGORIA_POR_DEFECTO]))
+
+# ==============================================================
+# 1️⃣ Compilación de las reglas
+# ==============================================================
+def _alternacion(rules, hasta):
+    """Una sola expresión con las primeras `hasta` categorías, en orden de prioridad."""
+    # Un grupo con nombre por categoría (c<posición>): capturar por patrón hace
+    # que re pierda el atajo de comparar el primer carácter de cada alternativa
+    alternativas = [
+        f"(?P<c{i}>{'|'.join(patrones)})"
+        for i, patrones in enumerate(list(rules.values())[:hasta])
+        if patrones  # un grupo vacío coincidiría en cualquier posición
+    ]
+    if not alternativas:
+        return None
+    regex = re.compile("|".join(alternativas))
+    # Índice de cada grupo con nombre -> posición de su categoría en RULES
+    prioridad_por_grupo = {indice: int(nombre[1:]) for nombre, indice in regex.groupindex.items()}
+    return regex, prioridad_por_grupo
+
+
+def compilar_reglas(rules=RULES):
+    """
+    Compila las reglas una sola vez. Retorna (categorias, niveles):
+    niveles[k] es la alternación de los patrones de las categorías 0..k-1.
+
+    En una alternación, re devuelve la coincidencia que empieza más a la
+    izquierda y, en esa posición, la primera alternativa de la lista. Por eso,
+    al encontrar una categoría de prioridad p, basta seguir buscando desde la
+    posición siguiente solo entre las categorías de mayor prioridad (niveles[p]).
+    """
+    categorias = list(rules)
+    niveles = [None] + [_alternacion(rules, k) for k in range(1, len(categorias) + 1)]
+    return categorias, niveles
+
+
+_CATEGORIAS, _NIVELES = compilar_reglas()
+
+# ==============================================================
+# 2️⃣ Clasificación
+# ==============================================================
+def prioridad_regex(texto, niveles=_NIVELES):
+    """
+    Posición en RULES de la primera categoría con algún patrón presente en
+    `texto` (ya en minúsculas), o None si ninguno coincide.
+    Recorre el texto una sola vez, de izquierda a derecha.
+    """
+    mejor = len(niveles) - 1
+    encontrada = None
+    posicion = 0
+    while mejor > 0 and niveles[mejor] is not None:
+        regex, prioridad_por_grupo = niveles[mejor]
+        coincidencia = regex.search(texto, posicion)
+        if coincidencia is None:
+            break
+        mejor = encontrada = prioridad_por_grupo[coincidencia.lastindex]
+        posicion = coincidencia.start() + 1
+    return encontrada
+
+
+def clasificar_producto(nombre):
+    """
+    Devuelve la categoría de un producto: primero por coincidencia exacta y
+    luego por la primera categoría de RULES (en orden) con algún patrón presente.
+    """
     texto = nombre.lower()
 
     # 1) Coincidencia exacta
@@ -11,12 +88,226 @@ def clasificar_producto(nombre):
         return EXACT[texto]
 
     # 2) Coincidencia por regex
-    # Recorrer categorías y keywords
-    for categoria, patrones in RULES.items():
-        for patron in patrones:
-            if re.search(patron, texto):
-                return categoria
+    prioridad = prioridad_regex(texto)
+    if prioridad is not None:
+        return _CATEGORIAS[prioridad]
 
     # Fallback final
-    return "Alimentos secos"
-                                                                                                                                  
\ No newline at end of file
+    return CATEGORIA_POR_DEFECTO
+
+
+# ==============================================================
+# 3️⃣ Caché persistente de clasificaciones
+# ==============================================================
+# Tabla nombre -> categoría en Parquet, una por versión de las reglas.
+# Editar rules.py cambia la huella y deja la tabla anterior sin efecto.
+DIR_CACHE_CLASIFICACION = os.path.join(CACHE_ROOT, "clasificacion")
+
+# Tablas conservadas (las escritas más recientemente): dos procesos con reglas
+# distintas, p. ej. durante un despliegue, no se borran la tabla entre sí
+VERSIONES_CONSERVADAS = 3
+
+# Copia en memoria de la tabla vigente: ruta -> (mtime_ns, nombres, posiciones)
+_CACHE_MEMORIA = {}
+
+
+def huella_reglas(rules=RULES, exact=EXACT):
+    """Hash de las reglas (en orden de prioridad), las coincidencias exactas y el fallback."""
+    contenido = json.dumps(
+        {"rules": rules, "exact": exact, "defecto": CATEGORIA_POR_DEFECTO}, ensure_ascii=False
+    )
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def _ruta_cache(huella):
+    return os.path.join(DIR_CACHE_CLASIFICACION, f"categorias_{huella[:16]}.parquet")
+
+
+def _leer_cache(ruta):
+    """Nombres ya clasificados (pd.Index) y la posición de su categoría en CATEGORIAS."""
+    try:
+        mtime = os.stat(ruta).st_mtime_ns
+    except OSError:
+        return pd.Index([], dtype=object), np.array([], dtype=np.int32)
+
+    guardado = _CACHE_MEMORIA.get(ruta)
+    if guardado is not None and guardado[0] == mtime:
+        return guardado[1], guardado[2]
+
+    try:
+        tabla = pd.read_parquet(ruta)
+        posicion = {categoria: i for i, categoria in enumerate(CATEGORIAS)}
+        nombres = pd.Index(tabla["nombre"].astype(str))
+        posiciones = tabla["categoria"].map(posicion).to_numpy()
+        if not nombres.is_unique or pd.isna(posiciones).any():
+            raise ValueError("tabla de clasificaciones inconsistente")
+        posiciones = posiciones.astype(np.int32)
+    except Exception:
+        # Archivo dañado o ilegible: se trata como caché vacía y se regenera
+        return pd.Index([], dtype=object), np.array([], dtype=np.int32)
+
+    _CACHE_MEMORIA[ruta] = (mtime, nombres, posiciones)
+    return nombres, posiciones
+
+
+def _guardar_cache(ruta, nombres, posiciones):
+    """
+    Agrega clasificaciones nuevas a la tabla (sumando las que otro proceso haya
+    guardado mientras tanto) y borra las tablas de otras reglas más allá de
+    las VERSIONES_CONSERVADAS escritas más recientemente.
+    """
+    try:
+        previos, posiciones_previas = _leer_cache(ruta)
+        nuevos = ~nombres.isin(previos)
+        tabla = pd.DataFrame({
+            "nombre": np.concatenate([previos.to_numpy(dtype=object), nombres[nuevos].to_numpy(dtype=object)]),
+            "categoria": np.array(CATEGORIAS, dtype=object)[
+                np.concatenate([posiciones_previas, posiciones[nuevos]])
+            ],
+        })
+
+        os.makedirs(DIR_CACHE_CLASIFICACION, exist_ok=True)
+        escribir_atomico(ruta, lambda tmp: tabla.to_parquet(tmp, index=False))
+        _recortar_versiones()
+    except Exception:
+        # La caché es opcional: si no se puede escribir, solo se pierde el ahorro
+        pass
+
+
+def _recortar_versiones():
+    tablas = []
+    for archivo in os.listdir(DIR_CACHE_CLASIFICACION):
+        if archivo.startswith("categorias_") and archivo.endswith(".parquet"):
+            ruta = os.path.join(DIR_CACHE_CLASIFICACION, archivo)
+            try:
+                tablas.append((os.stat(ruta).st_mtime_ns, ruta))
+            except FileNotFoundError:
+                continue
+    for _, ruta in sorted(tablas, reverse=True)[VERSIONES_CONSERVADAS:]:
+        try:
+            os.remove(ruta)
+        except FileNotFoundError:
+            # Otro proceso ya la borró
+            pass
+
+
+def limpiar_cache_clasificacion():
+    """Elimina las clasificaciones guardadas en disco y en memoria."""
+    _CACHE_MEMORIA.clear()
+    if not os.path.isdir(DIR_CACHE_CLASIFICACION):
+        return 0
+    borrados = 0
+    for archivo in os.listdir(DIR_CACHE_CLASIFICACION):
+        if archivo.startswith("categorias_"):
+            os.remove(os.path.join(DIR_CACHE_CLASIFICACION, archivo))
+            borrados += 1
+    return borrados
+
+
+# ==============================================================
+# 4️⃣ Clasificación en lote
+# ==============================================================
+def _clasificar_unicos(nombres):
+    """Posición en CATEGORIAS de la categoría de cada nombre (sin repetidos)."""
+    posicion = {categoria: i for i, categoria in enumerate(CATEGORIAS)}
+    return np.array([posicion[clasificar_producto(nombre)] for nombre in nombres], dtype=np.int32)
+
+
+def _clasificar_con_cache(nombres, workers=1):
+    """Igual que clasificar_en_paralelo, pero solo pasan por las reglas los nombres que no están en la caché."""
+    ruta = _ruta_cache(huella_reglas())
+    nombres_cache, posiciones_cache = _leer_cache(ruta)
+
+    ubicacion = nombres_cache.get_indexer(nombres)
+    faltan = ubicacion < 0
+    posiciones = np.empty(len(nombres), dtype=np.int32)
+    posiciones[~faltan] = posiciones_cache[ubicacion[~faltan]]
+
+    if faltan.any():
+        posiciones[faltan] = clasificar_en_paralelo(nombres[faltan], workers)
+        _guardar_cache(ruta, nombres[faltan], posiciones[faltan])
+
+    return posiciones, int(faltan.sum())
+
+
+def clasificar_productos(nombres, usar_cache=True, workers=1):
+    """
+    Clasifica una Series completa de nombres de producto. Cada nombre distinto
+    se clasifica una sola vez (si la Series es categórica, se usan directamente
+    sus categorías) y el resultado se reparte a todas las filas con un take.
+
+    Con usar_cache=True los nombres ya vistos con las mismas reglas se leen de
+    la caché en 'data/.cache/clasificacion' y solo los nuevos pasan por las regex.
+    En attrs["clasificacion"] queda cuántos nombres salieron de la caché.
+    Con workers > 1 los nombres nuevos se reparten en un pool de procesos
+    (ver clasificar_en_paralelo).
+
+    Retorna una Series categórica con el mismo índice; los nombres nulos quedan nulos.
+    """
+    nombres = nombres if isinstance(nombres, pd.Series) else pd.Series(nombres)
+
+    if isinstance(nombres.dtype, pd.CategoricalDtype):
+        codigos, unicos = nombres.cat.codes.to_numpy(), nombres.cat.categories
+    else:
+        codigos, unicos = pd.factorize(nombres)
+    unicos = pd.Index(unicos, dtype=object).astype(str)
+
+    if usar_cache:
+        posiciones, clasificados = _clasificar_con_cache(unicos, workers)
+    else:
+        posiciones, clasificados = clasificar_en_paralelo(unicos, workers), len(unicos)
+
+    # El -1 final es el destino de los códigos nulos (-1) de la Series original
+    etiquetas = np.append(posiciones, np.int32(-1))
+
+    resultado = pd.Series(
+        pd.Categorical.from_codes(etiquetas[codigos], categories=CATEGORIAS),
+        index=nombres.index,
+        name="categoria_corregida"
+    )
+    resultado.attrs["clasificacion"] = {
+        "nombres_unicos": len(unicos),
+        "desde_cache": len(unicos) - clasificados,
+        "clasificados": clasificados,
+    }
+    return resultado
+
+
+# ==============================================================
+# 5️⃣ Clasificación en paralelo
+# ==============================================================
+# Por debajo de esta cantidad de nombres, levantar el pool cuesta más que clasificar en serie
+UMBRAL_PARALELO = 50_000
+
+# Nombres por lote enviado a cada proceso
+TAMANO_LOTE = 20_000
+
+
+def _clasificar_lote(nombres):
+    # Corre en un proceso del pool: las reglas ya se compilaron una vez al importar este módulo
+    return _clasificar_unicos(nombres)
+
+
+def clasificar_en_paralelo(nombres, workers=None, tamano_lote=TAMANO_LOTE, umbral=UMBRAL_PARALELO):
+    """
+    Clasifica nombres distintos repartiéndolos en lotes de `tamano_lote` entre
+    `workers` procesos (por defecto, uno por CPU). Los lotes se reúnen en su
+    orden original, así el resultado no depende de qué proceso termine primero.
+
+    Con menos de `umbral` nombres, un solo worker o si el pool no puede usarse,
+    se clasifica en serie. Retorna la posición en CATEGORIAS de cada nombre.
+    """
+    nombres = list(nombres)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or not nombres or len(nombres) < umbral:
+        return _clasificar_unicos(nombres)
+
+    lotes = [nombres[i:i + tamano_lote] for i in range(0, len(nombres), tamano_lote)]
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(lotes))) as pool:
+            partes = list(pool.map(_clasificar_lote, lotes))
+    except (OSError, RuntimeError):
+        # BrokenProcessPool hereda de RuntimeError
+        return _clasificar_unicos(nombres)
+
+    return np.concatenate(partes)
@@ -0,0 +1,231 @@
+# src/utils/column_store.py
+
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.utils.disk_cache import escribir_atomico
+
+# ==============================================================
+# 🟦 Formato
+# ==============================================================
+# Cada versión del dataset vive en su propia carpeta:
+#   <directorio>/<version>/<columna>.npy            columnas numéricas, bool y fechas
+#   <directorio>/<version>/<columna>.codes.npy      códigos de las columnas de texto
+#   <directorio>/<version>/_manifest.json           orden, tipo y categorías de cada columna
+# y el archivo <directorio>/ACTUAL indica la versión vigente. Así una escritura
+# nueva nunca pisa archivos que otro proceso tenga mapeados en memoria. Al
+# publicar una versión se conserva también la anterior: un lector que ya leyó
+# ACTUAL puede seguir abriéndola.
+
+_ACTUAL = "ACTUAL"
+_MANIFEST = "_manifest.json"
+
+# Versión del formato: un store escrito con otro formato se trata como inexistente
+_FORMATO = 2
+
+# Lecturas seguidas en las que ACTUAL cambió mientras se abría la versión
+_REINTENTOS_LECTURA = 5
+
+# Segundos que se conserva una versión antes de poder borrarla: otro proceso
+# puede estar terminando de publicarla o leyéndola con un ACTUAL ya viejo
+_GRACIA_LIMPIEZA = 300
+
+
+def _nombre_archivo(columna):
+    # Índice de columna en vez del nombre: evita problemas con caracteres raros
+    return f"col_{columna:04d}"
+
+
+# ==============================================================
+# 🟦 Escritura
+# ==============================================================
+def escribir_column_store(df, directorio, version):
+    """
+    Guarda `df` como un archivo .npy por columna. Las columnas de texto y las
+    categóricas se guardan codificadas con diccionario (códigos enteros + categorías),
+    anotando el tipo original para devolverlas igual al leer.
+    `version` identifica los datos de origen (p. ej. tamaño y fecha del CSV).
+    También se guarda df.attrs["memoria"] (ver schema.aplicar_esquema).
+    """
+    os.makedirs(directorio, exist_ok=True)
+    carpeta = f"v_{uuid.uuid4().hex[:12]}"
+    ruta = os.path.join(directorio, carpeta)
+    os.makedirs(ruta)
+
+    columnas = []
+    for i, col in enumerate(df.columns):
+        serie = df[col]
+        base = os.path.join(ruta, _nombre_archivo(i))
+        if isinstance(serie.dtype, pd.CategoricalDtype) or serie.dtype == object:
+            categorica = isinstance(serie.dtype, pd.CategoricalDtype)
+            if categorica:
+                codigos, categorias = serie.cat.codes.to_numpy(), serie.cat.categories
+            else:
+                codigos, categorias = pd.factorize(serie)
+                codigos = codigos.astype(np.min_scalar_type(-max(len(categorias), 1)))
+                categorias = pd.Index(categorias)
+            np.save(f"{base}.codes.npy", codigos)
+            columnas.append({
+                "nombre": col,
+                "tipo": "diccionario",
+                "original": "category" if categorica else "object",
+                "ordenada": bool(categorica and serie.cat.ordered),
+                # Como texto para el JSON; al leer se vuelven a su tipo (números, fechas)
+                "tipo_categorias": str(categorias.dtype),
+                "categorias": [str(c) for c in categorias],
+            })
+        else:
+            np.save(f"{base}.npy", serie.to_numpy())
+            columnas.append({"nombre": col, "tipo": "arreglo"})
+
+    with open(os.path.join(ruta, _MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({
+            "formato": _FORMATO,
+            "version": version,
+            "filas": len(df),
+            "columnas": columnas,
+            "memoria": df.attrs.get("memoria"),
+        }, f, ensure_ascii=False)
+
+    # Publicar la versión nueva de forma atómica y limpiar las anteriores a
+    # la que estaba vigente hasta ahora (esa puede tener lectores en curso)
+    anterior = _carpeta_actual(directorio)
+    escribir_atomico(os.path.join(directorio, _ACTUAL), lambda tmp: Path(tmp).write_text(carpeta, encoding="utf-8"))
+    if anterior is not None:
+        _limpiar_versiones(directorio, anterior, carpeta)
+    return ruta
+
+
+def _mtime_manifest(carpeta):
+    try:
+        return os.stat(os.path.join(carpeta, _MANIFEST)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _limpiar_versiones(directorio, reemplazada, vigente):
+    """
+    Borra las versiones escritas antes de `reemplazada` y con más de
+    _GRACIA_LIMPIEZA segundos. Las posteriores pueden ser de otro proceso que
+    escribe a la vez y ya las publicó (o está por hacerlo), y la que indica
+    ACTUAL en este momento tampoco se toca.
+    """
+    limite = _mtime_manifest(reemplazada)
+    if limite is None:
+        return
+    limite = min(limite, time.time_ns() - _GRACIA_LIMPIEZA * 10**9)
+    conservar = {os.path.basename(reemplazada), vigente}
+    actual = _carpeta_actual(directorio)
+    if actual is not None:
+        conservar.add(os.path.basename(actual))
+    for nombre in os.listdir(directorio):
+        ruta = os.path.join(directorio, nombre)
+        if not nombre.startswith("v_") or nombre in conservar or not os.path.isdir(ruta):
+            continue
+        # Sin manifest la versión puede estar escribiéndose en otro proceso: no se toca
+        escrita = _mtime_manifest(ruta)
+        if escrita is not None and escrita < limite:
+            # En Windows puede fallar si otro proceso la tiene mapeada: se reintenta la próxima vez
+            shutil.rmtree(ruta, ignore_errors=True)
+
+
+# ==============================================================
+# 🟦 Lectura
+# ==============================================================
+def _carpeta_actual(directorio):
+    try:
+        with open(os.path.join(directorio, _ACTUAL), "r", encoding="utf-8") as f:
+            return os.path.join(directorio, f.read().strip())
+    except OSError:
+        return None
+
+
+def _leer_manifest_de(carpeta):
+    try:
+        with open(os.path.join(carpeta, _MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("formato") == _FORMATO else None
+
+
+def leer_manifest(directorio):
+    """Manifest de la versión vigente, o None si no hay datos guardados."""
+    carpeta = _carpeta_actual(directorio)
+    if carpeta is None:
+        return None
+    return _leer_manifest_de(carpeta)
+
+
+def _categorias(meta):
+    categorias = pd.Index(meta["categorias"], dtype=object)
+    if meta["tipo_categorias"] != "object":
+        categorias = categorias.astype(meta["tipo_categorias"])
+    return categorias
+
+
+def _leer_version(carpeta, columnas):
+    """
+    DataFrame de la versión en `carpeta`, o None si está en otro formato.
+    Lanza FileNotFoundError si la versión no existe (p. ej. otro proceso la borró).
+    """
+    if not os.path.exists(os.path.join(carpeta, _MANIFEST)):
+        raise FileNotFoundError(carpeta)
+    manifest = _leer_manifest_de(carpeta)
+    if manifest is None:
+        return None
+
+    series = []
+    for i, meta in enumerate(manifest["columnas"]):
+        if columnas is not None and meta["nombre"] not in columnas:
+            continue
+        base = os.path.join(carpeta, _nombre_archivo(i))
+        if meta["tipo"] == "diccionario":
+            codigos = np.load(f"{base}.codes.npy", mmap_mode="c")
+            valores = pd.Categorical.from_codes(codigos, categories=_categorias(meta), ordered=meta["ordenada"])
+            if meta["original"] == "object":
+                # Texto que no era categórico: vuelve como object (se materializa)
+                valores = np.asarray(valores, dtype=object)
+        else:
+            valores = np.load(f"{base}.npy", mmap_mode="c")
+        series.append(pd.Series(valores, name=meta["nombre"], copy=False))
+
+    if not series:
+        df = pd.DataFrame(index=pd.RangeIndex(manifest["filas"]))
+    else:
+        # concat no consolida bloques: cada columna sigue apuntando a su archivo
+        df = pd.concat(series, axis=1, copy=False)
+    if manifest.get("memoria") is not None:
+        df.attrs["memoria"] = manifest["memoria"]
+    return df
+
+
+def leer_column_store(directorio, columnas=None):
+    """
+    Abre la versión vigente como DataFrame sin copiar los datos: cada columna
+    numérica o categórica es un mapeo en memoria (copy-on-write) del archivo
+    .npy, así varios procesos comparten la misma caché de páginas del sistema
+    operativo. Cada columna vuelve con el tipo que tenía al escribirse.
+    Retorna None si no hay una versión legible.
+    """
+    # ACTUAL se lee una vez por intento: manifest y columnas salen de la misma
+    # carpeta. Si otra escritura borró esa versión mientras tanto, se vuelve a
+    # leer ACTUAL y se reintenta mientras el puntero siga cambiando.
+    carpeta = _carpeta_actual(directorio)
+    for _ in range(_REINTENTOS_LECTURA):
+        if carpeta is None:
+            return None
+        try:
+            return _leer_version(carpeta, columnas)
+        except FileNotFoundError:
+            nueva = _carpeta_actual(directorio)
+            if nueva == carpeta:
+                # El puntero no cambió y su versión no está: no hay datos legibles
+                return None
+            carpeta = nueva
+    return None
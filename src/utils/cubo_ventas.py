@@ -0,0 +1,221 @@
+# src/utils/cubo_ventas.py
+
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from src.config import CACHE_ROOT
+from src.utils.disk_cache import escribir_atomico
+
+# ==============================================================
+# 🟦 Configuración
+# ==============================================================
+# Un cubo por versión de los datos: las tablas anteriores se borran al guardar
+DIR_CUBO = os.path.join(CACHE_ROOT, "cubo_ventas")
+
+# Granularidad del cubo: una fila por combinación presente en las ventas
+DIMENSIONES = ("mes", "categoria_corregida", "nombre_producto", "ciudad", "medio_pago")
+
+# filas: líneas de detalle · ventas: ventas distintas · ventas_producto: ventas
+# distintas que incluyen el producto · unidades: suma de cantidad
+MEDIDAS = ("filas", "ventas", "ventas_producto", "unidades", "total_venta")
+
+# Métricas del ranking de productos -> medida del cubo
+METRICAS_TOP = {"unidades": "unidades", "ingresos": "total_venta", "transacciones": "ventas_producto"}
+
+# Copia en memoria del cubo vigente: ruta -> cubo
+_CUBO_MEMORIA = {}
+
+# Índice de rankings del cubo vigente: ruta -> índice
+_INDICE_MEMORIA = {}
+
+# ==============================================================
+# 1️⃣ Construcción
+# ==============================================================
+def construir_cubo(df):
+    """
+    Agrega el dataset unificado (con 'categoria_corregida') en el cubo
+    mes × categoría × producto × ciudad × medio de pago, con filas, ventas,
+    unidades y total_venta por celda. 'mes' queda como fecha del primer día.
+
+    Cada venta se cuenta en su primera línea de detalle: 'ventas' suma bien al
+    agrupar por dimensiones de la venta (mes, ciudad, medio_pago); agrupado por
+    categoría o producto, cuenta cada venta solo en el de esa primera línea.
+    'ventas_producto' cuenta cada venta una vez por producto: suma bien
+    mientras el producto sea parte de la agrupación. Una venta sin líneas de
+    detalle (producto nulo) se cuenta con 0 unidades y total 0.
+    """
+    base = pd.DataFrame({
+        "mes": pd.to_datetime(df["fecha"]).dt.to_period("M").dt.to_timestamp(),
+        "categoria_corregida": df["categoria_corregida"],
+        "nombre_producto": df["nombre_producto"],
+        "ciudad": df["ciudad"],
+        "medio_pago": df["medio_pago"],
+        "filas": np.ones(len(df), dtype=np.int64),
+        "ventas": (~df["id_venta"].duplicated()).astype(np.int64),
+        "ventas_producto": (~df.duplicated(["id_venta", "nombre_producto"])).astype(np.int64),
+        "unidades": df["cantidad"].fillna(0).astype(np.int64),
+        "total_venta": df["total_venta"].fillna(0),
+    })
+    for dimension in DIMENSIONES[1:]:
+        base[dimension] = base[dimension].astype("category")
+
+    return _agrupar(base)
+
+
+def _agrupar(filas):
+    # Se agrupa por los códigos de las categóricas (-1 = nulo): pandas 1.5 pierde
+    # las filas con nulos al agrupar por varias categóricas, aun con dropna=False
+    claves = [filas[DIMENSIONES[0]], *(filas[dimension].cat.codes.rename(dimension) for dimension in DIMENSIONES[1:])]
+    cubo = filas[list(MEDIDAS)].groupby(claves, dropna=False, sort=False).sum().reset_index()
+    for dimension in DIMENSIONES[1:]:
+        cubo[dimension] = pd.Categorical.from_codes(cubo[dimension], categories=filas[dimension].cat.categories)
+    return cubo
+
+
+def combinar_cubos(cubo, nuevo):
+    """
+    Suma al cubo las celdas de `nuevo` (el cubo de ventas agregadas después).
+    Vale porque las ventas nuevas tienen id_venta distintos de las anteriores.
+    """
+    filas = pd.concat([cubo, nuevo], ignore_index=True)
+    for dimension in DIMENSIONES[1:]:
+        filas[dimension] = filas[dimension].astype("category")
+    return _agrupar(filas)
+
+# ==============================================================
+# 2️⃣ Persistencia
+# ==============================================================
+def _ruta_cubo(version):
+    # Las medidas forman parte de la clave: agregar una invalida los cubos guardados
+    clave = hashlib.sha1(f"{version}:{MEDIDAS}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(DIR_CUBO, f"cubo_{clave}.parquet")
+
+
+def _recordar(ruta, cubo, indice=None):
+    # Solo se conservan el cubo y el índice de la versión vigente
+    _CUBO_MEMORIA.clear()
+    _CUBO_MEMORIA[ruta] = cubo
+    _INDICE_MEMORIA.clear()
+    if indice is not None:
+        _INDICE_MEMORIA[ruta] = indice
+
+
+def leer_cubo(version):
+    """El cubo de esa versión de los datos (memoria o disco), o None si no existe."""
+    ruta = _ruta_cubo(version)
+    if ruta in _CUBO_MEMORIA:
+        return _CUBO_MEMORIA[ruta]
+
+    try:
+        cubo = pd.read_parquet(ruta)
+    except Exception:
+        # Sin cubo o archivo ilegible: se reconstruye
+        return None
+
+    _recordar(ruta, cubo)
+    return cubo
+
+
+def guardar_cubo(cubo, version, indice=None):
+    """
+    Guarda el cubo en disco (escritura atómica) y borra los de versiones
+    anteriores. Si ya se tiene su índice de rankings, queda en memoria.
+    """
+    ruta = _ruta_cubo(version)
+    _recordar(ruta, cubo, indice)
+    try:
+        os.makedirs(DIR_CUBO, exist_ok=True)
+        escribir_atomico(ruta, lambda tmp: cubo.to_parquet(tmp, index=False))
+
+        for archivo in os.listdir(DIR_CUBO):
+            anterior = os.path.join(DIR_CUBO, archivo)
+            if archivo.startswith("cubo_") and archivo.endswith(".parquet") and anterior != ruta:
+                os.remove(anterior)
+    except OSError:
+        # El cubo en disco es opcional: queda el de memoria
+        pass
+
+# ==============================================================
+# 3️⃣ Consultas
+# ==============================================================
+def rollup(cubo, por=(), filtros=None, medidas=MEDIDAS):
+    """
+    Suma `medidas` agrupando por las dimensiones `por`, sobre las celdas que
+    cumplen `filtros` ({dimensión: valor}). Sin `por`, retorna los totales.
+    """
+    if filtros:
+        mascara = np.ones(len(cubo), dtype=bool)
+        for dimension, valor in filtros.items():
+            mascara &= (cubo[dimension] == valor).to_numpy()
+        cubo = cubo[mascara]
+
+    if not por:
+        return cubo[list(medidas)].sum()
+    return cubo.groupby(list(por), observed=True)[list(medidas)].sum()
+
+
+def ventas_por_mes(cubo):
+    """Total vendido por mes (columnas 'mes' como Period y 'total_venta'), como tabla_ventas_por_mes."""
+    tabla = rollup(cubo, ["mes"], medidas=["total_venta"]).reset_index()
+    tabla["mes"] = tabla["mes"].dt.to_period("M")
+    return tabla
+
+
+# ==============================================================
+# 4️⃣ Índice de rankings por categoría
+# ==============================================================
+# {métrica: {categoría: Series producto -> valor, de mayor a menor}}. El top N
+# de una categoría es un acceso al diccionario y un head(n).
+def _ordenar(serie):
+    # A igual valor, por nombre de producto: el orden no depende de cómo se armó
+    return serie.sort_index().sort_values(ascending=False, kind="stable")
+
+
+def _totales_por_producto(cubo):
+    return rollup(cubo, ["categoria_corregida", "nombre_producto"], medidas=list(dict.fromkeys(METRICAS_TOP.values())))
+
+
+def construir_indice_top(cubo):
+    """Ranking completo de productos de cada categoría, para cada métrica de METRICAS_TOP."""
+    indice = {metrica: {} for metrica in METRICAS_TOP}
+    return actualizar_indice_top(indice, cubo)
+
+
+def actualizar_indice_top(indice, cubo_nuevo):
+    """
+    Suma al índice las ventas de `cubo_nuevo` (ver combinar_cubos). Solo se
+    reordenan las categorías que aparecen en las ventas nuevas.
+    """
+    for categoria, grupo in _totales_por_producto(cubo_nuevo).groupby(level=0, observed=True):
+        grupo = grupo.droplevel(0)
+        grupo.index = grupo.index.astype(str)
+        for metrica, medida in METRICAS_TOP.items():
+            previo = indice[metrica].get(categoria)
+            if previo is None:
+                total = grupo[medida]
+            else:
+                # add() con productos nuevos pasa a float: se vuelve al tipo de la medida
+                # (conteos enteros, total_venta con decimales)
+                total = previo.add(grupo[medida], fill_value=0).astype(np.result_type(previo.dtype, grupo[medida].dtype))
+            indice[metrica][categoria] = _ordenar(total.rename(metrica))
+    return indice
+
+
+def indice_top(cubo, version):
+    """Índice de rankings del cubo de esa versión; se arma una sola vez por versión."""
+    ruta = _ruta_cubo(version)
+    indice = _INDICE_MEMORIA.get(ruta)
+    if indice is None:
+        indice = construir_indice_top(cubo)
+        _INDICE_MEMORIA.clear()
+        _INDICE_MEMORIA[ruta] = indice
+    return indice
+
+
+def top_n(indice, categoria, n=5, metrica="unidades"):
+    """Los `n` productos con mayor `metrica` dentro de la categoría (Series vacía si no tiene ventas)."""
+    ranking = indice[metrica].get(categoria)
+    if ranking is None:
+        return pd.Series(dtype=np.int64, name=metrica)
+    return ranking.head(n)
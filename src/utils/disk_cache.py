@@ -0,0 +1,209 @@
+# src/utils/disk_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import pandas as pd
+from src.config import CACHE_ROOT
+
+# ==============================================================
+# 🟦 Configuración
+# ==============================================================
+CACHE_DIR = os.path.join(CACHE_ROOT, "datasets")
+
+# Huella del contenido de cada CSV exportado por las páginas (ver guardar_csv_si_cambio)
+DIR_EXPORTADOS = os.path.join(CACHE_ROOT, "exportados")
+
+# Tamaño de bloque para calcular el hash del archivo fuente
+_BLOQUE_HASH = 1024 * 1024
+
+# Fuentes cuya copia no se pudo escribir (carpeta de solo lectura, disco lleno):
+# (ruta, cache_dir) -> (tamaño, fecha de modificación) de esa versión
+_SIN_CACHE = {}
+
+
+# ==============================================================
+# 🟦 Funciones auxiliares
+# ==============================================================
+def hash_archivo(ruta):
+    """Calcula el SHA-256 del contenido de un archivo leyendo por bloques."""
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(_BLOQUE_HASH), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _rutas_cache(ruta, cache_dir):
+    """Devuelve las rutas del parquet y del archivo de metadatos para una fuente."""
+    ruta_abs = os.path.abspath(ruta)
+    clave = hashlib.sha1(ruta_abs.encode("utf-8")).hexdigest()[:16]
+    base = f"{os.path.splitext(os.path.basename(ruta))[0]}_{clave}"
+    return (
+        os.path.join(cache_dir, f"{base}.parquet"),
+        os.path.join(cache_dir, f"{base}.json"),
+    )
+
+
+def _leer_meta(ruta_meta):
+    try:
+        with open(ruta_meta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def escribir_atomico(ruta, escribir):
+    """
+    Escribe `ruta` con `escribir(tmp)` en un temporal y lo renombra: quien la
+    lea ve la versión anterior o la nueva completa, nunca una a medias.
+    """
+    # Proceso e hilo en el nombre: cada sesión de Streamlit corre en su propio hilo
+    tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        escribir(tmp)
+        os.replace(tmp, ruta)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+# ==============================================================
+# 🟦 Lectura con caché en disco
+# ==============================================================
+def leer_con_cache(ruta, lector, cache_dir=CACHE_DIR):
+    """
+    Lee un dataset usando una copia columnar (Parquet) en 'data/.cache'.
+
+    La entrada de caché se identifica por la ruta de la fuente y se valida
+    con su tamaño, fecha de modificación y hash de contenido. Si la fuente
+    cambió, se vuelve a leer con `lector(ruta)` y se regenera la copia.
+    Si la caché no puede usarse (p. ej. sin pyarrow), se lee la fuente directamente;
+    mientras la fuente no cambie, no se vuelve a intentar escribirla.
+    """
+    ruta_parquet, ruta_meta = _rutas_cache(ruta, cache_dir)
+    info = os.stat(ruta)
+    if _SIN_CACHE.get((os.path.abspath(ruta), cache_dir)) == (info.st_size, info.st_mtime_ns):
+        return lector(ruta)
+    meta = _leer_meta(ruta_meta)
+
+    if meta is not None and os.path.exists(ruta_parquet) and meta.get("size") == info.st_size:
+        # Camino rápido: mismo tamaño y misma fecha de modificación
+        if meta.get("mtime_ns") == info.st_mtime_ns:
+            try:
+                return pd.read_parquet(ruta_parquet)
+            except Exception:
+                pass
+        # Cambió la fecha pero puede que no el contenido (p. ej. copia o touch)
+        else:
+            sha256 = hash_archivo(ruta)
+            if meta.get("sha256") == sha256:
+                try:
+                    df = pd.read_parquet(ruta_parquet)
+                    meta["mtime_ns"] = info.st_mtime_ns
+                    escribir_atomico(ruta_meta, lambda tmp: guardar_json(meta, tmp))
+                    return df
+                except Exception:
+                    pass
+
+    df = lector(ruta)
+    guardar_en_cache(ruta, df, cache_dir=cache_dir, info=info)
+    return df
+
+
+def guardar_en_cache(ruta, df, cache_dir=CACHE_DIR, info=None):
+    """Guarda `df` como copia columnar de la fuente `ruta`. Devuelve True si se guardó."""
+    if df is None:
+        return False
+
+    ruta_parquet, ruta_meta = _rutas_cache(ruta, cache_dir)
+    info = info or os.stat(ruta)
+    clave = (os.path.abspath(ruta), cache_dir)
+
+    try:
+        # Primero la copia: si no se puede escribir, no se paga el hash de la fuente
+        os.makedirs(cache_dir, exist_ok=True)
+        escribir_atomico(ruta_parquet, lambda tmp: df.to_parquet(tmp, index=False))
+        meta = {
+            "source": clave[0],
+            "size": info.st_size,
+            "mtime_ns": info.st_mtime_ns,
+            "sha256": hash_archivo(ruta),
+        }
+        escribir_atomico(ruta_meta, lambda tmp: guardar_json(meta, tmp))
+    except Exception:
+        # La caché es opcional: cualquier error deja la lectura normal, sin
+        # reintentar la escritura hasta que cambie la fuente
+        _SIN_CACHE[clave] = (info.st_size, info.st_mtime_ns)
+        return False
+    _SIN_CACHE.pop(clave, None)
+    return True
+
+
+# ==============================================================
+# 🟦 Exportación de CSV solo si cambió
+# ==============================================================
+def huella_dataframe(df, **parametros):
+    """
+    SHA-256 del contenido de un DataFrame (columnas, tipos y valores) y de
+    los parámetros con que se va a serializar, sin convertirlo a texto.
+    """
+    h = hashlib.sha256(json.dumps(
+        {"dtypes": [[str(c), str(t)] for c, t in df.dtypes.items()], "parametros": parametros},
+        sort_keys=True, default=str
+    ).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=parametros.get("index", True)).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def guardar_csv_si_cambio(df, ruta, **to_csv_kwargs):
+    """
+    Escribe `df` como CSV en `ruta` solo si su contenido cambió desde la
+    última escritura o si el archivo se modificó por fuera. La escritura es
+    atómica: quien lo lea ve la versión anterior o la nueva completa, nunca
+    una a medias. Devuelve True si escribió el archivo.
+    """
+    huella = huella_dataframe(df, **to_csv_kwargs)
+    _, ruta_meta = _rutas_cache(ruta, DIR_EXPORTADOS)
+    meta = _leer_meta(ruta_meta)
+
+    try:
+        info = os.stat(ruta)
+    except OSError:
+        info = None
+
+    if (meta is not None and info is not None and meta.get("huella") == huella
+            and meta.get("size") == info.st_size and meta.get("mtime_ns") == info.st_mtime_ns):
+        return False
+
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    escribir_atomico(ruta, lambda tmp: df.to_csv(tmp, **to_csv_kwargs))
+
+    info = os.stat(ruta)
+    meta = {"destino": os.path.abspath(ruta), "huella": huella, "size": info.st_size, "mtime_ns": info.st_mtime_ns}
+    try:
+        os.makedirs(DIR_EXPORTADOS, exist_ok=True)
+        escribir_atomico(ruta_meta, lambda tmp: guardar_json(meta, tmp))
+    except OSError:
+        # Sin la huella solo se pierde el ahorro: la próxima vez se vuelve a escribir
+        pass
+    return True
+
+
+def limpiar_cache(cache_dir=CACHE_DIR):
+    """Elimina todas las copias columnares guardadas."""
+    if not os.path.isdir(cache_dir):
+        return 0
+    borrados = 0
+    for nombre in os.listdir(cache_dir):
+        if nombre.endswith((".parquet", ".json")):
+            os.remove(os.path.join(cache_dir, nombre))
+            borrados += 1
+    return borrados
+
+
+def guardar_json(datos, ruta):
+    """Escribe `datos` como JSON en `ruta` (ver escribir_atomico)."""
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f)
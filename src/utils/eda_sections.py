@@ -32,7 +32,8 @@ def mostrar_graficos(rutas: list, columnas: int = 1):
                     st.image(ruta, use_container_width=True)
             else:
                 st.warning(f"No se encontró la imagen: {ruta}\n"
-                           "- Para generarla, primero debes ejecutar la página 👉🏻 **EDA Diagnóstico**."
+                           "- Para generarla, primero debes ejecutar la página 👉🏻 **EDA Diagnóstico**, "
+                           "o sin abrir la app: `python -m src.utils.assets_graficos`."
                 )
     else:
         cols = st.columns(columnas)
@@ -42,5 +43,6 @@ def mostrar_graficos(rutas: list, columnas: int = 1):
                     st.image(ruta, use_container_width=True)
             else:
                 st.warning(f"No se encontró la imagen: {ruta}\n"
-                           "- Para generarla, primero debes ejecutar la página 👉🏻 **EDA Diagnóstico**."
+                           "- Para generarla, primero debes ejecutar la página 👉🏻 **EDA Diagnóstico**, "
+                           "o sin abrir la app: `python -m src.utils.assets_graficos`."
                 )
\ No newline at end of file
@@ -1,11 +1,29 @@
 # src/utils/figures.py
 
+import atexit
+import hashlib
+import inspect
 import io
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.colors import LinearSegmentedColormap, LogNorm, to_rgba
+import numpy as np
+import pandas as pd
+import seaborn as sns
 import streamlit as st
 import unicodedata
 import re
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from src.config import CACHE_ROOT
+from src.utils.disk_cache import escribir_atomico, hash_archivo
+from src.utils.palette import PALETA
 
 # ==============================================================
 # 🟦 Funciones auxiliares
@@ -21,14 +39,108 @@ def clean_filename(text):
     return text.strip("_")
 
 # ==============================================================
-# 🟦 Guardar figuras
+# 🟦 Ciclo de vida de las figuras
 # ==============================================================
-def save_fig_to_disk(fig, name=None, folder="assets/plots", dpi=120, fmt="png"):
-    folder_path = ensure_dir(folder)
+# pyplot guarda una referencia a cada figura abierta, y el servidor de
+# Streamlit es un proceso de larga duración: una figura que no se cierra vive
+# hasta que se reinicia la app. Las páginas crean sus figuras con figura(),
+# que las cierra siempre al salir del bloque, aunque haya un error.
+
+# Con AURELION_MONITOR_FIGURAS=1 la app muestra monitor_figuras() en la sidebar
+MONITOR_FIGURAS = os.environ.get("AURELION_MONITOR_FIGURAS") == "1"
+
+# A partir de esta cantidad de figuras abiertas en el proceso se avisa de una fuga
+UMBRAL_FIGURAS_ABIERTAS = 20
+
+# id de sesión de Streamlit -> {"creadas": n, "cerradas": n}, de las sesiones más recientes
+_CONTADORES_FIGURAS = OrderedDict()
+_MAX_SESIONES_CONTADAS = 256
+_LOCK_CONTADORES = threading.Lock()
+
+
+def _contar(evento):
+    ctx = get_script_run_ctx(suppress_warning=True)
+    sesion = ctx.session_id if ctx is not None else None
+    with _LOCK_CONTADORES:
+        contador = _CONTADORES_FIGURAS.setdefault(sesion, {"creadas": 0, "cerradas": 0})
+        contador[evento] += 1
+        _CONTADORES_FIGURAS.move_to_end(sesion)
+        if len(_CONTADORES_FIGURAS) > _MAX_SESIONES_CONTADAS:
+            _CONTADORES_FIGURAS.popitem(last=False)
+
+
+@contextmanager
+def figura(**kwargs):
+    """
+    plt.subplots(**kwargs) como context manager: entrega (fig, ax) y cierra
+    la figura al salir del bloque.
+
+        with figura(figsize=(8, 4)) as (fig, ax):
+            ax.plot(...)
+            mostrar_fig(fig)
+    """
+    fig, ax = plt.subplots(**kwargs)
+    _contar("creadas")
+    try:
+        yield fig, ax
+    finally:
+        plt.close(fig)
+        _contar("cerradas")
+
+
+def _bytes_renderer(fig):
+    # Buffer RGBA del renderer Agg, si la figura ya se dibujó alguna vez
+    renderer = getattr(fig.canvas, "renderer", None)
+    if renderer is None:
+        return 0
+    return int(renderer.width) * int(renderer.height) * 4
+
 
+def estado_figuras():
+    """
+    Figuras abiertas en el proceso y memoria de sus renderers, figuras creadas
+    y cerradas con figura() en la sesión actual y tamaño de la caché de renders.
+    """
+    abiertas = [plt.figure(num) for num in plt.get_fignums()]
+    ctx = get_script_run_ctx(suppress_warning=True)
+    sesion = ctx.session_id if ctx is not None else None
+    with _LOCK_CONTADORES:
+        contador = dict(_CONTADORES_FIGURAS.get(sesion, {"creadas": 0, "cerradas": 0}))
+    return {
+        "abiertas": len(abiertas),
+        "bytes_renderer": sum(_bytes_renderer(fig) for fig in abiertas),
+        "creadas_sesion": contador["creadas"],
+        "cerradas_sesion": contador["cerradas"],
+        "bytes_cache_renders": estado_cache_figuras()["bytes"],
+    }
+
+
+def monitor_figuras(contenedor=None):
+    """Muestra estado_figuras() (en la sidebar por defecto) y avisa si parece haber una fuga."""
+    destino = contenedor if contenedor is not None else st.sidebar
+    estado = estado_figuras()
+    with destino.expander("🧮 Figuras en memoria", expanded=False):
+        st.write(f"Abiertas en el proceso: **{estado['abiertas']}** "
+                 f"({estado['bytes_renderer'] / 1024**2:.1f} MB de renderers)")
+        st.write(f"Creadas / cerradas en esta sesión: {estado['creadas_sesion']} / {estado['cerradas_sesion']}")
+        st.write(f"Caché de renders: {estado['bytes_cache_renders'] / 1024**2:.1f} MB")
+    if estado["abiertas"] >= UMBRAL_FIGURAS_ABIERTAS:
+        destino.warning(f"⚠️ {estado['abiertas']} figuras de matplotlib siguen abiertas: posible fuga de memoria.")
+    return estado
+
+# ==============================================================
+# 🟦 Guardar figuras
+# ==============================================================
+def _nombre_figura(fig, name=None):
     if name is None:
         ax = fig.axes[0] if fig.axes else None
         name = ax.get_title() if ax and ax.get_title() else "plot"
+    return name
+
+def save_fig_to_disk(fig, name=None, folder="assets/plots", dpi=120, fmt="png"):
+    folder_path = ensure_dir(folder)
+
+    name = _nombre_figura(fig, name)
     
     name = clean_filename(name)
     filename = f"{name}.{fmt}"
@@ -37,19 +149,441 @@ def save_fig_to_disk(fig, name=None, folder="assets/plots", dpi=120, fmt="png"):
     fig.savefig(filepath, format=fmt, dpi=dpi, bbox_inches="tight")
     return filepath
 
+# ==============================================================
+# 🟦 Escritura en segundo plano
+# ==============================================================
+# Las páginas encolan el PNG ya rasterizado y siguen; un hilo lo escribe en
+# disco. Un archivo que ya tiene ese mismo contenido no se vuelve a escribir.
+_COLA_ESCRITURA = queue.Queue()
+_ESCRITOR = None
+_LOCK_ESCRITOR = threading.Lock()
+
+# ruta -> (hash del último contenido escrito, fecha de modificación del archivo)
+_ESCRITOS = {}
+
+
+def _ya_escrito(ruta, huella):
+    # Si el archivo se borró o se reemplazó por fuera, el registro no vale
+    try:
+        mtime = os.stat(ruta).st_mtime_ns
+    except OSError:
+        return False
+    return _ESCRITOS.get(ruta) == (huella, mtime)
+
+
+def _escribir_pendientes():
+    while True:
+        ruta, png, huella = _COLA_ESCRITURA.get()
+        try:
+            if not _ya_escrito(ruta, huella):
+                ensure_dir(os.path.dirname(ruta))
+                escribir_atomico(ruta, lambda tmp: Path(tmp).write_bytes(png))
+                _ESCRITOS[ruta] = (huella, os.stat(ruta).st_mtime_ns)
+        except OSError:
+            # Un gráfico que no se pudo guardar no debe afectar a la página
+            pass
+        finally:
+            _COLA_ESCRITURA.task_done()
+
+
+def guardar_png(png, name, folder="assets/plots"):
+    """
+    Encola la escritura de un PNG ya rasterizado en `folder`/`name`.png y
+    retorna la ruta sin esperar a que se escriba (ver esperar_escrituras).
+    """
+    global _ESCRITOR
+    ruta = os.path.join(folder, f"{clean_filename(name)}.png")
+    huella = hashlib.sha1(png).digest()
+    if _ya_escrito(ruta, huella):
+        return Path(ruta)
+
+    with _LOCK_ESCRITOR:
+        if _ESCRITOR is None:
+            _ESCRITOR = threading.Thread(target=_escribir_pendientes, name="escritor-figuras", daemon=True)
+            _ESCRITOR.start()
+    _COLA_ESCRITURA.put((ruta, png, huella))
+    return Path(ruta)
+
+
+def esperar_escrituras():
+    """Bloquea hasta que se hayan escrito todos los PNG encolados."""
+    _COLA_ESCRITURA.join()
+
+
+# El hilo es daemon: al salir se esperan las escrituras pendientes
+atexit.register(esperar_escrituras)
+
 # ==============================================================
 # 🟦 Mostrar figuras 
 # ==============================================================
-def mostrar_fig(fig, ancho=700, save=False, name=None, folder="assets/plots"):
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=120, bbox_inches='tight')
-    buf.seek(0)
-    st.image(buf, width=ancho)
+def _publicar(png, ancho, save, name, folder, contenedor):
+    """Reparte un PNG ya rasterizado: a la página y, con save=True, a `folder`."""
+    destino = contenedor if contenedor is not None else st
+    destino.image(png, width="stretch" if ancho is None else ancho)
 
     if save:
         try:
-            st.caption("💾 Vizualizacion guardada")
+            guardar_png(png, name, folder)
+            destino.caption("💾 Vizualizacion guardada")
         except Exception as e:
-            st.warning(f"No se pudo guardar el gráfico: {e}")
+            destino.warning(f"No se pudo guardar el gráfico: {e}")
+
+
+def mostrar_fig(fig, ancho=700, save=False, name=None, folder="assets/plots", contenedor=None):
+    """
+    Rasteriza la figura una sola vez y usa ese mismo PNG para mostrarla y,
+    con save=True, para guardarla en `folder` (en segundo plano, con el título
+    del gráfico como nombre si no se indica `name`). Cierra la figura.
+
+    Retorna los bytes del PNG, por ejemplo para un st.download_button.
+    """
+    name = _nombre_figura(fig, name)
+    png = render_png(fig)
+    _publicar(png, ancho, save, name, folder, contenedor)
+    return png
+
+# ==============================================================
+# 🟦 Caché de renders
+# ==============================================================
+# PNG ya rasterizados, identificados por el contenido de los datos graficados,
+# los parámetros del gráfico y el código que lo arma. Si nada de eso cambió,
+# el gráfico se sirve desde la caché sin pasar por matplotlib.
+DIR_CACHE_FIGURAS = os.path.join(CACHE_ROOT, "figuras")
+
+# Con AURELION_FIGURAS_EN_DISCO=0 los renders solo se guardan en memoria
+FIGURAS_EN_DISCO = os.environ.get("AURELION_FIGURAS_EN_DISCO", "1") != "0"
+
+# Límites de tamaño: al superarlos se descartan los renders usados hace más tiempo
+MAX_BYTES_MEMORIA = 64 * 1024 * 1024
+MAX_BYTES_DISCO = 256 * 1024 * 1024
+
+# Parámetros de rasterización (los mismos de save_fig_to_disk)
+DPI_RENDER = 120
+
+# Formato de las claves de render: cambiarlo invalida todos los renders guardados
+FORMATO_HUELLA = 2
+
+# clave -> bytes del PNG, del menos al más usado recientemente
+_RENDERS = OrderedDict()
+_BYTES_EN_MEMORIA = 0
+# Streamlit atiende cada sesión en su propio hilo
+_LOCK_RENDERS = threading.Lock()
+
+
+def _actualizar_huella(h, parte):
+    if isinstance(parte, pd.DataFrame):
+        h.update(json.dumps([[str(c), str(t)] for c, t in parte.dtypes.items()]).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(parte, index=True).to_numpy().tobytes())
+    elif isinstance(parte, (pd.Series, pd.Index)):
+        h.update(f"{type(parte).__name__}:{parte.name}:{parte.dtype}".encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(parte, index=isinstance(parte, pd.Series)).to_numpy().tobytes())
+    elif isinstance(parte, np.ndarray):
+        h.update(f"{parte.dtype}:{parte.shape}".encode("utf-8"))
+        h.update(np.ascontiguousarray(parte).tobytes())
+    elif inspect.isfunction(parte):
+        # El código de la función que arma el gráfico: editarla invalida sus renders
+        _huella_funcion(h, parte, set())
+    else:
+        h.update(json.dumps(parte, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8"))
+
+
+def _del_proyecto(nombre):
+    return nombre == "src" or nombre.startswith("src.")
 
+
+def _huella_codigo(h, codigo):
+    """Bytecode, nombres y constantes de `codigo` y de su código anidado (lambdas, comprensiones...)."""
+    h.update(codigo.co_code)
+    h.update(repr(codigo.co_names).encode("utf-8"))
+    for constante in codigo.co_consts:
+        if inspect.iscode(constante):
+            _huella_codigo(h, constante)
+        else:
+            h.update(repr(constante).encode("utf-8"))
+
+
+def _nombres_usados(codigo):
+    nombres = set(codigo.co_names)
+    for constante in codigo.co_consts:
+        if inspect.iscode(constante):
+            nombres |= _nombres_usados(constante)
+    return nombres
+
+
+# ruta del módulo -> (mtime_ns, sha256 del archivo)
+_HUELLAS_MODULO = {}
+
+
+def _huella_modulo(modulo):
+    """SHA-256 del archivo fuente de un módulo del proyecto, recalculado solo si cambió."""
+    ruta = getattr(modulo, "__file__", None)
+    if ruta is None:
+        return modulo.__name__
+    try:
+        mtime = os.stat(ruta).st_mtime_ns
+    except OSError:
+        return modulo.__name__
+    guardada = _HUELLAS_MODULO.get(ruta)
+    if guardada is None or guardada[0] != mtime:
+        guardada = (mtime, hash_archivo(ruta))
+        _HUELLAS_MODULO[ruta] = guardada
+    return guardada[1]
+
+
+def _huella_funcion(h, funcion, vistas):
+    """
+    Código de `funcion` y de las funciones del proyecto que usa (por nombre
+    global o clausura), recorridas una sola vez. Los módulos del proyecto que
+    usa (p. ej. `graficos.barras(...)`) entran con la huella de su archivo.
+    """
+    if funcion in vistas:
+        return
+    vistas.add(funcion)
+    h.update(f"{funcion.__module__}.{funcion.__qualname__}".encode("utf-8"))
+    _huella_codigo(h, funcion.__code__)
+
+    usadas = [funcion.__globals__.get(nombre) for nombre in sorted(_nombres_usados(funcion.__code__))]
+    usadas += [celda.cell_contents for celda in funcion.__closure__ or () if _celda_llena(celda)]
+    for objeto in usadas:
+        if inspect.isfunction(objeto) and _del_proyecto(objeto.__module__ or ""):
+            _huella_funcion(h, objeto, vistas)
+        elif inspect.ismodule(objeto) and _del_proyecto(objeto.__name__) and objeto not in vistas:
+            vistas.add(objeto)
+            h.update(f"{objeto.__name__}:{_huella_modulo(objeto)}".encode("utf-8"))
+
+
+def _celda_llena(celda):
+    try:
+        celda.cell_contents
+    except ValueError:
+        return False
+    return True
+
+
+def huella_figura(*partes):
+    """
+    Clave de un gráfico: hash de los datos (DataFrame, Series, arrays) y
+    parámetros (cualquier valor serializable) que lo determinan.
+    """
+    h = hashlib.sha256(
+        f"formato{FORMATO_HUELLA}:mpl{matplotlib.__version__}:dpi{DPI_RENDER}:paleta{sorted(PALETA.items())}:"
+        f"densidad{UMBRAL_FILAS_DENSIDAD}x{BINS_DENSIDAD}:strip{MUESTRA_STRIP}>{UMBRAL_FILAS_DENSIDAD}".encode("utf-8")
+    )
+    for parte in partes:
+        h.update(b"\x00")
+        _actualizar_huella(h, parte)
+    return h.hexdigest()
+
+
+def _ruta_render(clave):
+    return os.path.join(DIR_CACHE_FIGURAS, f"{clave[:32]}.png")
+
+
+def _recordar(clave, png):
+    """Guarda el render en la LRU en memoria y descarta los más viejos si no entra."""
+    global _BYTES_EN_MEMORIA
+    with _LOCK_RENDERS:
+        anterior = _RENDERS.pop(clave, None)
+        if anterior is not None:
+            _BYTES_EN_MEMORIA -= len(anterior)
+        if len(png) > MAX_BYTES_MEMORIA:
+            return
+        _RENDERS[clave] = png
+        _BYTES_EN_MEMORIA += len(png)
+        while _BYTES_EN_MEMORIA > MAX_BYTES_MEMORIA:
+            _, descartado = _RENDERS.popitem(last=False)
+            _BYTES_EN_MEMORIA -= len(descartado)
+
+
+def _recortar_disco():
+    """Borra los renders en disco menos usados hasta quedar debajo de MAX_BYTES_DISCO."""
+    archivos = []
+    for entrada in os.scandir(DIR_CACHE_FIGURAS):
+        if entrada.name.endswith(".png"):
+            info = entrada.stat()
+            archivos.append((info.st_mtime_ns, info.st_size, entrada.path))
+    total = sum(tamano for _, tamano, _ in archivos)
+    for _, tamano, ruta in sorted(archivos):
+        if total <= MAX_BYTES_DISCO:
+            break
+        os.remove(ruta)
+        total -= tamano
+
+
+def leer_render(clave):
+    """PNG guardado para `clave` (primero en memoria, luego en disco) o None."""
+    with _LOCK_RENDERS:
+        png = _RENDERS.get(clave)
+        if png is not None:
+            _RENDERS.move_to_end(clave)
+            return png
+
+    if not FIGURAS_EN_DISCO:
+        return None
+    ruta = _ruta_render(clave)
+    try:
+        with open(ruta, "rb") as f:
+            png = f.read()
+        # La fecha de modificación hace de "último uso" para el recorte del disco
+        os.utime(ruta)
+    except OSError:
+        return None
+    _recordar(clave, png)
+    return png
+
+
+def guardar_render(clave, png):
+    """Guarda el PNG en memoria y, si está habilitado, en 'data/.cache/figuras'."""
+    _recordar(clave, png)
+    if not FIGURAS_EN_DISCO:
+        return
+    try:
+        os.makedirs(DIR_CACHE_FIGURAS, exist_ok=True)
+        ruta = _ruta_render(clave)
+        escribir_atomico(ruta, lambda tmp: Path(tmp).write_bytes(png))
+        _recortar_disco()
+    except OSError:
+        # La caché en disco es opcional: sin ella solo queda la de memoria
+        pass
+
+
+def limpiar_cache_figuras():
+    """Elimina los renders guardados en memoria y en disco."""
+    global _BYTES_EN_MEMORIA
+    with _LOCK_RENDERS:
+        _RENDERS.clear()
+        _BYTES_EN_MEMORIA = 0
+    if not os.path.isdir(DIR_CACHE_FIGURAS):
+        return 0
+    borrados = 0
+    for archivo in os.listdir(DIR_CACHE_FIGURAS):
+        if archivo.endswith(".png"):
+            os.remove(os.path.join(DIR_CACHE_FIGURAS, archivo))
+            borrados += 1
+    return borrados
+
+
+def estado_cache_figuras():
+    """Cantidad de renders y bytes ocupados en memoria."""
+    with _LOCK_RENDERS:
+        return {"renders": len(_RENDERS), "bytes": _BYTES_EN_MEMORIA}
+
+
+def render_png(fig):
+    """Rasteriza la figura a PNG (mismos parámetros que save_fig_to_disk) y la cierra."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=DPI_RENDER, bbox_inches="tight")
     plt.close(fig)
+    return buf.getvalue()
+
+
+def mostrar_fig_cacheada(construir, datos=(), parametros=None, ancho=700, save=False, name=None,
+                         folder="assets/plots", contenedor=None, figsize=None):
+    """
+    Muestra el gráfico que dibuja `construir(fig, ax, *datos, **parametros)`
+    sobre una figura de tamaño `figsize` usando la caché de renders. La figura
+    se crea y se cierra aquí (ver figura()).
+
+    `datos` son los DataFrame/Series que grafica y `parametros` el resto de
+    sus argumentos (títulos, categoría...). Si ya existe un render con la
+    misma huella, `construir` no se llama. Con ancho=None la imagen ocupa el
+    ancho del `contenedor` (por defecto, la página).
+
+    Con save=True el mismo PNG se guarda en `folder` como en mostrar_fig, con
+    el nombre `name` (obligatorio: en un acierto de caché no hay figura de la
+    que leer el título). Retorna los bytes del PNG.
+    """
+    if save and name is None:
+        raise ValueError("mostrar_fig_cacheada con save=True necesita `name`")
+    if not isinstance(datos, (list, tuple)):
+        datos = (datos,)
+    clave = huella_figura(construir, figsize, parametros, *datos)
+
+    png = leer_render(clave)
+    if png is None:
+        with figura(figsize=figsize) as (fig, ax):
+            construir(fig, ax, *datos, **(parametros or {}))
+            png = render_png(fig)
+        guardar_render(clave, png)
+
+    _publicar(png, ancho, save, name, folder, contenedor)
+    return png
+
+
+# ==============================================================
+# 🟦 Gráficos para muchos datos
+# ==============================================================
+# Con un marcador por fila, un scatter o un stripplot de cientos de miles de
+# puntos tarda segundos en dibujarse y genera PNG enormes. Por encima de este
+# umbral se grafica la densidad (histograma 2D) o una muestra de las filas.
+UMBRAL_FILAS_DENSIDAD = 50_000
+
+# Filas que se dibujan en un stripplot muestreado
+MUESTRA_STRIP = 5_000
+
+# Celdas del histograma 2D en cada eje
+BINS_DENSIDAD = 80
+
+
+def _sin_nulos(x, y):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    validos = ~(np.isnan(x) | np.isnan(y))
+    return x[validos], y[validos]
+
+
+def densidad_2d(ax, x, y, color, bins=BINS_DENSIDAD):
+    """
+    Histograma 2D de (x, y) calculado con NumPy y dibujado como una sola malla:
+    el costo del gráfico depende de `bins`, no de la cantidad de filas.
+    """
+    x, y = _sin_nulos(x, y)
+    conteos, bordes_x, bordes_y = np.histogram2d(x, y, bins=bins)
+    conteos = np.ma.masked_equal(conteos.T, 0)
+    if conteos.count() == 0:
+        return None
+
+    # De un tono translúcido del color (celdas con pocas filas) al color pleno
+    cmap = LinearSegmentedColormap.from_list("densidad", [to_rgba(color, 0.25), to_rgba(color, 1.0)])
+    malla = ax.pcolormesh(
+        bordes_x, bordes_y, conteos,
+        cmap=cmap, norm=LogNorm(vmin=1, vmax=max(conteos.max(), 2)), shading="flat"
+    )
+    ax.figure.colorbar(malla, ax=ax, label="filas")
+    return malla
+
+
+def dispersion_regresion(ax, data, x, y, scatter_kws=None, line_kws=None, umbral=UMBRAL_FILAS_DENSIDAD):
+    """
+    sns.regplot (sin intervalo de confianza) hasta `umbral` filas. Por encima,
+    densidad_2d en lugar de los puntos y la recta de mínimos cuadrados ajustada
+    con todas las filas, en el mismo rango de x que usa seaborn.
+    """
+    scatter_kws = scatter_kws or {}
+    line_kws = line_kws or {}
+
+    if len(data) <= umbral:
+        sns.regplot(data=data, x=x, y=y, scatter_kws=scatter_kws, line_kws=line_kws, ci=None, ax=ax)
+        return
+
+    valores_x, valores_y = _sin_nulos(data[x], data[y])
+    densidad_2d(ax, valores_x, valores_y, scatter_kws.get("color", "C0"))
+
+    if len(valores_x) > 1 and valores_x.min() < valores_x.max():
+        pendiente, ordenada = np.polyfit(valores_x, valores_y, 1)
+        recta_x = np.linspace(valores_x.min(), valores_x.max(), 100)
+        ax.plot(recta_x, pendiente * recta_x + ordenada, **{"linewidth": 2, **line_kws})
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+
+
+def strip_muestreado(x, ax, muestra=MUESTRA_STRIP, seed=0, umbral=UMBRAL_FILAS_DENSIDAD, **kwargs):
+    """
+    sns.stripplot de `x` hasta `umbral` valores. Por encima, de una muestra
+    aleatoria de `muestra` valores (con semilla fija, para que el gráfico no
+    cambie entre ejecuciones). Los estadísticos del boxplot que lo acompaña se
+    siguen calculando con todo.
+    """
+    if len(x) > max(umbral, muestra):
+        x = x.sample(n=muestra, random_state=seed)
+    sns.stripplot(x=x, ax=ax, **kwargs)
@@ -0,0 +1,295 @@
+# src/utils/graficos.py
+
+import pandas as pd
+import seaborn as sns
+import matplotlib.pyplot as plt
+from sklearn.metrics import RocCurveDisplay
+from src.utils.figures import dispersion_regresion, strip_muestreado
+from src.utils.palette import PALETA
+
+# ==============================================================
+# 🟦 Gráficos compartidos
+# ==============================================================
+# Cada función dibuja sobre (fig, ax) ya creados y recibe los datos ya
+# calculados. Las usan las páginas (con figura() / mostrar_fig_cacheada) y
+# el generador de assets/plots (src/utils/assets_graficos.py), así el PNG que
+# se ve en la app y el de la documentación salen del mismo código.
+
+_CMAP_DIVERGENTE = dict(h_neg=25, h_pos=220, s=70, l=40, as_cmap=True)
+
+# ==============================================================
+# 1️⃣ EDA Diagnóstico
+# ==============================================================
+def distribucion(fig, ax, serie):
+    """Histograma con KDE de una columna numérica."""
+    sns.histplot(
+        serie,
+        kde=True,
+        color=PALETA["claro"],
+        ax=ax,
+        edgecolor="white",
+        linewidth=1
+    )
+
+    for line in ax.lines:
+        line.set_color(PALETA["secundario"])
+        line.set_linewidth(2)
+
+    ax.set_title(f"Distribución de {serie.name}", fontsize=14, fontweight="bold", color=PALETA["secundario"])
+
+
+def matriz_correlacion(fig, ax, corr):
+    sns.heatmap(
+        corr,
+        annot=True,
+        cmap=sns.diverging_palette(**_CMAP_DIVERGENTE),
+        center=0,
+        square=True,
+        ax=ax
+    )
+
+    ax.set_title("Matriz de Correlación", fontsize=14, fontweight="bold", color=PALETA["secundario"])
+
+
+def tabla_ventas_por_mes(df):
+    """Total vendido por mes (columnas 'mes' como Period y 'total_venta')."""
+    mes = pd.to_datetime(df['fecha_venta']).dt.to_period('M').rename('mes')
+    return df['total_venta'].groupby(mes).sum().reset_index()
+
+
+def ventas_por_mes(fig, ax, ventas_mes):
+    """Serie mensual con etiquetas de valor, máximo, mínimo y promedio."""
+    ax.plot(
+        ventas_mes['mes'].astype(str),
+        ventas_mes['total_venta'],
+        marker='o',
+        color=PALETA["principal"],
+        linewidth=2
+    )
+
+    # Etiquetas de valor en cada punto
+    for x, y in zip(ventas_mes['mes'].astype(str), ventas_mes['total_venta']):
+        ax.text(x, y + 8000, f"{y:,.0f}", ha='center', fontsize=9, color='#333333')
+
+    # Destacar máximo y mínimo
+    max_mes = ventas_mes.loc[ventas_mes['total_venta'].idxmax()]
+    min_mes = ventas_mes.loc[ventas_mes['total_venta'].idxmin()]
+
+    ax.scatter(str(max_mes['mes']), max_mes['total_venta'], color='green', s=80, label='Máximo')
+    ax.scatter(str(min_mes['mes']), min_mes['total_venta'], color='red', s=80, label='Mínimo')
+
+    ax.annotate(
+        f"Máximo: {max_mes['total_venta']:,.0f}",
+        xy=(str(max_mes['mes']), max_mes['total_venta']),
+        xytext=(0, 20),
+        textcoords='offset points',
+        ha='center',
+        color='green',
+        fontsize=9
+    )
+
+    ax.annotate(
+        f"Mínimo: {min_mes['total_venta']:,.0f}",
+        xy=(str(min_mes['mes']), min_mes['total_venta']),
+        xytext=(0, -25),
+        textcoords='offset points',
+        ha='center',
+        color='red',
+        fontsize=9
+    )
+
+    # Línea de promedio
+    promedio = ventas_mes['total_venta'].mean()
+    ax.axhline(promedio, color=PALETA["acento2"], linestyle='--', linewidth=1, label=f'Promedio: {promedio:,.0f}')
+
+    ax.set_ylim(200000, 650000)
+    ax.set_title("Ventas Totales por Mes", fontsize=14, fontweight="bold", color=PALETA["secundario"])
+    ax.set_xlabel("Mes")
+    ax.set_ylabel("Total Ventas")
+    ax.grid(True, linestyle='--', alpha=0.5)
+    ax.legend()
+    fig.tight_layout()
+
+
+def relacion_cantidad_total(fig, ax, datos):
+    """Dispersión cantidad vs total_venta con recta de regresión y correlación."""
+    # Con muchas filas se grafica la densidad en lugar de un punto por fila
+    dispersion_regresion(
+        ax,
+        data=datos,
+        x='cantidad',
+        y='total_venta',
+        scatter_kws={'color': PALETA["principal"], 'alpha': 0.6},
+        line_kws={'color': PALETA["acento1"]}
+    )
+
+    corr = datos['cantidad'].corr(datos['total_venta'])
+
+    ax.set_title("Relación Cantidad - Total Venta", fontsize=14, fontweight="bold", color=PALETA["secundario"])
+    ax.grid(True, linestyle='--', alpha=0.5)
+
+    ax.text(
+        x=datos['cantidad'].min() + 0.05*(datos['cantidad'].max()-datos['cantidad'].min()),
+        y=datos['total_venta'].max()*0.95,
+        s=f"Correlación: {corr:.2f}",
+        fontsize=12,
+        color=PALETA["acento1"]
+    )
+
+
+def top_productos(fig, ax, top_prod, categoria):
+    """Barras horizontales del ranking; el eje x es la métrica (nombre de la Series)."""
+    ax.barh(top_prod.index.astype(str), top_prod.values, color=PALETA["principal"])
+    ax.invert_yaxis()
+    ax.set_xlabel(str(top_prod.name).capitalize())
+    ax.set_title(f"Top {len(top_prod)} Productos — {categoria}", fontsize=14, fontweight="bold", color=PALETA["secundario"])
+
+
+def outliers(fig, ax, serie):
+    """Boxplot de una columna con los valores superpuestos (muestreados si son muchos)."""
+    sns.boxplot(
+        x=serie,
+        color=PALETA["acento1"],
+        ax=ax,
+        flierprops=dict(marker='o', color=PALETA["claro"], alpha=0.5)
+    )
+    strip_muestreado(
+        x=serie,
+        color=PALETA["claro"],
+        size=3,
+        alpha=0.4,
+        jitter=True,
+        ax=ax
+    )
+    ax.set_title(f"Boxplot — {serie.name}", fontsize=14, fontweight="bold", color=PALETA["secundario"])
+
+# ==============================================================
+# 2️⃣ Random Forest
+# ==============================================================
+def curvas_roc(fig, ax, y_test, y_proba, clases):
+    """Una curva ROC por clase (One vs Rest)."""
+    colores = plt.cm.tab10.colors
+
+    # Dibujar una curva ROC por cada clase
+    for i, clase in enumerate(clases):
+        RocCurveDisplay.from_predictions(
+            y_test == clase,    # binariza la clase actual
+            y_proba[:, i],      # probabilidades de esa clase
+            name=f"Clase {clase}",
+            ax=ax,
+            color=colores[i]
+        )
+
+    # Estética del gráfico
+    ax.set_title(
+            "Curvas ROC (Multiclase - One vs Rest)",
+            fontsize=16, fontweight="bold", color=PALETA["secundario"],
+            pad=15
+        )
+    ax.set_xlabel("Tasa de Falsos Positivos (FPR)", fontsize=12, fontweight="bold")
+    ax.set_ylabel("Tasa de Verdaderos Positivos (TPR)", fontsize=12, fontweight="bold")
+    ax.grid(alpha=0.2)
+
+    ax.legend(
+            title="Clases",
+            fontsize=10,
+            title_fontsize=11,
+            loc="lower right",
+            frameon=True
+        )
+
+
+def matriz_confusion(fig, ax, cm, labels):
+    # Heatmap con anotaciones
+    sns.heatmap(
+        cm,
+        annot=True,
+        fmt="d",
+        cmap=sns.diverging_palette(**_CMAP_DIVERGENTE),
+        center=0,
+        xticklabels=labels,
+        yticklabels=labels,
+        cbar=True,
+        square=True,
+        linewidths=0.5,
+        linecolor='white',
+        cbar_kws={'shrink': 0.6},
+        ax=ax
+    )
+
+    # Estilo del gráfico
+    ax.set_title("Matriz de Confusión", fontsize=14, fontweight="bold", color=PALETA["secundario"])
+    ax.set_xlabel("Predicción", fontsize=12, fontweight="bold")
+    ax.set_ylabel("Real", fontsize=12, fontweight="bold")
+
+
+def importancia_variables(fig, ax, importances):
+    """Barras horizontales de importances (columnas 'variable' e 'importancia')."""
+    sns.barplot(
+        data=importances.sort_values("importancia", ascending=True),
+        x="importancia",
+        y="variable",
+        color=PALETA["acento1"],
+        ax=ax
+    )
+
+    # Títulos y etiquetas
+    ax.set_title(
+        "Importancia de Variables",
+        fontsize=14,
+        fontweight="bold",
+        color=PALETA["secundario"]
+    )
+    ax.set_xlabel("Importancia", fontsize=12,fontweight="bold")
+    ax.set_ylabel("Variables", fontsize=12,fontweight="bold")
+
+
+def reporte_por_clase(fig, ax, report_df, labels):
+    """Heatmap de precision, recall y f1-score por clase."""
+    sns.heatmap(
+        report_df,
+        annot=True,
+        fmt=".3f",
+        cmap=sns.diverging_palette(**_CMAP_DIVERGENTE),
+        center=0,
+        xticklabels=["Precision", "Recall", "F1-Score"],
+        yticklabels=labels,
+        cbar=True,
+        square=True,
+        linewidths=0.5,
+        linecolor='white',
+        cbar_kws={'shrink': 0.6},
+        ax=ax
+    )
+
+    ax.set_title(
+        "Classification Report - Métricas por Clase",
+        fontsize=14,
+        fontweight="bold",
+        color=PALETA["secundario"]
+    )
+
+    ax.set_xlabel("Métrica", fontsize=12, fontweight="bold")
+    ax.set_ylabel("Clase", fontsize=12, fontweight="bold")
+
+    # Ajustar tamaño de las etiquetas de los ejes
+    ax.tick_params(axis='both', labelsize=9)
+
+    fig.tight_layout()  # Ajustar márgenes automáticamente
+
+
+def curva_aprendizaje(fig, ax, train_sizes, train_mean, test_mean):
+    ax.plot(train_sizes, train_mean, marker="o", label="Entrenamiento")
+    ax.plot(train_sizes, test_mean, marker="o", label="Validación")
+
+    ax.set_title(
+        "Learning Curve - Accuracy",
+        fontsize=14,
+        fontweight="bold",
+        color=PALETA["secundario"]
+    )
+
+    ax.set_xlabel("Cantidad de muestras de entrenamiento", fontsize=12, fontweight="bold")
+    ax.set_ylabel("Accuracy", fontsize=12, fontweight="bold")
+    ax.grid(alpha=0.2)
+    ax.legend()
@@ -0,0 +1,142 @@
+# src/utils/joins.py
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================
+# 🟦 Resolución de claves enteras
+# ==============================================================
+# Si las claves son enteras, no negativas y compactas (máximo <= 4x filas + 1024)
+# se usa un arreglo denso clave -> fila; si no, un índice hash de una sola columna.
+_FACTOR_DENSO = 4
+_MARGEN_DENSO = 1024
+
+
+def posiciones_por_clave(claves_dim, claves_fk):
+    """
+    Para cada clave foránea devuelve la fila de la dimensión que le corresponde
+    (-1 si no existe). Retorna None si las claves no son enteras o si la
+    dimensión tiene claves repetidas, para que el llamador use pd.merge.
+    """
+    dim = np.asarray(claves_dim)
+    fk = np.asarray(claves_fk)
+    if not (np.issubdtype(dim.dtype, np.integer) and np.issubdtype(fk.dtype, np.integer)):
+        return None
+    if len(dim) == 0:
+        return np.full(len(fk), -1, dtype=np.int64)
+
+    minimo, maximo = int(dim.min()), int(dim.max())
+    if minimo >= 0 and maximo <= _FACTOR_DENSO * len(dim) + _MARGEN_DENSO:
+        tabla = np.full(maximo + 1, -1, dtype=np.int64)
+        tabla[dim] = np.arange(len(dim))
+        if np.count_nonzero(tabla >= 0) != len(dim):
+            return None
+        validas = (fk >= 0) & (fk <= maximo)
+        pos = np.full(len(fk), -1, dtype=np.int64)
+        pos[validas] = tabla[fk[validas]]
+        return pos
+
+    indice = pd.Index(dim)
+    if not indice.is_unique:
+        return None
+    return indice.get_indexer(fk).astype(np.int64)
+
+
+def _tomar_filas(df, pos, faltantes):
+    """
+    Toma filas de `df` por posición, bloque a bloque. Las posiciones faltantes
+    quedan nulas, con la misma promoción de tipos que un left join de pandas.
+    """
+    if not faltantes.any():
+        return df.take(pos).reset_index(drop=True)
+    if len(df) == 0:
+        return pd.DataFrame(np.nan, index=pd.RangeIndex(len(pos)), columns=df.columns)
+    tomado = df.take(np.where(faltantes, 0, pos)).reset_index(drop=True)
+    return tomado.where(np.broadcast_to(~faltantes[:, None], tomado.shape))
+
+
+def _coinciden(izquierda, derecha):
+    """Igualdad elemento a elemento en la que dos nulos cuentan como iguales (igual que pd.merge)."""
+    iguales = np.asarray(izquierda == derecha, dtype=bool)
+    if iguales.shape != izquierda.shape:
+        # numpy devuelve un escalar si los tipos no se pueden comparar elemento a elemento
+        raise TypeError("claves no comparables")
+    # Solo se buscan nulos entre las pocas filas distintas
+    distintas = np.flatnonzero(~iguales)
+    if len(distintas):
+        iguales[distintas] = pd.isna(izquierda[distintas]) & pd.isna(derecha[distintas])
+    return iguales
+
+
+# ==============================================================
+# 🟦 Joins
+# ==============================================================
+def join_dimension(hechos, dimension, clave, claves_extra=()):
+    """
+    Equivalente a pd.merge(hechos, dimension, on=[clave, *claves_extra], how='left')
+    cuando `clave` identifica filas de la dimensión.
+
+    Resuelve la clave entera por indexación y valida las claves extra aparte:
+    si no coinciden, la fila queda sin dimensión, igual que en el merge.
+    Retorna None si no aplica (claves no enteras o repetidas, columnas en conflicto).
+    """
+    pos = posiciones_por_clave(dimension[clave], hechos[clave])
+    if pos is None:
+        return None
+
+    columnas = [c for c in dimension.columns if c != clave and c not in claves_extra]
+    if any(c in hechos.columns for c in columnas):
+        return None
+
+    faltantes = pos < 0
+    pos_validas = np.where(faltantes, 0, pos)
+    try:
+        for extra in claves_extra:
+            valores_dim = dimension[extra].to_numpy()
+            if len(valores_dim) == 0:
+                break
+            faltantes = faltantes | ~_coinciden(hechos[extra].to_numpy(), valores_dim[pos_validas])
+    except TypeError:
+        # Tipos no comparables: se deja el caso al merge de pandas
+        return None
+
+    return pd.concat(
+        [hechos.reset_index(drop=True), _tomar_filas(dimension[columnas], pos, faltantes)],
+        axis=1
+    )
+
+
+def join_uno_a_muchos(izquierda, derecha, clave):
+    """
+    Equivalente a pd.merge(izquierda, derecha, on=clave, how='left') cuando
+    `clave` es única en `izquierda` (p. ej. ventas -> líneas de detalle).
+
+    Las filas salen en el orden de `izquierda` y, dentro de cada una, en el
+    orden de `derecha`; las filas sin pareja quedan con columnas nulas.
+    Retorna None si no aplica.
+    """
+    pos = posiciones_por_clave(izquierda[clave], derecha[clave])
+    if pos is None:
+        return None
+
+    columnas_der = [c for c in derecha.columns if c != clave]
+    if any(c in izquierda.columns for c in columnas_der):
+        return None
+
+    emparejadas = np.flatnonzero(pos >= 0)
+    con_pareja = np.zeros(len(izquierda), dtype=bool)
+    con_pareja[pos[emparejadas]] = True
+    sin_pareja = np.flatnonzero(~con_pareja)
+
+    filas_izq = np.concatenate([pos[emparejadas], sin_pareja])
+    filas_der = np.concatenate([emparejadas, np.full(len(sin_pareja), -1, dtype=np.int64)])
+    orden = np.argsort(filas_izq, kind="stable")
+    filas_izq, filas_der = filas_izq[orden], filas_der[orden]
+
+    return pd.concat(
+        [
+            izquierda.take(filas_izq).reset_index(drop=True),
+            _tomar_filas(derecha[columnas_der], filas_der, filas_der < 0),
+        ],
+        axis=1
+    )
@@ -0,0 +1,142 @@
+# src/utils/outliers.py
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================
+# 🟦 Configuración
+# ==============================================================
+METODOS = ("iqr", "zscore", "mad")
+
+# Valores fuera de [Q1 - k·IQR, Q3 + k·IQR]
+K_IQR = 1.5
+
+# |x - media| mayor que este número de desvíos
+UMBRAL_Z = 3.0
+
+# z-score modificado (Iglewicz y Hoaglin): 0.6745·|x - mediana| / MAD mayor que este valor
+UMBRAL_MAD = 3.5
+_ESCALA_MAD = 0.6745
+
+# ==============================================================
+# 1️⃣ Detección
+# ==============================================================
+def _matriz(df, columnas):
+    """Columnas como filas de una matriz float64 (columna × fila), contiguas en memoria."""
+    valores = np.empty((len(columnas), len(df)), dtype=np.float64)
+    for i, col in enumerate(columnas):
+        valores[i] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    return valores
+
+
+def detectar_outliers(df, columnas=None, k_iqr=K_IQR, umbral_z=UMBRAL_Z, umbral_mad=UMBRAL_MAD):
+    """
+    Marca outliers por IQR, z-score y MAD en todas las columnas numéricas de
+    `df` (o en `columnas`) a la vez: las estadísticas de todas las columnas se
+    calculan con una sola llamada vectorizada por medida, sin bucles por fila.
+
+    Retorna (marcas, resumen):
+    - marcas: DataFrame booleano con el índice de `df` y columnas
+      (columna, método); True si el valor es outlier según ese método.
+    - resumen: una fila por columna con las estadísticas, los límites de
+      cada método y la cantidad y el porcentaje de outliers.
+
+    Los nulos no se marcan. Una columna sin dispersión (desvío o MAD igual
+    a 0) no tiene outliers por z-score o MAD. Sin filas, las estadísticas
+    quedan en NaN y no hay marcas.
+    """
+    if columnas is None:
+        columnas = df.select_dtypes(include="number").columns
+    columnas = list(columnas)
+    valores = _matriz(df, columnas)
+
+    if len(df) == 0:
+        # Los percentiles de un arreglo vacío fallan: no hay estadísticas ni marcas
+        nan = np.full(len(columnas), np.nan)
+        estadisticas = {"media": nan, "desvio": nan, "q1": nan, "mediana": nan, "q3": nan, "mad": nan}
+        return _resultado(df, columnas, valores, np.zeros((len(columnas), len(METODOS), 0), dtype=bool), estadisticas, k_iqr)
+
+    con_nulos = np.isnan(valores).any()
+    percentil = np.nanpercentile if con_nulos else np.percentile
+    media_de = np.nanmean if con_nulos else np.mean
+    desvio_de = np.nanstd if con_nulos else np.std
+    mediana_de = np.nanmedian if con_nulos else np.median
+
+    # Q1, mediana y Q3 de todas las columnas con una sola partición por columna
+    q1, mediana, q3 = percentil(valores, [25, 50, 75], axis=1)
+    iqr = q3 - q1
+    limite_inferior = q1 - k_iqr * iqr
+    limite_superior = q3 + k_iqr * iqr
+
+    media = media_de(valores, axis=1)
+    desvio = desvio_de(valores, axis=1)
+
+    desviacion_mediana = np.abs(valores - mediana[:, None])
+    mad = mediana_de(desviacion_mediana, axis=1)
+
+    # Las comparaciones con NaN dan False: los nulos nunca quedan marcados
+    marcas_iqr = (valores < limite_inferior[:, None]) | (valores > limite_superior[:, None])
+    marcas_z = np.abs(valores - media[:, None]) > (umbral_z * desvio)[:, None]
+    marcas_z &= (desvio > 0)[:, None]
+    marcas_mad = desviacion_mediana > (umbral_mad * mad / _ESCALA_MAD)[:, None]
+    marcas_mad &= (mad > 0)[:, None]
+    del desviacion_mediana
+
+    # (columna, método, fila)
+    apiladas = np.stack([marcas_iqr, marcas_z, marcas_mad], axis=1)
+    estadisticas = {"media": media, "desvio": desvio, "q1": q1, "mediana": mediana, "q3": q3, "mad": mad}
+    return _resultado(df, columnas, valores, apiladas, estadisticas, k_iqr)
+
+
+def _resultado(df, columnas, valores, apiladas, estadisticas, k_iqr):
+    """(marcas, resumen) a partir de las marcas apiladas (columna, método, fila) y las estadísticas por columna."""
+    # -> columnas (columna, método) sin copiar fila por fila
+    marcas = pd.DataFrame(
+        apiladas.reshape(len(columnas) * len(METODOS), len(df)).T,
+        index=df.index,
+        columns=pd.MultiIndex.from_product([columnas, METODOS], names=["columna", "metodo"]),
+    )
+
+    conteos = apiladas.sum(axis=2)
+    validos = (~np.isnan(valores)).sum(axis=1)
+    iqr = estadisticas["q3"] - estadisticas["q1"]
+    resumen = pd.DataFrame({
+        "n": validos,
+        "nulos": len(df) - validos,
+        "media": estadisticas["media"],
+        "desvio": estadisticas["desvio"],
+        "q1": estadisticas["q1"],
+        "mediana": estadisticas["mediana"],
+        "q3": estadisticas["q3"],
+        "iqr": iqr,
+        "mad": estadisticas["mad"],
+        "limite_inferior_iqr": estadisticas["q1"] - k_iqr * iqr,
+        "limite_superior_iqr": estadisticas["q3"] + k_iqr * iqr,
+        **{f"outliers_{metodo}": conteos[:, i] for i, metodo in enumerate(METODOS)},
+        **{
+            f"pct_{metodo}": np.round(100 * conteos[:, i] / np.maximum(validos, 1), 2)
+            for i, metodo in enumerate(METODOS)
+        },
+    }, index=pd.Index(columnas, name="columna"))
+
+    return marcas, resumen
+
+# ==============================================================
+# 2️⃣ Consultas sobre las marcas
+# ==============================================================
+def filas_con_outliers(marcas, metodo=None, columnas=None):
+    """
+    Series booleana por fila: True si alguna de `columnas` (todas por defecto)
+    es outlier según `metodo` (cualquiera de los tres si es None).
+    """
+    seleccion = marcas
+    if columnas is not None:
+        seleccion = seleccion.loc[:, seleccion.columns.get_level_values("columna").isin(columnas)]
+    if metodo is not None:
+        seleccion = seleccion.xs(metodo, axis=1, level="metodo")
+    return pd.Series(seleccion.to_numpy().any(axis=1), index=marcas.index, name=metodo or "outlier")
+
+
+def conteo_filas_por_metodo(marcas):
+    """Cantidad de filas con al menos un outlier, por método."""
+    return pd.Series({metodo: int(filas_con_outliers(marcas, metodo).sum()) for metodo in METODOS}, name="filas")
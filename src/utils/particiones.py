@@ -0,0 +1,139 @@
+# src/utils/particiones.py
+
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+# ==============================================================
+# 🟦 Lectura por bloques
+# ==============================================================
+def _bloque_excel(filas, columnas):
+    """
+    Arma un DataFrame desde filas de openpyxl. Como pd.read_excel, convierte
+    a entero los números flotantes sin parte decimal.
+    """
+    df = pd.DataFrame(filas, columns=columnas)
+    for col in df.select_dtypes(include="float").columns:
+        valores = df[col].to_numpy()
+        if not np.isnan(valores).any() and (valores == np.floor(valores)).all():
+            df[col] = valores.astype("int64")
+    return df
+
+
+def iterar_en_bloques(ruta, tamano_bloque=100_000):
+    """
+    Recorre un archivo Excel o CSV en bloques de `tamano_bloque` filas,
+    sin cargarlo completo en memoria.
+    """
+    if ruta.endswith(".csv"):
+        yield from pd.read_csv(ruta, chunksize=tamano_bloque, encoding="utf-8-sig")
+        return
+
+    # openpyxl en modo solo lectura va leyendo el XML de la hoja en streaming
+    wb = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        filas = wb.active.iter_rows(values_only=True)
+        columnas = next(filas, None)
+        if columnas is None:
+            return
+
+        bloque = []
+        for fila in filas:
+            bloque.append(fila)
+            if len(bloque) >= tamano_bloque:
+                yield _bloque_excel(bloque, columnas)
+                bloque = []
+        if bloque:
+            yield _bloque_excel(bloque, columnas)
+    finally:
+        wb.close()
+
+
+# ==============================================================
+# 🟦 Unificación particionada
+# ==============================================================
+def _escribir_particiones(df, destino, n_particiones, n_bloque):
+    """Reparte las filas por hash de id_venta y escribe un archivo por partición."""
+    particion = df["id_venta"].to_numpy() % n_particiones
+    for p, grupo in df.groupby(particion, sort=False):
+        carpeta = os.path.join(destino, f"particion={p:05d}")
+        os.makedirs(carpeta, exist_ok=True)
+        grupo.to_parquet(os.path.join(carpeta, f"bloque_{n_bloque:06d}.parquet"), index=False)
+
+
+def unificar_particionado(clientes, ventas, productos, detalle_ventas_path, destino,
+                          n_particiones=16, tamano_bloque=100_000):
+    """
+    Unifica el detalle de ventas por bloques contra ventas, clientes y productos
+    en memoria, y escribe el resultado particionado por id_venta en `destino`.
+
+    Produce las mismas columnas que `unificar_tablas` (incluidas 'total_venta'
+    y 'fecha' como datetime). La memoria máxima queda acotada por el tamaño de
+    bloque más las tablas de dimensión. Retorna la cantidad de filas escritas.
+    """
+    if os.path.exists(destino):
+        shutil.rmtree(destino)
+    os.makedirs(destino)
+
+    ventas_clientes = pd.merge(ventas, clientes, on=['id_cliente','nombre_cliente','email'], how='left')
+    ids_ventas = ventas_clientes["id_venta"].to_numpy()
+    ventas_vistas = np.zeros(len(ids_ventas), dtype=bool)
+
+    filas = 0
+    columnas = None
+    n_bloque = 0
+    for n_bloque, bloque in enumerate(iterar_en_bloques(detalle_ventas_path, tamano_bloque)):
+        detalle_productos = pd.merge(bloque, productos, on=['id_producto','nombre_producto','precio_unitario'], how='left')
+        parte = pd.merge(ventas_clientes, detalle_productos, on='id_venta', how='inner')
+        parte['total_venta'] = parte['cantidad'] * parte['precio_unitario']
+        parte['fecha'] = pd.to_datetime(parte['fecha'])
+
+        ventas_vistas |= np.isin(ids_ventas, bloque["id_venta"].unique())
+        columnas = parte.columns
+        filas += len(parte)
+        _escribir_particiones(parte, destino, n_particiones, n_bloque)
+
+    # Ventas sin detalle: el merge completo las conserva con columnas vacías
+    sin_detalle = ventas_clientes[~ventas_vistas]
+    if not sin_detalle.empty:
+        sin_detalle = sin_detalle.reindex(columns=columnas) if columnas is not None else sin_detalle
+        sin_detalle['fecha'] = pd.to_datetime(sin_detalle['fecha'])
+        filas += len(sin_detalle)
+        _escribir_particiones(sin_detalle, destino, n_particiones, n_bloque + 1)
+
+    return filas
+
+
+# ==============================================================
+# 🟦 Lectura de particiones
+# ==============================================================
+def iterar_particiones(destino):
+    """Devuelve cada partición como DataFrame, de a una por vez."""
+    for carpeta in sorted(os.listdir(destino)):
+        ruta = os.path.join(destino, carpeta)
+        if not carpeta.startswith("particion=") or not os.path.isdir(ruta):
+            continue
+        bloques = [
+            pd.read_parquet(os.path.join(ruta, nombre))
+            for nombre in sorted(os.listdir(ruta)) if nombre.endswith(".parquet")
+        ]
+        if bloques:
+            yield pd.concat(bloques, ignore_index=True)
+
+
+def exportar_particiones_csv(destino, output_path):
+    """Concatena las particiones en un único CSV, escribiendo de a una partición."""
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    primera = True
+    for df in iterar_particiones(destino):
+        df.to_csv(
+            output_path,
+            mode="w" if primera else "a",
+            header=primera,
+            index=False,
+            encoding="utf-8-sig" if primera else "utf-8"
+        )
+        primera = False
+    return output_path
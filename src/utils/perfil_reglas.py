@@ -0,0 +1,96 @@
+# src/utils/perfil_reglas.py
+
+import json
+import re
+import time
+from datetime import datetime
+import pandas as pd
+from src.utils.classification import CATEGORIA_POR_DEFECTO, huella_reglas
+from src.utils.rules import RULES, EXACT
+
+# ==============================================================
+# 🟦 Perfil de las reglas de clasificación
+# ==============================================================
+# El clasificador compilado evalúa todas las reglas juntas, así que no sabe
+# cuánto cuesta cada patrón. Este modo las recorre una por una, en el orden de
+# prioridad de RULES, y mide cada evaluación: sirve para decidir qué patrones
+# reordenar (los que más deciden) o eliminar (los que nunca coinciden).
+
+def perfilar_reglas(nombres, rules=RULES, exact=EXACT, unicos=True):
+    """
+    Clasifica `nombres` evaluando los patrones en orden y registra, por patrón,
+    cuántas veces se evaluó, cuántas decidió la categoría y el tiempo acumulado.
+    Con unicos=True cada nombre distinto se evalúa una sola vez, como en
+    clasificar_productos.
+
+    Retorna un diccionario con el resumen, la tabla "reglas" y los nombres que
+    llegaron al fallback.
+    """
+    nombres = [str(n) for n in pd.Series(nombres).dropna()]
+    if unicos:
+        nombres = list(dict.fromkeys(nombres))
+
+    reglas = [
+        (categoria, patron, re.compile(patron))
+        for categoria, patrones in rules.items() for patron in patrones
+    ]
+    evaluaciones = [0] * len(reglas)
+    coincidencias = [0] * len(reglas)
+    nanosegundos = [0] * len(reglas)
+    exactos = 0
+    fallbacks = []
+
+    inicio = time.perf_counter()
+    for nombre in nombres:
+        texto = nombre.lower()
+        if texto in exact:
+            exactos += 1
+            continue
+        for i, (_, _, regex) in enumerate(reglas):
+            t0 = time.perf_counter_ns()
+            encontrado = regex.search(texto)
+            nanosegundos[i] += time.perf_counter_ns() - t0
+            evaluaciones[i] += 1
+            if encontrado:
+                coincidencias[i] += 1
+                break
+        else:
+            fallbacks.append(nombre)
+    segundos_total = time.perf_counter() - inicio
+
+    tabla = pd.DataFrame({
+        "categoria": [categoria for categoria, _, _ in reglas],
+        "patron": [patron for _, patron, _ in reglas],
+        "evaluaciones": evaluaciones,
+        "coincidencias": coincidencias,
+        "segundos": [ns / 1e9 for ns in nanosegundos],
+    })
+    tabla["tasa_coincidencia"] = (tabla["coincidencias"] / tabla["evaluaciones"]).fillna(0.0)
+    tabla["us_por_evaluacion"] = (1e6 * tabla["segundos"] / tabla["evaluaciones"]).fillna(0.0)
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "huella_reglas": huella_reglas(rules, exact),
+        "nombres": len(nombres),
+        "exactos": exactos,
+        "categoria_fallback": CATEGORIA_POR_DEFECTO,
+        "fallbacks": fallbacks,
+        "segundos_total": segundos_total,
+        "reglas": tabla,
+    }
+
+
+def reglas_sin_uso(perfil):
+    """Patrones que nunca decidieron una categoría (no coinciden o los tapa una regla anterior)."""
+    tabla = perfil["reglas"]
+    return tabla[tabla["coincidencias"] == 0]
+
+
+def perfil_a_json(perfil, ruta=None):
+    """Serializa el perfil como JSON; si se indica `ruta`, también lo guarda en disco."""
+    datos = {**perfil, "reglas": perfil["reglas"].to_dict(orient="records")}
+    texto = json.dumps(datos, ensure_ascii=False, indent=2)
+    if ruta is not None:
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(texto)
+    return texto
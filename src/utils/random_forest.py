@@ -0,0 +1,67 @@
+# src/utils/random_forest.py
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import classification_report
+from sklearn.model_selection import learning_curve, train_test_split
+
+# ==============================================================
+# 🟦 Entrenamiento del Random Forest
+# ==============================================================
+# Lo usan la página de entrenamiento manual y el generador de assets/plots
+# (src/utils/assets_graficos.py), que entrena con los valores por defecto.
+
+# Variable que se quiere predecir y columnas que no se usan como features
+TARGET = "nivel_demanda"
+COLUMNAS_EXCLUIDAS = ['nivel_demanda', 'total_unidades', 'total_ventas', 'unidades_por_transaccion']
+
+
+def entrenar_random_forest(X, y, n_estimators=200, max_depth=15):
+    """Divide en train/test y entrena el modelo. Retorna (model, X_test, y_test)."""
+    # División del dataset respetando la proporción original de clases
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, 
+        test_size=0.31,     # Mismo que PyCaret
+        random_state=789,   # Mismo que PyCaret
+        stratify=y
+    )
+    
+    # Configuración del modelo con hiperparámetros seleccionados           
+    model = RandomForestClassifier(
+        n_estimators=n_estimators,  # Más árboles, 200
+        max_depth=max_depth,        # Más profundidad, 15 
+        min_samples_split=5,        # Evita overfitting
+        min_samples_leaf=2,
+        max_features='sqrt',        # Mejor generalización
+        class_weight='balanced',
+        random_state=789,
+        n_jobs=-1
+    )
+    
+    # Entrenamiento del modelo
+    model.fit(X_train, y_train)
+    return model, X_test, y_test
+
+
+def tabla_reporte_por_clase(y_test, y_pred, clases):
+    """Precision, recall y f1-score de cada clase (classification_report como DataFrame)."""
+    report = classification_report(
+        y_test, y_pred, 
+        output_dict=True, 
+        zero_division=0
+    )
+    report_df = pd.DataFrame(report).transpose()
+    return report_df.loc[[str(c) for c in clases], ["precision", "recall", "f1-score"]]
+
+
+def calcular_curva_aprendizaje(model, X, y, cv_folds):
+    """Retorna (train_sizes, train_mean, test_mean) de la accuracy."""
+    train_sizes, train_scores, test_scores = learning_curve(
+        model, X, y,
+        cv=cv_folds,
+        train_sizes=np.linspace(0.2, 1.0, 5),
+        scoring="accuracy",
+        n_jobs=-1
+    )
+    return train_sizes, train_scores.mean(axis=1), test_scores.mean(axis=1)
@@ -0,0 +1,124 @@
+# src/utils/schema.py
+
+import pandas as pd
+
+# ==============================================================
+# 1️⃣ Tipos disponibles
+# ==============================================================
+CATEGORIA = "category"          # texto de baja cardinalidad
+FECHA = "datetime64[ns]"        # fechas parseadas
+ID = "id"                       # identificadores enteros: se reducen al menor tipo que alcance
+
+# ==============================================================
+# 2️⃣ Esquemas por dataset
+# ==============================================================
+# Las columnas no declaradas conservan el tipo inferido por pandas.
+# Las medidas (cantidad, precios, importes) quedan en int64 para que
+# las operaciones aritméticas no desborden.
+
+_CLIENTE = {
+    "id_cliente": ID,
+    "nombre_cliente": CATEGORIA,
+    "email": CATEGORIA,
+    "ciudad": CATEGORIA,
+    "fecha_alta": FECHA,
+}
+
+_VENTA = {
+    "id_venta": ID,
+    "fecha": FECHA,
+    "id_cliente": ID,
+    "nombre_cliente": CATEGORIA,
+    "email": CATEGORIA,
+    "medio_pago": CATEGORIA,
+}
+
+_DETALLE = {
+    "id_venta": ID,
+    "id_producto": ID,
+    "nombre_producto": CATEGORIA,
+}
+
+ESQUEMAS = {
+    "Clientes": {
+        **_CLIENTE,
+        # Cada cliente aparece una sola vez: no conviene categorizar nombre ni email
+        "nombre_cliente": None,
+        "email": None,
+    },
+    "Productos": {
+        "id_producto": ID,
+        "categoria": CATEGORIA,
+    },
+    "Ventas": _VENTA,
+    "Detalle Ventas": _DETALLE,
+    "df_tienda_aurelion": {
+        **_VENTA,
+        **_CLIENTE,
+        **_DETALLE,
+        "categoria": CATEGORIA,
+    },
+    "df_tienda_aurelion_modificado": {
+        **{("fecha_venta" if k == "fecha" else k): v for k, v in _VENTA.items()},
+        **_CLIENTE,
+        **_DETALLE,
+        "categoria": CATEGORIA,
+        "categoria_corregida": CATEGORIA,
+        "mes": CATEGORIA,
+    },
+    "dataset_ml_productos": {
+        "id_producto": ID,
+    },
+}
+
+# ==============================================================
+# 3️⃣ Aplicación del esquema
+# ==============================================================
+def memoria_bytes(df):
+    """Memoria real ocupada por el DataFrame (incluye el contenido de los strings)."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def aplicar_esquema(df, nombre):
+    """
+    Convierte las columnas de `df` a los tipos declarados para el dataset `nombre`
+    y deja en df.attrs["memoria"] el uso de memoria antes y después.
+    Modifica `df` en el lugar; si el dataset no tiene esquema, se devuelve sin cambios.
+    """
+    esquema = ESQUEMAS.get(nombre)
+    if df is None or not esquema:
+        return df
+
+    antes = memoria_bytes(df)
+
+    for col, tipo in esquema.items():
+        if tipo is None or col not in df.columns:
+            continue
+        if tipo == ID:
+            # Solo se reducen columnas enteras (con nulos pandas las deja como float)
+            if pd.api.types.is_integer_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif tipo == FECHA:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        else:
+            df[col] = df[col].astype(tipo)
+
+    despues = memoria_bytes(df)
+    df.attrs["memoria"] = {"antes": antes, "despues": despues}
+    return df
+
+
+def leer_csv_tipado(ruta, nombre, **kwargs):
+    """Lee un CSV y le aplica el esquema del dataset `nombre`."""
+    return aplicar_esquema(pd.read_csv(ruta, **kwargs), nombre)
+
+
+def formatear_reporte_memoria(df):
+    """Texto breve con la memoria antes/después de aplicar el esquema."""
+    memoria = df.attrs.get("memoria")
+    if not memoria:
+        return f"{memoria_bytes(df) / 1024:,.1f} KB"
+    antes_kb = memoria["antes"] / 1024
+    despues_kb = memoria["despues"] / 1024
+    factor = memoria["antes"] / memoria["despues"] if memoria["despues"] else 1
+    return f"{despues_kb:,.1f} KB (antes {antes_kb:,.1f} KB, {factor:.1f}x menos)"
@@ -0,0 +1,87 @@
+# src/utils/sqlite_store.py
+
+import os
+import sqlite3
+from pathlib import Path
+import pandas as pd
+from src.config import CACHE_ROOT
+from src.utils.disk_cache import escribir_atomico
+
+# ==============================================================
+# 🟦 Configuración
+# ==============================================================
+RUTA_DB = os.path.join(CACHE_ROOT, "aurelion.sqlite")
+
+# Índices por tabla: claves de unión, fecha y categoría
+INDICES = {
+    "clientes": ["id_cliente"],
+    "productos": ["id_producto", "categoria"],
+    "ventas": ["id_venta", "id_cliente", "fecha"],
+    "detalle_ventas": ["id_venta", "id_producto"],
+    "tienda": ["id_venta", "id_producto", "id_cliente", "fecha", "categoria", "categoria_corregida"],
+}
+
+_FILAS_POR_LOTE = 50_000
+
+
+# ==============================================================
+# 🟦 Construcción del store
+# ==============================================================
+def construir_store(tablas, version, ruta=RUTA_DB):
+    """
+    Crea la base SQLite con las tablas recibidas ({nombre: DataFrame}) y sus índices.
+    Se escribe en un archivo temporal y se reemplaza al final, así los lectores
+    nunca ven una base a medio construir.
+    """
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    escribir_atomico(ruta, lambda tmp: _escribir_tablas(tmp, tablas, version))
+    return ruta
+
+
+def _escribir_tablas(ruta, tablas, version):
+    con = sqlite3.connect(ruta)
+    try:
+        for nombre, df in tablas.items():
+            df.to_sql(nombre, con, index=False, chunksize=_FILAS_POR_LOTE)
+            for col in INDICES.get(nombre, []):
+                if col in df.columns:
+                    con.execute(f'CREATE INDEX "ix_{nombre}_{col}" ON "{nombre}" ("{col}")')
+        con.execute("CREATE TABLE _meta (clave TEXT PRIMARY KEY, valor TEXT)")
+        con.execute("INSERT INTO _meta VALUES ('version', ?)", (version,))
+        con.commit()
+        con.execute("ANALYZE")
+    finally:
+        con.close()
+
+
+def version_store(ruta=RUTA_DB):
+    """Versión de datos con la que se construyó la base, o None si no existe."""
+    if not os.path.exists(ruta):
+        return None
+    try:
+        con = _conectar(ruta)
+        try:
+            fila = con.execute("SELECT valor FROM _meta WHERE clave = 'version'").fetchone()
+        finally:
+            con.close()
+        return fila[0] if fila else None
+    except sqlite3.Error:
+        return None
+
+
+# ==============================================================
+# 🟦 Consultas
+# ==============================================================
+def _conectar(ruta):
+    # Solo lectura: varias sesiones pueden consultar a la vez sin bloquearse
+    # as_uri() escapa espacios, '?' y '#' de la ruta y la deja absoluta
+    return sqlite3.connect(f"{Path(ruta).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def consultar(sql, params=(), ruta=RUTA_DB):
+    """Ejecuta una consulta y devuelve el resultado como DataFrame."""
+    con = _conectar(ruta)
+    try:
+        return pd.read_sql_query(sql, con, params=params)
+    finally:
+        con.close()
@@ -1,21 +1,167 @@
 # src/utils/validation.py
 
-from src.utils.rules import RULES
+import re
+from bisect import bisect_right
+import numpy as np
+import pandas as pd
+from src.utils.classification import CATEGORIA_POR_DEFECTO, CATEGORIAS, clasificar_productos
+from src.utils.rules import RULES, EXACT
 
-def verificar_fallbacks(df):
+# ==============================================================
+# 🟦 Coincidencias de cada patrón
+# ==============================================================
+_SEPARADOR = "\n"
+
+# Anclas y lookarounds miran más allá de la coincidencia: esos patrones se
+# evalúan nombre por nombre en lugar de sobre el texto concatenado
+_DEPENDE_DEL_CONTEXTO = re.compile(r"[\^$]|\\[AZz]|\(\?<?[=!]")
+
+# \b seguido de un literal alfanumérico: se busca el literal (re salta directo a
+# sus apariciones) y el límite de palabra anterior se comprueba aparte
+_LIMITE_Y_LITERAL = re.compile(r"\\b(?=\w)")
+
+
+def _es_palabra(caracter):
+    # Misma definición que \w en patrones str
+    return caracter.isalnum() or caracter == "_"
+
+
+def _ids_en_bloque(patron, bloque, inicios, fines):
+    """
+    Índices de los textos del bloque donde aparece `patron`, o None si alguna
+    coincidencia cruza de un texto a otro. Tras la primera coincidencia en un
+    texto se salta directamente al siguiente.
+    """
+    limite_previo = _LIMITE_Y_LITERAL.match(patron) is not None
+    regex = re.compile(patron[2:] if limite_previo else patron)
+
+    ids = []
+    posicion = 0
+    while posicion <= len(bloque):
+        coincidencia = regex.search(bloque, posicion)
+        if coincidencia is None:
+            break
+        inicio = coincidencia.start()
+        i = bisect_right(inicios, inicio) - 1
+        if coincidencia.end() > fines[i]:
+            return None
+        if limite_previo and inicio > 0 and _es_palabra(bloque[inicio - 1]):
+            posicion = inicio + 1
+            continue
+        ids.append(i)
+        posicion = inicios[i + 1] if i + 1 < len(inicios) else len(bloque) + 1
+    return np.array(ids, dtype=np.int64)
+
+
+def _coincidencias_por_patron(textos, patrones):
+    """
+    Para cada patrón, los índices (sin repetidos) de los textos donde aparece.
+
+    Los textos se unen en un solo string y cada patrón se busca sobre él una
+    sola vez; las posiciones se convierten en índices de texto. Los patrones
+    que dependen del contexto, o cuya coincidencia cruza de un texto a otro,
+    se evalúan texto por texto.
     """
-    Devuelve productos que quedaron en 'Alimentos secos' pero no
-    coinciden con ninguna keyword real de esta categoría.
+    if not textos:
+        return [np.array([], dtype=np.int64) for _ in patrones]
+
+    bloque = _SEPARADOR.join(textos)
+    # Listas de Python: se consultan de a un elemento, más rápido que en numpy
+    inicios, fines = [], []
+    posicion = 0
+    for texto in textos:
+        inicios.append(posicion)
+        fines.append(posicion + len(texto))
+        posicion += len(texto) + 1
+    concatenable = bloque.count(_SEPARADOR) == max(len(textos) - 1, 0)
+
+    resultado = []
+    for patron in patrones:
+        ids = None
+        if concatenable and not _DEPENDE_DEL_CONTEXTO.search(patron):
+            ids = _ids_en_bloque(patron, bloque, inicios, fines)
+        if ids is None:
+            regex = re.compile(patron)
+            ids = np.flatnonzero([regex.search(t) is not None for t in textos])
+        resultado.append(ids)
+    return resultado
+
+
+# ==============================================================
+# 🟦 Validación de la clasificación
+# ==============================================================
+def validar_clasificacion(df):
     """
+    Revisa la clasificación de productos de `df` (nombre_producto y, si existe,
+    categoria_corregida; si no, se calcula) evaluando cada patrón de RULES una
+    sola vez sobre los nombres distintos.
+
+    Retorna un diccionario con:
+      - "categoria_defecto": filas clasificadas en la categoría por defecto
+      - "fallbacks": las que llegaron ahí sin que coincida ninguna regla
+      - "por_regla": productos y filas en los que aparece cada patrón
+      - "por_categoria": productos, filas y productos sin regla por categoría
+    """
+    if "categoria_corregida" in df.columns:
+        etiquetas = df["categoria_corregida"]
+    else:
+        etiquetas = clasificar_productos(df["nombre_producto"])
+    etiquetas = np.asarray(etiquetas, dtype=object)
+
+    codigos, unicos = pd.factorize(df["nombre_producto"].astype(object))
+    textos = [str(nombre).lower() for nombre in unicos]
+    filas_por_nombre = np.bincount(codigos[codigos >= 0], minlength=len(textos))
 
-    alimentos_keywords = RULES["Alimentos secos"]
+    reglas = [(categoria, patron) for categoria, patrones in RULES.items() for patron in patrones]
+    coincidencias = _coincidencias_por_patron(textos, [patron for _, patron in reglas])
 
-    alimentos_reales = df[df["categoria_corregida"] == "Alimentos secos"]
+    con_regla = np.fromiter((t in EXACT for t in textos), dtype=bool, count=len(textos))
+    for ids in coincidencias:
+        con_regla[ids] = True
 
-    fallas = alimentos_reales[
-        ~alimentos_reales["nombre_producto"]
-        .str.lower()
-        .apply(lambda x: any(kw in x for kw in alimentos_keywords))
-    ]
+    por_regla = pd.DataFrame({
+        "categoria": [categoria for categoria, _ in reglas],
+        "patron": [patron for _, patron in reglas],
+        "productos": [len(ids) for ids in coincidencias],
+        "filas": [int(filas_por_nombre[ids].sum()) for ids in coincidencias],
+    })
 
-    return alimentos_reales, fallas
+    # Las filas con nombre nulo no cuentan como fallback
+    sin_regla = np.append(~con_regla, False)[codigos]
+    es_defecto = etiquetas == CATEGORIA_POR_DEFECTO
+
+    tabla = pd.DataFrame({
+        "categoria": etiquetas,
+        "producto": pd.Series(codigos).where(codigos >= 0).to_numpy(),
+        "sin_regla": sin_regla,
+    })
+    por_categoria = tabla.groupby("categoria").agg(
+        productos=("producto", "nunique"),
+        filas=("producto", "size"),
+    )
+    por_categoria["productos_sin_regla"] = (
+        tabla[tabla["sin_regla"]].groupby("categoria")["producto"].nunique()
+    )
+    por_categoria = por_categoria.reindex(
+        list(dict.fromkeys([*CATEGORIAS, *por_categoria.index]))
+    ).fillna(0).astype(int)
+    por_categoria["porcentaje_filas"] = (
+        100 * por_categoria["filas"] / len(df) if len(df) else 0.0
+    )
+
+    return {
+        "categoria_defecto": df[es_defecto],
+        "fallbacks": df[es_defecto & sin_regla],
+        "por_regla": por_regla,
+        "por_categoria": por_categoria,
+    }
+
+
+def verificar_fallbacks(df):
+    """
+    Devuelve (categoria_defecto, fallbacks), como validar_clasificacion:
+    las filas clasificadas en la categoría por defecto y, entre ellas, las
+    que no coinciden con ningún patrón de RULES (de ninguna categoría).
+    """
+    resultado = validar_clasificacion(df)
+    return resultado["categoria_defecto"], resultado["fallbacks"]
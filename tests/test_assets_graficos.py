@@ -0,0 +1,46 @@
+# tests/test_assets_graficos.py
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+# La carpeta de datos se lee al importar src.config: cada corrida va en su propio proceso
+_GENERAR = """
+import json, sys
+from src.utils.assets_graficos import GRUPOS, generar_assets
+resultado = generar_assets(workers=4, carpeta=sys.argv[1])
+esperados = [nombre for spec in GRUPOS.values() for nombre in spec["graficos"]]
+print(json.dumps({"resultado": resultado, "esperados": esperados}))
+"""
+
+
+def test_generar_assets_en_paralelo_con_cache_fria(tmp_path):
+    datos = tmp_path / "data"
+    datos.mkdir()
+    for nombre in ("df_tienda_aurelion.csv", "dataset_ml_productos.csv"):
+        shutil.copy(RAIZ / "data" / nombre, datos / nombre)
+    carpeta = tmp_path / "plots"
+
+    proceso = subprocess.run(
+        [sys.executable, "-c", _GENERAR, str(carpeta)],
+        cwd=RAIZ,
+        env={**os.environ, "AURELION_DATA_DIR": str(datos), "MPLBACKEND": "Agg"},
+        capture_output=True,
+        text=True,
+    )
+    assert proceso.returncode == 0, proceso.stderr
+
+    salida = json.loads(proceso.stdout.strip().splitlines()[-1])
+    resultado = salida["resultado"]
+    assert resultado["sin_entradas"] == []
+    assert sorted(resultado["generados"]) == sorted(salida["esperados"])
+    assert all((carpeta / f"{nombre}.png").exists() for nombre in salida["esperados"])
+
+    # El column store se arma una sola vez, antes de repartir el trabajo entre procesos
+    store = datos / ".cache" / "columnar" / "df_tienda_aurelion"
+    assert len([c for c in store.iterdir() if c.name.startswith("v_")]) == 1
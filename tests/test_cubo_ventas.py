@@ -0,0 +1,45 @@
+# tests/test_cubo_ventas.py
+
+import pandas as pd
+import pytest
+
+from src.utils.cubo_ventas import METRICAS_TOP, actualizar_indice_top, construir_cubo, construir_indice_top
+
+
+def _ventas(filas):
+    return pd.DataFrame(filas, columns=[
+        "id_venta", "fecha", "categoria_corregida", "nombre_producto", "ciudad", "medio_pago", "cantidad", "total_venta",
+    ])
+
+
+BASE = _ventas([
+    (1, "2024-01-05", "Alimentos", "Yerba", "Córdoba", "efectivo", 2, 1520.75),
+    (1, "2024-01-05", "Alimentos", "Café", "Córdoba", "efectivo", 1, 2999.99),
+    (2, "2024-02-10", "Limpieza", "Lavandina", "Rosario", "tarjeta", 3, 899.5),
+    (3, "2024-02-11", "Alimentos", "Yerba", "Rosario", "qr", 1, 760.35),
+])
+
+# Ventas nuevas: un producto y una categoría que no estaban, y productos que sí
+NUEVAS = _ventas([
+    (4, "2024-03-01", "Alimentos", "Yerba", "Córdoba", "tarjeta", 1, 760.4),
+    (4, "2024-03-01", "Alimentos", "Galletitas", "Córdoba", "tarjeta", 4, 1234.56),
+    (5, "2024-03-02", "Limpieza", "Lavandina", "Mendoza", "efectivo", 1, 299.83),
+    (6, "2024-03-03", "Bebidas", "Agua", "Mendoza", "qr", 6, 1800.05),
+])
+
+
+def test_indice_incremental_igual_a_reconstruirlo():
+    incremental = actualizar_indice_top(construir_indice_top(construir_cubo(BASE)), construir_cubo(NUEVAS))
+    completo = construir_indice_top(construir_cubo(pd.concat([BASE, NUEVAS], ignore_index=True)))
+
+    for metrica in METRICAS_TOP:
+        assert incremental[metrica].keys() == completo[metrica].keys()
+        for categoria, ranking in completo[metrica].items():
+            pd.testing.assert_series_equal(incremental[metrica][categoria], ranking, check_index_type=False)
+
+
+def test_ingresos_conservan_los_decimales():
+    incremental = actualizar_indice_top(construir_indice_top(construir_cubo(BASE)), construir_cubo(NUEVAS))
+
+    assert incremental["ingresos"]["Alimentos"]["Yerba"] == pytest.approx(1520.75 + 760.35 + 760.4)
+    assert incremental["ingresos"]["Alimentos"]["Galletitas"] == pytest.approx(1234.56)